@@ -2,20 +2,34 @@
 Real-time monitoring API endpoints.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 import json
 import asyncio
 import logging
+import math
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
+import copy
 import random
 import time
 
+import numpy as np
+
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 router = APIRouter()
 
+# Interval between real-time traffic updates (seconds)
+MONITORING_INTERVAL = 3.0
+
+# Time constant of the traffic metric smoothing (seconds)
+EMA_TIME_CONSTANT = 10.0
+
+# Pre-built offsets between consecutive simulated attack entries (10 ms apart)
+_DELTA_CACHE = [timedelta(milliseconds=i * 10) for i in range(1024)]
+
 
 class ConnectionManager:
     """Manages WebSocket connections for real-time monitoring."""
@@ -27,20 +41,20 @@ class ConnectionManager:
         """Accept a new WebSocket connection."""
         await websocket.accept()
         self.active_connections.append(websocket)
-        logger.info(f"New WebSocket connection. Total: {len(self.active_connections)}")
+        logger.info("New WebSocket connection. Total: %d", len(self.active_connections))
     
     def disconnect(self, websocket: WebSocket):
         """Remove a WebSocket connection."""
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
-            logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
+            logger.info("WebSocket disconnected. Total: %d", len(self.active_connections))
     
     async def send_personal_message(self, message: str, websocket: WebSocket):
         """Send a message to a specific connection."""
         try:
             await websocket.send_text(message)
         except Exception as e:
-            logger.error(f"Failed to send message: {str(e)}")
+            logger.error("Failed to send message: %s", e)
             self.disconnect(websocket)
     
     async def broadcast(self, message: str):
@@ -50,7 +64,7 @@ class ConnectionManager:
             try:
                 await connection.send_text(message)
             except Exception as e:
-                logger.error(f"Failed to broadcast message: {str(e)}")
+                logger.error("Failed to broadcast message: %s", e)
                 disconnected.append(connection)
         
         # Remove failed connections
@@ -62,6 +76,32 @@ class ConnectionManager:
 manager = ConnectionManager()
 
 
+@lru_cache(maxsize=8)
+def _parse_window_start(start_time: str) -> Optional[datetime]:
+    """Parse the aggregator's ISO window start, cached since it rarely changes."""
+    try:
+        return datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+    except (ValueError, TypeError):
+        return None
+
+
+async def _wait_for_next_tick(loop: asyncio.AbstractEventLoop, deadline: float) -> float:
+    """
+    Sleep until the next monitoring tick and return its deadline.
+    
+    Deadlines advance by a fixed interval so the time spent building an
+    update does not accumulate as drift. If the loop has fallen more than
+    two intervals behind, the schedule is resynced instead of firing a
+    burst of catch-up ticks.
+    """
+    deadline += MONITORING_INTERVAL
+    now = loop.time()
+    if now - deadline > 2 * MONITORING_INTERVAL:
+        deadline = now
+    await asyncio.sleep(max(0.0, deadline - now))
+    return deadline
+
+
 @router.websocket("/live")
 async def websocket_endpoint(websocket: WebSocket):
     """
@@ -90,7 +130,7 @@ async def websocket_endpoint(websocket: WebSocket):
             except WebSocketDisconnect:
                 break
             except Exception as e:
-                logger.error(f"WebSocket error: {str(e)}")
+                logger.error("WebSocket error: %s", e)
                 break
     
     except WebSocketDisconnect:
@@ -108,16 +148,20 @@ async def simulate_network_monitoring(websocket: WebSocket):
     from app.api.endpoints.log_analysis import log_aggregator
     attack_types = ['Normal', 'DoS', 'Probe', 'U2R', 'R2L']
     
-    # Smoothing variables for stable values
-    smoothed_entries_per_sec = 0.0
-    smoothed_bandwidth = 0.0
-    smoothed_packet_loss = 0.0
-    smoothed_latency = 0.0
-    alpha = 0.3  # Smoothing factor (0-1), lower = more smoothing
+    # Smoothed values for stable output, updated together as one vector:
+    # [entries_per_sec, bandwidth, packet_loss, latency]
+    ema = np.zeros(4, dtype=np.float64)
+    ema_initialized = False
+    exp = math.exp
     
     # Track recently sent alerts to prevent duplicates
     recent_alert_keys = {}  # {alert_key: timestamp} to track alerts sent in last 60 seconds
     
+    # Monotonic tick schedule keeps the update cadence uniform
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    last_update = deadline
+    
     while True:
         try:
             # Get REAL statistics from log aggregator
@@ -130,10 +174,8 @@ async def simulate_network_monitoring(websocket: WebSocket):
             
             # If there are no logs, reset all smoothed values and send zero values
             if total_entries == 0:
-                smoothed_entries_per_sec = 0.0
-                smoothed_bandwidth = 0.0
-                smoothed_packet_loss = 0.0
-                smoothed_latency = 0.0
+                ema[:] = 0.0
+                ema_initialized = False
                 threat_level = 'Low'
                 suspicious_count = 0
                 attacks_blocked = 0
@@ -158,14 +200,24 @@ async def simulate_network_monitoring(websocket: WebSocket):
                     }
                 }
                 await websocket.send_text(json.dumps(traffic_data))
-                await asyncio.sleep(3)
+                deadline = await _wait_for_next_tick(loop, deadline)
                 continue
             
-            # Apply exponential smoothing to entries_per_sec to reduce fluctuations
-            if smoothed_entries_per_sec == 0:
-                smoothed_entries_per_sec = entries_per_sec
+            # Weight of the previous estimate for the time actually elapsed,
+            # so scheduling jitter does not warp the smoothing time constant
+            now = loop.time()
+            w = exp(-(now - last_update) / EMA_TIME_CONSTANT)
+            last_update = now
+            
+            # Decay all four EMAs in one vector operation, then fold in
+            # entries_per_sec first: bandwidth and latency are derived from
+            # its smoothed value
+            if ema_initialized:
+                ema *= w
+                ema[0] += (1 - w) * entries_per_sec
             else:
-                smoothed_entries_per_sec = alpha * entries_per_sec + (1 - alpha) * smoothed_entries_per_sec
+                ema[0] = entries_per_sec
+            smoothed_entries_per_sec = float(ema[0])
             
             # Calculate threat level from real error rate (use smoothed error rate)
             smoothed_error_rate = error_rate  # Error rate is already stable from aggregator
@@ -213,7 +265,7 @@ async def simulate_network_monitoring(websocket: WebSocket):
                                 attack_breakdown['U2R'] = int(attack_count * 0.1)
                                 attack_breakdown['R2L'] = int(attack_count * 0.1)
                 except Exception as e:
-                    logger.debug(f"Error calculating attack breakdown: {str(e)}")
+                    logger.debug("Error calculating attack breakdown: %s", e)
                     # Fallback to error-rate based estimation
                     normal_count = max(0, int(total_entries * (1 - smoothed_error_rate)))
                     attack_count = int(total_entries * smoothed_error_rate)
@@ -227,27 +279,24 @@ async def simulate_network_monitoring(websocket: WebSocket):
             # Calculate network metrics with smoothing to prevent fluctuations
             # Bandwidth: Use smoothed entries_per_sec, cap at 100%
             raw_bandwidth = min(100, smoothed_entries_per_sec * 10)
-            if smoothed_bandwidth == 0:
-                smoothed_bandwidth = raw_bandwidth
-            else:
-                smoothed_bandwidth = alpha * raw_bandwidth + (1 - alpha) * smoothed_bandwidth
             
             # Packet loss: Smooth error rate conversion
             raw_packet_loss = smoothed_error_rate * 100
-            if smoothed_packet_loss == 0:
-                smoothed_packet_loss = raw_packet_loss
-            else:
-                smoothed_packet_loss = alpha * raw_packet_loss + (1 - alpha) * smoothed_packet_loss
             
             # Latency: Use smoothed entries_per_sec, add bounds to prevent wild swings
             if smoothed_entries_per_sec > 0:
                 raw_latency = max(10, min(1000, 1000 / max(smoothed_entries_per_sec, 0.1)))
             else:
                 raw_latency = 100  # Default latency when no traffic
-            if smoothed_latency == 0:
-                smoothed_latency = raw_latency
+            
+            # Fold the derived metrics into their (already decayed) EMAs
+            raw = np.array([raw_bandwidth, raw_packet_loss, raw_latency], dtype=np.float64)
+            if ema_initialized:
+                ema[1:] += (1 - w) * raw
             else:
-                smoothed_latency = alpha * raw_latency + (1 - alpha) * smoothed_latency
+                ema[1:] = raw
+                ema_initialized = True
+            _, smoothed_bandwidth, smoothed_packet_loss, smoothed_latency = ema.tolist()
             
             # Send REAL network traffic data
             traffic_data = {
@@ -273,11 +322,11 @@ async def simulate_network_monitoring(websocket: WebSocket):
             # Send regular traffic update with REAL data
             await websocket.send_text(json.dumps(traffic_data))
             
-            # Wait before next update (slightly longer to reduce fluctuation)
-            await asyncio.sleep(3)
+            # Wait for the next scheduled update
+            deadline = await _wait_for_next_tick(loop, deadline)
             
         except Exception as e:
-            logger.error(f"Monitoring error: {str(e)}")
+            logger.error("Monitoring error: %s", e)
             break
 
 
@@ -310,11 +359,10 @@ async def get_monitoring_status() -> Dict[str, Any]:
         
         # Calculate uptime (since last server start - simplified)
         start_time = log_stats.get('window_start')
-        if start_time:
+        start_dt = _parse_window_start(start_time) if start_time else None
+        if start_dt is not None:
             try:
-                from datetime import timezone as tz
-                start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                now_dt = datetime.now(tz.utc)
+                now_dt = datetime.now(timezone.utc)
                 uptime_seconds = (now_dt - start_dt).total_seconds()
                 hours = int(uptime_seconds // 3600)
                 minutes = int((uptime_seconds % 3600) // 60)
@@ -347,7 +395,7 @@ async def get_monitoring_status() -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Failed to get monitoring status: {str(e)}")
+        logger.error("Failed to get monitoring status: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -425,19 +473,39 @@ async def simulate_attack(attack_type: str = "DoS") -> Dict[str, Any]:
         params = attack_params[attack_type]
         num_requests = params['packets'] // 10  # Multiple log entries per attack
         
+        # Attack metadata is identical for every entry; share one dict
+        # (consumers only read parsed_fields)
+        shared_parsed_fields = {
+            'attack_type': attack_type,
+            'simulated': True,
+            'attack_severity': 'High',
+            'attack_confidence': 0.95
+        }
+        
         # Create multiple log entries to simulate the attack
         log_entries = []
         base_timestamp = datetime.now(timezone.utc)
+        template_entry = None
         for i in range(num_requests):
             # Create timestamp with slight variation for each entry
-            entry_timestamp = base_timestamp + timedelta(milliseconds=i * 10)
+            entry_timestamp = base_timestamp + _DELTA_CACHE[i]
+            source_port = random.randint(40000, 65535)
+            
+            if template_entry is not None:
+                # Entries only differ in timestamp and source port: clone the
+                # first, fully constructed entry instead of re-running __init__
+                entry = copy.copy(template_entry)
+                entry.timestamp = entry_timestamp
+                entry.source_port = source_port
+                log_entries.append(entry)
+                continue
             
             # Create LogEntry with required timestamp parameter
             entry = LogEntry(
                 timestamp=entry_timestamp,
                 source_ip=source_ip,
                 destination_ip=target_ip,
-                source_port=random.randint(40000, 65535),
+                source_port=source_port,
                 destination_port=params['port'],
                 protocol='TCP',
                 method=params['method'],
@@ -450,20 +518,17 @@ async def simulate_attack(attack_type: str = "DoS") -> Dict[str, Any]:
                 message=f"Simulated {attack_type} attack - {params['method']} {params['path']}",
                 log_source="attack_simulator",
                 user_agent=f"AttackSimulator/{attack_type}/1.0",
-                parsed_fields={
-                    'attack_type': attack_type,
-                    'simulated': True,
-                    'attack_severity': 'High',
-                    'attack_confidence': 0.95
-                }
+                parsed_fields=shared_parsed_fields
             )
+            template_entry = entry
             
             log_entries.append(entry)
         
         # Add log entries to aggregator
         await log_aggregator.add_log_entries(log_entries)
         
-        logger.info(f"Created {len(log_entries)} log entries for simulated {attack_type} attack from {source_ip}")
+        logger.info("Created %d log entries for simulated %s attack from %s",
+                    len(log_entries), attack_type, source_ip)
         
         # Create simulated attack data for WebSocket broadcast
         attack_simulation = {
@@ -504,5 +569,5 @@ async def simulate_attack(attack_type: str = "DoS") -> Dict[str, Any]:
         }
         
     except Exception as e:
-        logger.error(f"Attack simulation failed: {str(e)}")
+        logger.error("Attack simulation failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -3,6 +3,7 @@ Configuration settings for the NIDS application.
 """
 
 import os
+from functools import lru_cache
 from typing import List, Optional
 from pydantic_settings import BaseSettings
 
@@ -46,17 +47,30 @@ class Settings(BaseSettings):
     SVM_C_MAX: float = 100.0
     SVM_GAMMA_MIN: float = 0.001
     SVM_GAMMA_MAX: float = 1.0
+    SVM_CALIBRATION_FRACTION: float = 0.2  # Share of the training samples held out to calibrate SVM probabilities
+    SVM_APPROXIMATION_MIN_SAMPLES: int = 20000  # From this many training samples the SVM is trained as a linear model
+    SVM_NYSTROEM_COMPONENTS: int = 500  # Kernel approximation rank for large RBF SVM training sets
+    SVM_NYSTROEM_CACHE_PATH: Optional[str] = None  # Directory caching fitted Nystroem maps across refits; None disables it
     
     # XGBoost Configuration
     XGBOOST_N_ESTIMATORS: int = 100
     XGBOOST_MAX_DEPTH: int = 6
     XGBOOST_LEARNING_RATE: float = 0.1
+    XGBOOST_TREE_METHOD: str = "hist"
+    XGBOOST_MAX_BIN: int = 256
+    XGBOOST_DEVICE: str = "auto"  # "cpu", "cuda", or "auto" to use a GPU when one is available
+    
+    # Prediction micro-batching
+    PREDICT_MAX_BATCH_ROWS: int = 4096  # Rows coalesced into one classifier call
+    PREDICT_MAX_LATENCY_MS: float = 5.0  # How long a request waits for others to join its batch
     
     # Crow Search Algorithm Configuration
     CSA_POPULATION_SIZE: int = 20
     CSA_MAX_ITERATIONS: int = 50
     CSA_AWARENESS_PROBABILITY: float = 0.1
     CSA_FLIGHT_LENGTH: float = 2.0
+    CSA_RESULT_CACHE_PATH: Optional[str] = None  # Directory storing results of seeded optimization runs for reuse; None disables it
+    CSA_FLOAT32_INPUTS: bool = True  # Evaluate multi-objective CSA candidates on a float32 copy of X
     
     # Logging
     LOG_LEVEL: str = "INFO"
@@ -73,7 +87,22 @@ class Settings(BaseSettings):
         """Pydantic config."""
         env_file = ".env"
         case_sensitive = True
+        frozen = True
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the application settings.
+    
+    The environment and .env file are parsed once; later calls return
+    the same cached instance.
+    
+    Returns:
+        Settings instance
+    """
+    return Settings()
 
 
 # Create settings instance
-settings = Settings()
+settings = get_settings()
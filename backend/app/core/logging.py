@@ -2,31 +2,58 @@
 Logging configuration for the NIDS application.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
-from app.core.config import settings
+from app.core.config import get_settings
+
+# Logging settings are read once at import
+_LOG_LEVEL = get_settings().LOG_LEVEL
+_LOG_FORMAT = get_settings().LOG_FORMAT
+
+# Queue handler on the root logger and the background listener that
+# performs the actual stream/file writes
+_queue_handler: Optional[QueueHandler] = None
+_queue_listener: Optional[QueueListener] = None
 
 
 def setup_logging(log_level: Optional[str] = None) -> None:
     """
     Setup logging configuration.
     
+    Log records are handed to a queue and written to stdout and the log
+    file by a background listener thread, so logging calls made from the
+    event loop never block on I/O.
+    
     Args:
         log_level: Optional log level override
     """
-    level = log_level or settings.LOG_LEVEL
+    global _queue_handler, _queue_listener
     
-    # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, level.upper()),
-        format=settings.LOG_FORMAT,
-        handlers=[
+    level = log_level or _LOG_LEVEL
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, level.upper()))
+    
+    if _queue_listener is None:
+        formatter = logging.Formatter(_LOG_FORMAT)
+        output_handlers = [
             logging.StreamHandler(sys.stdout),
             logging.FileHandler("nids.log", mode="a")
         ]
-    )
+        for handler in output_handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.Queue(-1)
+        _queue_handler = QueueHandler(log_queue)
+        root_logger.addHandler(_queue_handler)
+        
+        _queue_listener = QueueListener(log_queue, *output_handlers)
+        _queue_listener.start()
+        atexit.register(shutdown_logging)
     
     # Set specific logger levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
@@ -34,13 +61,24 @@ def setup_logging(log_level: Optional[str] = None) -> None:
     logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
 
 
+def shutdown_logging() -> None:
+    """Flush queued log records and stop the background listener."""
+    global _queue_handler, _queue_listener
+    
+    if _queue_listener is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_listener.stop()
+        _queue_handler = None
+        _queue_listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger with the specified name.
     
     Args:
         name: Logger name
-        
+    
     Returns:
         Logger instance
     """
@@ -4,8 +4,9 @@ Dataset loader for NSL-KDD and UNR-IDD datasets.
 
 import pandas as pd
 import numpy as np
-import os
-from typing import Dict, Any, Tuple, Optional, List
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from typing import Dict, Any, Tuple, Optional, List, Iterator, NamedTuple
 from pathlib import Path
 import logging
 
@@ -15,34 +16,73 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 
 
+class NSLKDDSplits(NamedTuple):
+    """Train and test splits of the NSL-KDD dataset."""
+    train: pd.DataFrame
+    test: pd.DataFrame
+
+
 class DatasetLoader:
     """
     Loads and preprocesses intrusion detection datasets.
     Supports NSL-KDD and UNR-IDD formats.
     """
     
+    # NSL-KDD feature names, in file order (the CSV has no header row)
+    NSL_KDD_FEATURES = (
+        'duration', 'protocol_type', 'service', 'flag', 'src_bytes', 'dst_bytes',
+        'land', 'wrong_fragment', 'urgent', 'hot', 'num_failed_logins',
+        'logged_in', 'num_compromised', 'root_shell', 'su_attempted', 'num_root',
+        'num_file_creations', 'num_shells', 'num_access_files', 'num_outbound_cmds',
+        'is_host_login', 'is_guest_login', 'count', 'srv_count', 'serror_rate',
+        'srv_serror_rate', 'rerror_rate', 'srv_rerror_rate', 'same_srv_rate',
+        'diff_srv_rate', 'srv_diff_host_rate', 'dst_host_count', 'dst_host_srv_count',
+        'dst_host_same_srv_rate', 'dst_host_diff_srv_rate', 'dst_host_same_src_port_rate',
+        'dst_host_srv_diff_host_rate', 'dst_host_serror_rate', 'dst_host_srv_serror_rate',
+        'dst_host_rerror_rate', 'dst_host_srv_rerror_rate', 'class'
+    )
+    
+    # Column dtypes so the CSV reader skips type inference
+    NSL_KDD_DTYPES = {
+        column: (
+            'object' if column in ('protocol_type', 'service', 'flag', 'class')
+            else 'float32' if column.endswith('_rate')
+            else 'int64' if column in ('src_bytes', 'dst_bytes')
+            else 'int32'
+        )
+        for column in NSL_KDD_FEATURES
+    }
+    
+    # Arrow reader options shared by all instances: multi-threaded block
+    # parsing with explicit column names and the typed schema above
+    _NSL_KDD_READ_OPTIONS = pacsv.ReadOptions(
+        column_names=list(NSL_KDD_FEATURES),
+        block_size=8 << 20
+    )
+    _NSL_KDD_CONVERT_OPTIONS = pacsv.ConvertOptions(column_types={
+        column: pa.string() if dtype == 'object' else pa.from_numpy_dtype(np.dtype(dtype))
+        for column, dtype in NSL_KDD_DTYPES.items()
+    })
+    
     def __init__(self):
         """Initialize dataset loader."""
         self.dataset_path = Path(settings.DATASET_PATH)
         self.dataset_path.mkdir(exist_ok=True)
         
-        # NSL-KDD feature names
-        self.nsl_kdd_features = [
-            'duration', 'protocol_type', 'service', 'flag', 'src_bytes', 'dst_bytes',
-            'land', 'wrong_fragment', 'urgent', 'hot', 'num_failed_logins',
-            'logged_in', 'num_compromised', 'root_shell', 'su_attempted', 'num_root',
-            'num_file_creations', 'num_shells', 'num_access_files', 'num_outbound_cmds',
-            'is_host_login', 'is_guest_login', 'count', 'srv_count', 'serror_rate',
-            'srv_serror_rate', 'rerror_rate', 'srv_rerror_rate', 'same_srv_rate',
-            'diff_srv_rate', 'srv_diff_host_rate', 'dst_host_count', 'dst_host_srv_count',
-            'dst_host_same_srv_rate', 'dst_host_diff_srv_rate', 'dst_host_same_src_port_rate',
-            'dst_host_srv_diff_host_rate', 'dst_host_serror_rate', 'dst_host_srv_serror_rate',
-            'dst_host_rerror_rate', 'dst_host_srv_rerror_rate', 'class'
-        ]
+        # Raw attack label -> attack category
+        attack_categories = {
+            'dos': ['back', 'land', 'neptune', 'pod', 'smurf', 'teardrop'],
+            'probe': ['ipsweep', 'nmap', 'portsweep', 'satan'],
+            'u2r': ['buffer_overflow', 'loadmodule', 'perl', 'rootkit'],
+            'r2l': ['ftp_write', 'guess_passwd', 'imap', 'multihop', 'phf', 'spy', 'warezclient', 'warezmaster']
+        }
+        self._label_map = {'normal': 'normal'}
+        for category, labels in attack_categories.items():
+            self._label_map.update({label: category for label in labels})
         
         logger.info("Dataset loader initialized")
     
-    def load_nsl_kdd(self, train_file: str = None, test_file: str = None) -> Dict[str, pd.DataFrame]:
+    def load_nsl_kdd(self, train_file: str = None, test_file: str = None) -> NSLKDDSplits:
         """
         Load NSL-KDD dataset.
         
@@ -51,11 +91,9 @@ class DatasetLoader:
             test_file: Path to test file
             
         Returns:
-            Dictionary containing train and test DataFrames
+            NSLKDDSplits with train and test DataFrames
         """
         try:
-            datasets = {}
-            
             # Default file paths
             if train_file is None:
                 train_file = self.dataset_path / "nsl_kdd_train.csv"
@@ -63,29 +101,113 @@ class DatasetLoader:
                 test_file = self.dataset_path / "nsl_kdd_test.csv"
             
             # Load training data if exists
-            if os.path.exists(train_file):
-                logger.info(f"Loading NSL-KDD training data from {train_file}")
-                datasets['train'] = pd.read_csv(train_file, names=self.nsl_kdd_features)
-                logger.info(f"Loaded training data: {datasets['train'].shape}")
-            else:
+            try:
+                train = self._read_with_parquet_cache(train_file, self._read_nsl_kdd_csv)
+                logger.info(f"Loaded NSL-KDD training data from {train_file}: {train.shape}")
+            except FileNotFoundError:
                 logger.warning(f"Training file not found: {train_file}")
-                datasets['train'] = self._create_sample_nsl_kdd()
+                train = self._create_sample_nsl_kdd()
             
             # Load test data if exists
-            if os.path.exists(test_file):
-                logger.info(f"Loading NSL-KDD test data from {test_file}")
-                datasets['test'] = pd.read_csv(test_file, names=self.nsl_kdd_features)
-                logger.info(f"Loaded test data: {datasets['test'].shape}")
-            else:
+            try:
+                test = self._read_with_parquet_cache(test_file, self._read_nsl_kdd_csv)
+                logger.info(f"Loaded NSL-KDD test data from {test_file}: {test.shape}")
+            except FileNotFoundError:
                 logger.warning(f"Test file not found: {test_file}")
-                datasets['test'] = self._create_sample_nsl_kdd(is_test=True)
+                test = self._create_sample_nsl_kdd(is_test=True)
             
-            return datasets
+            return NSLKDDSplits(train=train, test=test)
             
         except Exception as e:
             logger.error(f"Failed to load NSL-KDD dataset: {str(e)}")
             raise RuntimeError(f"NSL-KDD loading failed: {str(e)}")
     
+    def stream_nsl_kdd(self, file_path, preprocess: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        Stream an NSL-KDD CSV in record batches to cap peak memory.
+        
+        Batches are read incrementally with the typed Arrow reader, so memory
+        stays proportional to the block size rather than the file size.
+        Callers can concatenate the chunks or train incrementally; when
+        preprocessing, one-hot columns only cover the categories seen in each
+        chunk, so align columns (e.g. reindex) before stacking.
+        
+        Args:
+            file_path: Path to NSL-KDD CSV file
+            preprocess: Whether to run NSL-KDD preprocessing on each chunk
+            
+        Returns:
+            Iterator over DataFrame chunks
+        """
+        try:
+            logger.info(f"Streaming NSL-KDD data from {file_path}")
+            reader = pacsv.open_csv(
+                file_path,
+                read_options=self._NSL_KDD_READ_OPTIONS,
+                convert_options=self._NSL_KDD_CONVERT_OPTIONS
+            )
+            
+            for batch in reader:
+                chunk = batch.to_pandas()
+                if preprocess:
+                    chunk = self._preprocess_nsl_kdd(chunk)
+                yield chunk
+                
+        except Exception as e:
+            logger.error(f"Failed to stream NSL-KDD dataset: {str(e)}")
+            raise RuntimeError(f"NSL-KDD streaming failed: {str(e)}")
+    
+    def _read_nsl_kdd_csv(self, file_path) -> pd.DataFrame:
+        """Parse a header-less NSL-KDD CSV with the typed Arrow reader."""
+        table = pacsv.read_csv(
+            file_path,
+            read_options=self._NSL_KDD_READ_OPTIONS,
+            convert_options=self._NSL_KDD_CONVERT_OPTIONS
+        )
+        return table.to_pandas(self_destruct=True)
+    
+    def _read_unr_idd_csv(self, file_path) -> pd.DataFrame:
+        """Parse a UNR-IDD CSV (header row, inferred types) with the Arrow reader."""
+        return pacsv.read_csv(file_path).to_pandas(self_destruct=True)
+    
+    def _read_with_parquet_cache(self, csv_path, read_csv) -> pd.DataFrame:
+        """
+        Read a CSV through a Parquet cache stored next to it.
+        
+        The first load parses the CSV and writes a zstd-compressed Parquet
+        copy; later loads read the typed columnar copy as long as it is not
+        older than the CSV.
+        
+        Args:
+            csv_path: Path to the source CSV file
+            read_csv: Callable parsing the CSV into a DataFrame
+            
+        Returns:
+            Loaded DataFrame
+        """
+        csv_path = Path(csv_path)
+        parquet_path = csv_path.with_suffix('.parquet')
+        
+        # One stat per file; a missing CSV propagates FileNotFoundError
+        csv_mtime = csv_path.stat().st_mtime
+        try:
+            cache_is_fresh = parquet_path.stat().st_mtime >= csv_mtime
+        except FileNotFoundError:
+            cache_is_fresh = False
+        
+        if cache_is_fresh:
+            logger.debug(f"Reading cached Parquet copy {parquet_path}")
+            return pd.read_parquet(parquet_path, engine='pyarrow')
+        
+        df = read_csv(csv_path)
+        try:
+            df.to_parquet(parquet_path, compression='zstd', engine='pyarrow', index=False)
+            logger.info(f"Cached {csv_path.name} as Parquet: {parquet_path}")
+        except Exception as e:
+            logger.warning(f"Failed to write Parquet cache {parquet_path}: {str(e)}")
+        
+        return df
+    
     def load_unr_idd(self, file_path: str = None) -> pd.DataFrame:
         """
         Load UNR-IDD dataset.
@@ -100,14 +222,14 @@ class DatasetLoader:
             if file_path is None:
                 file_path = self.dataset_path / "unr_idd.csv"
             
-            if os.path.exists(file_path):
-                logger.info(f"Loading UNR-IDD data from {file_path}")
-                df = pd.read_csv(file_path)
-                logger.info(f"Loaded UNR-IDD data: {df.shape}")
-                return df
-            else:
+            try:
+                df = self._read_with_parquet_cache(file_path, self._read_unr_idd_csv)
+            except FileNotFoundError:
                 logger.warning(f"UNR-IDD file not found: {file_path}")
                 return self._create_sample_unr_idd()
+            
+            logger.info(f"Loaded UNR-IDD data from {file_path}: {df.shape}")
+            return df
                 
         except Exception as e:
             logger.error(f"Failed to load UNR-IDD dataset: {str(e)}")
@@ -127,7 +249,9 @@ class DatasetLoader:
         logger.info(f"Preprocessing {dataset_type} dataset: {df.shape}")
         
         try:
-            df_processed = df.copy()
+            # Shallow copy: preprocessing only replaces whole columns or
+            # builds new frames, so the data buffers need not be duplicated
+            df_processed = df.copy(deep=False)
             
             if dataset_type == 'nsl_kdd':
                 df_processed = self._preprocess_nsl_kdd(df_processed)
@@ -146,33 +270,106 @@ class DatasetLoader:
     def _preprocess_nsl_kdd(self, df: pd.DataFrame) -> pd.DataFrame:
         """Preprocess NSL-KDD specific format."""
         # Handle missing values
-        df = df.dropna()
+        df = self._drop_incomplete_rows(df)
         
         # Encode categorical features
-        categorical_features = ['protocol_type', 'service', 'flag']
+        categorical_features = [
+            feature for feature in ['protocol_type', 'service', 'flag']
+            if feature in df.columns
+        ]
         for feature in categorical_features:
-            if feature in df.columns:
-                df = pd.get_dummies(df, columns=[feature], drop_first=True)
+            df[feature] = df[feature].astype('category')
+        df = self._replace_with_one_hot(df, categorical_features)
         
-        # Normalize attack labels
+        # Normalize attack labels once per distinct value, then gather by code
+        # (the trailing NaN entry is picked up by the -1 code of missing labels)
         if 'class' in df.columns:
-            df['class'] = df['class'].apply(self._normalize_attack_label)
+            codes, uniques = pd.factorize(df['class'])
+            normalized = np.array([
+                self._normalize_attack_label(label) if isinstance(label, str) else label
+                for label in uniques
+            ] + [np.nan], dtype=object)
+            df['class'] = normalized[codes]
         
         return df
     
     def _preprocess_unr_idd(self, df: pd.DataFrame) -> pd.DataFrame:
         """Preprocess UNR-IDD specific format."""
         # Handle missing values
-        df = df.dropna()
+        df = self._drop_incomplete_rows(df)
         
         # Encode categorical features (assuming similar structure)
-        categorical_columns = df.select_dtypes(include=['object']).columns
-        for col in categorical_columns:
-            if col != 'class' and col != 'label':  # Preserve target column
-                df = pd.get_dummies(df, columns=[col], drop_first=True)
+        categorical_columns = [
+            col for col in df.select_dtypes(include=['object']).columns
+            if col != 'class' and col != 'label'  # Preserve target column
+        ]
+        df = self._replace_with_one_hot(df, categorical_columns)
         
         return df
     
+    def _replace_with_one_hot(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """
+        Replace categorical columns with their one-hot encodings.
+        
+        All indicator columns live in a single int8 block, joined to the
+        remaining columns with one concat instead of rebuilding the frame
+        once per column.
+        """
+        if not columns:
+            return df
+        
+        return pd.concat(
+            [df.drop(columns=columns), self._one_hot_encode(df, columns)],
+            axis=1,
+            copy=False
+        )
+    
+    def _drop_incomplete_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop rows with missing values, returning df itself if there are none."""
+        complete = df.notna().all(axis=1).to_numpy()
+        if complete.all():
+            return df
+        return df.loc[complete].copy()
+    
+    def _one_hot_encode(self, df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+        """
+        One-hot encode categorical columns into one contiguous int8 block.
+        
+        Equivalent to pd.get_dummies(drop_first=True): categories are sorted
+        (or taken in dtype order for categorical columns, whose codes are
+        reused as-is), the first one is dropped and columns are named
+        '<column>_<category>'.
+        
+        Args:
+            df: DataFrame holding the categorical columns
+            columns: Names of the columns to encode
+            
+        Returns:
+            DataFrame of int8 indicator columns sharing the input index
+        """
+        encoded = []
+        for col in columns:
+            values = df[col]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                encoded.append((col, values.cat.codes.to_numpy(), values.cat.categories))
+            else:
+                encoded.append((col, *pd.factorize(values, sort=True)))
+        
+        width = sum(max(len(categories) - 1, 0) for _, _, categories in encoded)
+        matrix = np.zeros((len(df), width), dtype=np.int8)
+        
+        # Scatter a 1 per row into each column's slice; code 0 is the dropped
+        # category, -1 is missing
+        dummy_names = []
+        offset = 0
+        for col, codes, categories in encoded:
+            rows = np.flatnonzero(codes > 0)
+            matrix[rows, offset + codes[rows] - 1] = 1
+            dummy_names.extend(f'{col}_{category}' for category in categories[1:])
+            offset += max(len(categories) - 1, 0)
+        
+        return pd.DataFrame(matrix, columns=dummy_names, index=df.index)
+    
     def _normalize_attack_label(self, label: str) -> str:
         """
         Normalize attack labels to standard categories.
@@ -185,82 +382,66 @@ class DatasetLoader:
         """
         label = label.lower().strip()
         
-        # Normal traffic
-        if label == 'normal':
-            return 'normal'
-        
-        # DoS attacks
-        dos_attacks = ['back', 'land', 'neptune', 'pod', 'smurf', 'teardrop']
-        if label in dos_attacks:
-            return 'dos'
-        
-        # Probe attacks
-        probe_attacks = ['ipsweep', 'nmap', 'portsweep', 'satan']
-        if label in probe_attacks:
-            return 'probe'
-        
-        # U2R attacks
-        u2r_attacks = ['buffer_overflow', 'loadmodule', 'perl', 'rootkit']
-        if label in u2r_attacks:
-            return 'u2r'
-        
-        # R2L attacks
-        r2l_attacks = ['ftp_write', 'guess_passwd', 'imap', 'multihop', 'phf', 'spy', 'warezclient', 'warezmaster']
-        if label in r2l_attacks:
-            return 'r2l'
-        
         # Default to original label if not recognized
-        return label
+        return self._label_map.get(label, label)
     
     def _create_sample_nsl_kdd(self, is_test: bool = False) -> pd.DataFrame:
         """Create sample NSL-KDD data for demonstration."""
+        # Sample data is seeded, so a previously written copy can be reused
+        filename = f"sample_nsl_kdd_{'test' if is_test else 'train'}.parquet"
+        filepath = self.dataset_path / filename
+        if filepath.exists():
+            logger.info(f"Using existing sample NSL-KDD data: {filepath}")
+            return pd.read_parquet(filepath, engine='pyarrow')
+        
         np.random.seed(42 if not is_test else 43)
         
         n_samples = 1000 if not is_test else 300
         
-        # Generate synthetic data with realistic patterns
+        # Generate synthetic data with realistic patterns, stored with compact
+        # dtypes (float32 continuous values, int16 counts, int8 binary flags)
         data = {
-            'duration': np.random.exponential(10, n_samples),
+            'duration': np.random.exponential(10, n_samples).astype(np.float32),
             'protocol_type': np.random.choice(['tcp', 'udp', 'icmp'], n_samples, p=[0.7, 0.2, 0.1]),
             'service': np.random.choice(['http', 'ftp', 'smtp', 'ssh', 'telnet'], n_samples),
             'flag': np.random.choice(['SF', 'S0', 'REJ', 'RSTO'], n_samples, p=[0.6, 0.2, 0.1, 0.1]),
-            'src_bytes': np.random.lognormal(5, 2, n_samples),
-            'dst_bytes': np.random.lognormal(4, 2, n_samples),
-            'land': np.random.choice([0, 1], n_samples, p=[0.95, 0.05]),
-            'wrong_fragment': np.random.poisson(0.1, n_samples),
-            'urgent': np.random.poisson(0.05, n_samples),
-            'hot': np.random.poisson(0.2, n_samples),
-            'num_failed_logins': np.random.poisson(0.1, n_samples),
-            'logged_in': np.random.choice([0, 1], n_samples, p=[0.3, 0.7]),
-            'num_compromised': np.random.poisson(0.05, n_samples),
-            'root_shell': np.random.choice([0, 1], n_samples, p=[0.98, 0.02]),
-            'su_attempted': np.random.choice([0, 1], n_samples, p=[0.99, 0.01]),
-            'num_root': np.random.poisson(0.1, n_samples),
-            'num_file_creations': np.random.poisson(0.5, n_samples),
-            'num_shells': np.random.poisson(0.1, n_samples),
-            'num_access_files': np.random.poisson(0.2, n_samples),
-            'num_outbound_cmds': np.random.poisson(0.01, n_samples),
-            'is_host_login': np.random.choice([0, 1], n_samples, p=[0.9, 0.1]),
-            'is_guest_login': np.random.choice([0, 1], n_samples, p=[0.95, 0.05]),
-            'count': np.random.randint(1, 500, n_samples),
-            'srv_count': np.random.randint(1, 500, n_samples),
-            'serror_rate': np.random.beta(1, 10, n_samples),
-            'srv_serror_rate': np.random.beta(1, 10, n_samples),
-            'rerror_rate': np.random.beta(1, 10, n_samples),
-            'srv_rerror_rate': np.random.beta(1, 10, n_samples),
-            'same_srv_rate': np.random.beta(5, 2, n_samples),
-            'diff_srv_rate': np.random.beta(2, 5, n_samples),
-            'srv_diff_host_rate': np.random.beta(2, 5, n_samples),
-            'dst_host_count': np.random.randint(1, 256, n_samples),
-            'dst_host_srv_count': np.random.randint(1, 256, n_samples),
-            'dst_host_same_srv_rate': np.random.beta(5, 2, n_samples),
-            'dst_host_diff_srv_rate': np.random.beta(2, 5, n_samples),
-            'dst_host_same_src_port_rate': np.random.beta(3, 3, n_samples),
-            'dst_host_srv_diff_host_rate': np.random.beta(2, 5, n_samples),
-            'dst_host_serror_rate': np.random.beta(1, 10, n_samples),
-            'dst_host_srv_serror_rate': np.random.beta(1, 10, n_samples),
-            'dst_host_rerror_rate': np.random.beta(1, 10, n_samples),
-            'dst_host_srv_rerror_rate': np.random.beta(1, 10, n_samples),
+            'src_bytes': np.random.lognormal(5, 2, n_samples).astype(np.float32),
+            'dst_bytes': np.random.lognormal(4, 2, n_samples).astype(np.float32),
+            'land': np.random.choice([0, 1], n_samples, p=[0.95, 0.05]).astype(np.int8),
+            'wrong_fragment': np.random.poisson(0.1, n_samples).astype(np.int16),
+            'urgent': np.random.poisson(0.05, n_samples).astype(np.int16),
+            'hot': np.random.poisson(0.2, n_samples).astype(np.int16),
+            'num_failed_logins': np.random.poisson(0.1, n_samples).astype(np.int16),
+            'logged_in': np.random.choice([0, 1], n_samples, p=[0.3, 0.7]).astype(np.int8),
+            'num_compromised': np.random.poisson(0.05, n_samples).astype(np.int16),
+            'root_shell': np.random.choice([0, 1], n_samples, p=[0.98, 0.02]).astype(np.int8),
+            'su_attempted': np.random.choice([0, 1], n_samples, p=[0.99, 0.01]).astype(np.int8),
+            'num_root': np.random.poisson(0.1, n_samples).astype(np.int16),
+            'num_file_creations': np.random.poisson(0.5, n_samples).astype(np.int16),
+            'num_shells': np.random.poisson(0.1, n_samples).astype(np.int16),
+            'num_access_files': np.random.poisson(0.2, n_samples).astype(np.int16),
+            'num_outbound_cmds': np.random.poisson(0.01, n_samples).astype(np.int16),
+            'is_host_login': np.random.choice([0, 1], n_samples, p=[0.9, 0.1]).astype(np.int8),
+            'is_guest_login': np.random.choice([0, 1], n_samples, p=[0.95, 0.05]).astype(np.int8),
+            'count': np.random.randint(1, 500, n_samples).astype(np.int16),
+            'srv_count': np.random.randint(1, 500, n_samples).astype(np.int16),
+            'serror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
+            'srv_serror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
+            'rerror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
+            'srv_rerror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
+            'same_srv_rate': np.random.beta(5, 2, n_samples).astype(np.float32),
+            'diff_srv_rate': np.random.beta(2, 5, n_samples).astype(np.float32),
+            'srv_diff_host_rate': np.random.beta(2, 5, n_samples).astype(np.float32),
+            'dst_host_count': np.random.randint(1, 256, n_samples).astype(np.int16),
+            'dst_host_srv_count': np.random.randint(1, 256, n_samples).astype(np.int16),
+            'dst_host_same_srv_rate': np.random.beta(5, 2, n_samples).astype(np.float32),
+            'dst_host_diff_srv_rate': np.random.beta(2, 5, n_samples).astype(np.float32),
+            'dst_host_same_src_port_rate': np.random.beta(3, 3, n_samples).astype(np.float32),
+            'dst_host_srv_diff_host_rate': np.random.beta(2, 5, n_samples).astype(np.float32),
+            'dst_host_serror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
+            'dst_host_srv_serror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
+            'dst_host_rerror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
+            'dst_host_srv_rerror_rate': np.random.beta(1, 10, n_samples).astype(np.float32),
         }
         
         # Generate realistic class distribution
@@ -274,74 +455,100 @@ class DatasetLoader:
         df = pd.DataFrame(data)
         
         # Save sample data
-        filename = f"sample_nsl_kdd_{'test' if is_test else 'train'}.csv"
-        filepath = self.dataset_path / filename
-        df.to_csv(filepath, index=False)
+        df.to_parquet(filepath, compression='zstd', engine='pyarrow', index=False)
         logger.info(f"Created sample NSL-KDD data: {filepath}")
         
         return df
     
     def _create_sample_unr_idd(self) -> pd.DataFrame:
         """Create sample UNR-IDD data for demonstration."""
-        np.random.seed(44)
+        # Sample data is seeded, so a previously written copy can be reused
+        filepath = self.dataset_path / "sample_unr_idd.parquet"
+        if filepath.exists():
+            logger.info(f"Using existing sample UNR-IDD data: {filepath}")
+            return pd.read_parquet(filepath, engine='pyarrow')
+        
+        rng = np.random.default_rng(44)
         n_samples = 800
         
-        # Generate synthetic UNR-IDD style data
-        data = {
-            'flow_duration': np.random.exponential(15, n_samples),
-            'total_fwd_packets': np.random.poisson(10, n_samples),
-            'total_backward_packets': np.random.poisson(8, n_samples),
-            'total_length_fwd_packets': np.random.lognormal(6, 1.5, n_samples),
-            'total_length_bwd_packets': np.random.lognormal(5, 1.5, n_samples),
-            'fwd_packet_length_max': np.random.gamma(2, 100, n_samples),
-            'fwd_packet_length_min': np.random.gamma(1, 20, n_samples),
-            'fwd_packet_length_mean': np.random.normal(200, 50, n_samples),
-            'fwd_packet_length_std': np.random.gamma(2, 30, n_samples),
-            'bwd_packet_length_max': np.random.gamma(2, 80, n_samples),
-            'bwd_packet_length_min': np.random.gamma(1, 15, n_samples),
-            'bwd_packet_length_mean': np.random.normal(150, 40, n_samples),
-            'bwd_packet_length_std': np.random.gamma(2, 25, n_samples),
-            'flow_bytes_per_s': np.random.lognormal(8, 2, n_samples),
-            'flow_packets_per_s': np.random.gamma(2, 5, n_samples),
-            'flow_iat_mean': np.random.exponential(100, n_samples),
-            'flow_iat_std': np.random.gamma(2, 50, n_samples),
-            'flow_iat_max': np.random.gamma(3, 200, n_samples),
-            'flow_iat_min': np.random.exponential(5, n_samples),
-            'fwd_iat_total': np.random.gamma(2, 100, n_samples),
-            'fwd_iat_mean': np.random.exponential(80, n_samples),
-            'fwd_iat_std': np.random.gamma(2, 40, n_samples),
-            'fwd_iat_max': np.random.gamma(3, 150, n_samples),
-            'fwd_iat_min': np.random.exponential(3, n_samples),
-            'bwd_iat_total': np.random.gamma(2, 80, n_samples),
-            'bwd_iat_mean': np.random.exponential(60, n_samples),
-            'bwd_iat_std': np.random.gamma(2, 30, n_samples),
-            'bwd_iat_max': np.random.gamma(3, 120, n_samples),
-            'bwd_iat_min': np.random.exponential(2, n_samples)
-        }
+        # Synthetic UNR-IDD style features as (column, distribution, parameters)
+        feature_specs = [
+            ('flow_duration', 'exponential', (15,)),
+            ('total_fwd_packets', 'poisson', (10,)),
+            ('total_backward_packets', 'poisson', (8,)),
+            ('total_length_fwd_packets', 'lognormal', (6, 1.5)),
+            ('total_length_bwd_packets', 'lognormal', (5, 1.5)),
+            ('fwd_packet_length_max', 'gamma', (2, 100)),
+            ('fwd_packet_length_min', 'gamma', (1, 20)),
+            ('fwd_packet_length_mean', 'normal', (200, 50)),
+            ('fwd_packet_length_std', 'gamma', (2, 30)),
+            ('bwd_packet_length_max', 'gamma', (2, 80)),
+            ('bwd_packet_length_min', 'gamma', (1, 15)),
+            ('bwd_packet_length_mean', 'normal', (150, 40)),
+            ('bwd_packet_length_std', 'gamma', (2, 25)),
+            ('flow_bytes_per_s', 'lognormal', (8, 2)),
+            ('flow_packets_per_s', 'gamma', (2, 5)),
+            ('flow_iat_mean', 'exponential', (100,)),
+            ('flow_iat_std', 'gamma', (2, 50)),
+            ('flow_iat_max', 'gamma', (3, 200)),
+            ('flow_iat_min', 'exponential', (5,)),
+            ('fwd_iat_total', 'gamma', (2, 100)),
+            ('fwd_iat_mean', 'exponential', (80,)),
+            ('fwd_iat_std', 'gamma', (2, 40)),
+            ('fwd_iat_max', 'gamma', (3, 150)),
+            ('fwd_iat_min', 'exponential', (3,)),
+            ('bwd_iat_total', 'gamma', (2, 80)),
+            ('bwd_iat_mean', 'exponential', (60,)),
+            ('bwd_iat_std', 'gamma', (2, 30)),
+            ('bwd_iat_max', 'gamma', (3, 120)),
+            ('bwd_iat_min', 'exponential', (2,))
+        ]
+        
+        # Continuous features are drawn in place into one column-major float32
+        # matrix; packet counts stay integer columns
+        continuous_specs = [spec for spec in feature_specs if spec[1] != 'poisson']
+        matrix = np.empty((n_samples, len(continuous_specs)), dtype=np.float32, order='F')
+        for i, (_, distribution, params) in enumerate(continuous_specs):
+            column = matrix[:, i]
+            if distribution == 'exponential':
+                rng.standard_exponential(dtype=np.float32, out=column)
+                column *= params[0]
+            elif distribution == 'gamma':
+                rng.standard_gamma(params[0], dtype=np.float32, out=column)
+                column *= params[1]
+            else:
+                rng.standard_normal(dtype=np.float32, out=column)
+                column *= params[1]
+                column += params[0]
+                if distribution == 'lognormal':
+                    np.exp(column, out=column)
+        
+        df = pd.DataFrame(matrix, columns=[name for name, _, _ in continuous_specs], copy=False)
+        for position, (name, distribution, params) in enumerate(feature_specs):
+            if distribution == 'poisson':
+                df.insert(position, name, rng.poisson(params[0], n_samples).astype(np.int32))
         
         # Generate class labels
-        classes = np.random.choice(
+        df['class'] = rng.choice(
             ['normal', 'dos', 'probe', 'u2r', 'r2l'],
             n_samples,
             p=[0.65, 0.2, 0.1, 0.025, 0.025]
         )
-        data['class'] = classes
-        
-        df = pd.DataFrame(data)
         
         # Save sample data
-        filepath = self.dataset_path / "sample_unr_idd.csv"
-        df.to_csv(filepath, index=False)
+        df.to_parquet(filepath, compression='zstd', engine='pyarrow', index=False)
         logger.info(f"Created sample UNR-IDD data: {filepath}")
         
         return df
     
-    def get_dataset_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def get_dataset_statistics(self, df: pd.DataFrame, include_numeric_stats: bool = True) -> Dict[str, Any]:
         """
         Get comprehensive statistics about a dataset.
         
         Args:
             df: Dataset to analyze
+            include_numeric_stats: Whether to include df.describe() output,
+                the most expensive part of the report
             
         Returns:
             Dataset statistics
@@ -353,19 +560,21 @@ class DatasetLoader:
                 'dtypes': df.dtypes.astype(str).to_dict(),
                 'missing_values': df.isnull().sum().to_dict(),
                 'memory_usage': df.memory_usage(deep=True).sum(),
-                'numeric_stats': df.describe().to_dict(),
             }
+            if include_numeric_stats:
+                stats['numeric_stats'] = df.describe().to_dict()
             
-            # Class distribution if available
+            # Class distribution if available (balance derived from the same counts)
             if 'class' in df.columns:
-                stats['class_distribution'] = df['class'].value_counts().to_dict()
-                stats['class_balance'] = df['class'].value_counts(normalize=True).to_dict()
+                class_counts = df['class'].value_counts()
+                stats['class_distribution'] = class_counts.to_dict()
+                stats['class_balance'] = (class_counts / class_counts.sum()).to_dict()
             
             # Categorical feature info
-            categorical_cols = df.select_dtypes(include=['object']).columns
+            categorical_df = df.select_dtypes(include=['object'])
             stats['categorical_features'] = {
-                col: df[col].unique().tolist()[:10]  # First 10 unique values
-                for col in categorical_cols
+                col: values.drop_duplicates().head(10).tolist()  # First 10 unique values
+                for col, values in categorical_df.items()
             }
             
             return stats
@@ -5,6 +5,7 @@ Main FastAPI application entry point for NIDS backend.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import os
 
@@ -27,7 +28,8 @@ async def lifespan(app: FastAPI):
     # Initialize ML models on startup
     try:
         from app.ml.model_manager import ModelManager
-        model_manager = ModelManager()
+        # Construction may unpickle the default model; keep it off the event loop
+        model_manager = await asyncio.to_thread(ModelManager)
         app.state.model_manager = model_manager
         
         # Try to auto-load pre-trained model
@@ -57,6 +59,8 @@ async def lifespan(app: FastAPI):
     yield
     
     # Cleanup on shutdown
+    # Logging stays up for later lifespans and uvicorn's own shutdown
+    # messages; its queue is flushed by the atexit hook from setup_logging
     logger.info("Shutting down NIDS Backend Application")
 
 
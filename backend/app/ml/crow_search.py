@@ -3,10 +3,16 @@ Crow Search Algorithm (CSA) for hyperparameter optimization.
 """
 
 import numpy as np
-from typing import Dict, Any, Callable, Tuple, List
+from typing import Dict, Any, Callable, Tuple, List, Optional, Union
+import hashlib
+import json
 import logging
-from sklearn.model_selection import cross_val_score
-from sklearn.metrics import f1_score, make_scorer
+import os
+from pathlib import Path
+from joblib import Parallel, delayed
+from numba import njit
+from sklearn.model_selection import StratifiedKFold, StratifiedShuffleSplit
+from sklearn.metrics import f1_score
 
 from app.core.config import settings
 from app.core.logging import get_logger
@@ -14,6 +20,145 @@ from app.core.logging import get_logger
 logger = get_logger(__name__)
 
 
+@njit(cache=True)
+def _csa_update(
+    population,
+    memory_positions,
+    lower_bounds,
+    upper_bounds,
+    awareness_probability,
+    flight_length,
+    followed,
+    r,
+    r_fl,
+    random_unit
+):
+    """
+    Fused CSA position update with inline bounds clipping.
+    
+    Args:
+        population: Current positions (n_crows, n_params)
+        memory_positions: Memorized best positions (n_crows, n_params)
+        lower_bounds: Lower bound per parameter
+        upper_bounds: Upper bound per parameter
+        awareness_probability: Probability that the followed crow is aware
+        flight_length: Flight length parameter
+        followed: Index of the crow each crow follows
+        r: Uniform draws for the awareness check
+        r_fl: Uniform draws scaling the flight length
+        random_unit: Uniform draws (n_crows, n_params) for random relocation
+        
+    Returns:
+        New positions (n_crows, n_params)
+    """
+    n_crows, n_params = population.shape
+    new_population = np.empty_like(population)
+    
+    for i in range(n_crows):
+        j = followed[i]
+        aware = r[i] < awareness_probability
+        step = r_fl[i] * flight_length
+        for k in range(n_params):
+            if aware:
+                # Crow j is aware: move to a random position
+                value = lower_bounds[k] + random_unit[i, k] * (upper_bounds[k] - lower_bounds[k])
+            else:
+                # Crow j is not aware: follow it towards its memory position
+                value = population[i, k] + step * (memory_positions[j, k] - population[i, k])
+            new_population[i, k] = min(max(value, lower_bounds[k]), upper_bounds[k])
+    
+    return new_population
+
+
+def _fit_fold_predictions(
+    estimator_class,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    train: np.ndarray,
+    test: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fit a fresh classifier on one training fold and predict its test fold.
+    
+    Args:
+        estimator_class: Classifier class accepting fit(..., best_params=...)
+        params: Parameter configuration
+        X: Training features
+        y: Training labels
+        train: Training fold indices
+        test: Test fold indices
+        
+    Returns:
+        True and predicted labels of the test fold
+    """
+    model = estimator_class().fit(X[train], y[train], best_params=params)
+    return y[test], model.predict(X[test])
+
+
+def _fit_and_score_fold(
+    estimator_class,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    train: np.ndarray,
+    test: np.ndarray
+) -> float:
+    """
+    Weighted F1-score of a classifier fitted on one training fold.
+    
+    Returns:
+        Weighted F1-score on the test fold
+    """
+    y_true, y_pred = _fit_fold_predictions(estimator_class, params, X, y, train, test)
+    return f1_score(y_true, y_pred, average='weighted')
+
+
+def _cross_validate_fitness(
+    estimator_class,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    cv: Union[int, List[Tuple[np.ndarray, np.ndarray]]],
+    n_jobs: int
+) -> float:
+    """
+    Mean weighted F1-score of a parameter configuration over CV folds.
+    
+    Folds are fitted directly rather than through cross_val_score, which
+    would clone and re-validate a wrapper estimator for every fold.
+    Module-level so it can be dispatched to joblib worker processes.
+    
+    Args:
+        estimator_class: Classifier class accepting fit(..., best_params=...)
+        params: Parameter configuration
+        X: Training features
+        y: Training labels
+        cv: Number of CV folds, or precomputed (train, test) index splits
+        n_jobs: Number of folds fitted in parallel
+        
+    Returns:
+        F1-score (fitness value), or -inf if evaluation failed
+    """
+    try:
+        # Same unshuffled folds cross_val_score would use for a fold count
+        if isinstance(cv, int):
+            cv = StratifiedKFold(n_splits=cv).split(X, y)
+        
+        # Use F1-score (weighted average for multi-class) as fitness
+        scores = Parallel(n_jobs=n_jobs, pre_dispatch='2*n_jobs')(
+            delayed(_fit_and_score_fold)(estimator_class, params, X, y, train, test)
+            for train, test in cv
+        )
+        
+        # Return mean F1-score
+        return float(np.mean(scores))
+        
+    except Exception as e:
+        logger.warning(f"Parameter evaluation failed: {str(e)}")
+        return float('-inf')  # Return worst possible fitness
+
+
 class CrowSearchOptimizer:
     """
     Crow Search Algorithm for optimizing ML hyperparameters.
@@ -23,12 +168,28 @@ class CrowSearchOptimizer:
     and flight length parameters.
     """
     
+    # Parameters rounded to integers when converting positions
+    INTEGER_PARAMETERS = ('xgb_n_estimators', 'xgb_max_depth')
+    
+    # Decimal places continuous parameters are rounded to when keying the
+    # fitness cache; integer parameters are used as-is
+    FITNESS_CACHE_DECIMALS = {
+        'svm_C': 4,
+        'svm_gamma': 6,
+        'xgb_learning_rate': 4
+    }
+    
     def __init__(
         self,
         population_size: int = None,
         max_iterations: int = None,
         awareness_probability: float = None,
-        flight_length: float = None
+        flight_length: float = None,
+        patience: int = 10,
+        tolerance: float = 1e-4,
+        target_fitness: float = 0.999,
+        eval_subsample_size: Optional[int] = 5000,
+        seed: Optional[int] = None
     ):
         """
         Initialize Crow Search Algorithm.
@@ -38,11 +199,24 @@ class CrowSearchOptimizer:
             max_iterations: Maximum number of iterations
             awareness_probability: Probability of a crow being aware of being followed
             flight_length: Flight length parameter controlling step size
+            patience: Stop once the best fitness has moved less than tolerance
+                over this many iterations
+            tolerance: Minimum best-fitness change counted as progress
+            target_fitness: Stop as soon as the best fitness reaches this value
+            eval_subsample_size: Maximum number of samples used for fitness
+                evaluation (stratified subsample); None uses all samples
+            seed: Seed for the optimizer's random generator
         """
         self.population_size = population_size or settings.CSA_POPULATION_SIZE
         self.max_iterations = max_iterations or settings.CSA_MAX_ITERATIONS
         self.awareness_probability = awareness_probability or settings.CSA_AWARENESS_PROBABILITY
         self.flight_length = flight_length or settings.CSA_FLIGHT_LENGTH
+        self.patience = patience
+        self.tolerance = tolerance
+        self.target_fitness = target_fitness
+        self.eval_subsample_size = eval_subsample_size
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
         
         # Optimization bounds for different parameters
         self.parameter_bounds = {
@@ -52,6 +226,7 @@ class CrowSearchOptimizer:
             'xgb_max_depth': (3, 10),
             'xgb_learning_rate': (0.01, 0.3)
         }
+        self._cache_bounds()
         
         # Algorithm state
         self.population = None
@@ -60,7 +235,17 @@ class CrowSearchOptimizer:
         self.memory_fitness = None
         self.best_position = None
         self.best_fitness = float('-inf')
-        self.convergence_history = []
+        
+        # Best fitness per iteration, preallocated for max_iterations;
+        # the first _n_recorded entries are valid
+        self._convergence_buffer = np.empty(0)
+        self._n_recorded = 0
+        
+        # Memoized CV fitness of already evaluated (rounded) configurations
+        self._fitness_cache: Dict[Tuple, float] = {}
+        
+        # Worker pool shared by the evaluations of a running optimize() call
+        self._parallel: Optional[Parallel] = None
         
         logger.info(f"CSA initialized: pop_size={self.population_size}, "
                    f"max_iter={self.max_iterations}, AP={self.awareness_probability}")
@@ -87,47 +272,77 @@ class CrowSearchOptimizer:
         logger.info("Starting CSA optimization")
         
         try:
+            # Reuse the result of an identical earlier run if one was stored
+            result_path = self._result_cache_path(X, y, classifier, cv_folds)
+            cached_params = self._load_cached_result(result_path)
+            if cached_params is not None:
+                return cached_params
+            
+            # Rank candidates on a fixed subsample of the training data
+            X_eval, y_eval = self._evaluation_subset(X, y)
+            
+            # Fitness entries are keyed by the identity of the evaluation
+            # arrays; drop those of earlier runs, whose arrays may be freed
+            # and their ids reused
+            self._fitness_cache.clear()
+            
+            # Split the subsample once; every candidate reuses the same folds
+            cv_splits = list(
+                StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42).split(X_eval, y_eval)
+            )
+            
             # Initialize population
             self._initialize_population()
             
-            # Define objective function
-            def objective_function(params: Dict[str, float]) -> float:
-                return self._evaluate_parameters(params, X, y, classifier, cv_folds)
-            
-            # Main optimization loop
-            for iteration in range(self.max_iterations):
-                # Evaluate current population
-                for i in range(self.population_size):
-                    params = self._position_to_params(self.population[i])
-                    fitness = objective_function(params)
-                    self.fitness_values[i] = fitness
+            # Keep one worker pool alive for the whole search so each
+            # iteration's evaluations are dispatched without pool setup
+            with Parallel(n_jobs=-1, backend='loky') as parallel:
+                self._parallel = parallel
+                
+                # Main optimization loop
+                for iteration in range(self.max_iterations):
+                    # Evaluate current population
+                    fitness = self._evaluate_population(X_eval, y_eval, classifier, cv_folds, cv_splits)
+                    self.fitness_values = fitness
                     
-                    # Update memory if current position is better
-                    if fitness > self.memory_fitness[i]:
-                        self.memory_positions[i] = self.population[i].copy()
-                        self.memory_fitness[i] = fitness
+                    # Update memory where the current position is better
+                    improved = fitness > self.memory_fitness
+                    self.memory_positions[improved] = self.population[improved]
+                    self.memory_fitness[improved] = fitness[improved]
                     
                     # Update global best
-                    if fitness > self.best_fitness:
-                        self.best_fitness = fitness
-                        self.best_position = self.population[i].copy()
-                
-                # Update crow positions
-                self._update_population()
-                
-                # Record convergence
-                self.convergence_history.append(self.best_fitness)
-                
-                # Log progress
-                if (iteration + 1) % 10 == 0:
-                    logger.info(f"Iteration {iteration + 1}/{self.max_iterations}, "
-                              f"Best fitness: {self.best_fitness:.6f}")
+                    best_idx = int(np.argmax(fitness))
+                    if fitness[best_idx] > self.best_fitness:
+                        self._record_best(best_idx)
+                    
+                    # Update crow positions
+                    self._update_population()
+                    
+                    # Elitism: the best crow stays on the global best, whose
+                    # fitness the next evaluation reads from the cache
+                    if self.best_position is not None:
+                        self.population[best_idx] = self.best_position
+                    
+                    # Record convergence
+                    self._convergence_buffer[iteration] = self.best_fitness
+                    self._n_recorded = iteration + 1
+                    
+                    # Log progress
+                    if (iteration + 1) % 10 == 0:
+                        logger.info(f"Iteration {iteration + 1}/{self.max_iterations}, "
+                                  f"Best fitness: {self.best_fitness:.6f}")
+                    
+                    # Stop early once converged
+                    if self._has_converged():
+                        logger.info(f"CSA converged after {iteration + 1} iterations")
+                        break
             
             # Convert best position to parameters
             if self.best_position is not None:
                 best_params = self._position_to_params(self.best_position)
                 logger.info(f"CSA optimization completed. Best fitness: {self.best_fitness:.6f}")
                 logger.info(f"Best parameters: {best_params}")
+                self._store_result(result_path, best_params)
                 return best_params
             else:
                 # If no valid solution found, return default parameters
@@ -143,91 +358,256 @@ class CrowSearchOptimizer:
         except Exception as e:
             logger.error(f"CSA optimization failed: {str(e)}")
             raise RuntimeError(f"Optimization failed: {str(e)}")
+        
+        finally:
+            self._parallel = None
+    
+    def _evaluation_subset(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw the stratified subsample used for fitness evaluation.
+        
+        Candidate ranking is nearly identical on a class-balanced subsample,
+        while every CV fit gets proportionally cheaper.
+        
+        Args:
+            X: Training features
+            y: Training labels
+            
+        Returns:
+            Subsampled features and labels (the inputs if already small enough)
+        """
+        if self.eval_subsample_size is None or len(y) <= self.eval_subsample_size:
+            return X, y
+        
+        try:
+            splitter = StratifiedShuffleSplit(
+                n_splits=1, train_size=self.eval_subsample_size, random_state=42
+            )
+            indices, _ = next(splitter.split(X, y))
+        except ValueError:
+            # Classes too small to stratify; fall back to a uniform sample
+            indices = np.random.default_rng(42).choice(len(y), self.eval_subsample_size, replace=False)
+        
+        indices = np.sort(indices)
+        logger.info(f"Evaluating CSA fitness on {len(indices)} of {len(y)} samples")
+        return X[indices], y[indices]
+    
+    @property
+    def convergence_history(self) -> np.ndarray:
+        """Best fitness recorded at each completed iteration."""
+        return self._convergence_buffer[:self._n_recorded]
+    
+    @convergence_history.setter
+    def convergence_history(self, values):
+        self._convergence_buffer = np.asarray(values, dtype=np.float64)
+        self._n_recorded = len(self._convergence_buffer)
+    
+    def _has_converged(self) -> bool:
+        """
+        Check whether the search has reached the target fitness or plateaued.
+        
+        Returns:
+            True if the optimization loop should stop
+        """
+        if self.best_fitness >= self.target_fitness:
+            return True
+        
+        if self._n_recorded < self.patience:
+            return False
+        
+        recent = self.convergence_history[-self.patience:]
+        return recent.max() - recent.min() < self.tolerance
+    
+    def _result_cache_path(self, X: np.ndarray, y: np.ndarray, classifier, cv_folds: int) -> Optional[Path]:
+        """
+        Location of the stored result for this dataset and search configuration.
+        
+        Only seeded runs are reproducible, so unseeded runs are not cached.
+        Neither are inputs without a raw buffer to hash (object arrays).
+        
+        Args:
+            X: Training features
+            y: Training labels
+            classifier: Classifier instance to optimize
+            cv_folds: Number of cross-validation folds
+            
+        Returns:
+            Path of the result file, or None if the result is not cached
+        """
+        if not settings.CSA_RESULT_CACHE_PATH or self.seed is None:
+            return None
+        
+        arrays = [np.ascontiguousarray(array) for array in (X, y)]
+        if any(array.dtype.hasobject for array in arrays):
+            return None
+        
+        digest = hashlib.sha1()
+        for array in arrays:
+            digest.update(f"{array.dtype.str}{array.shape}".encode())
+            digest.update(memoryview(array).cast('B'))
+        digest.update(repr((
+            classifier.__class__.__name__,
+            self.population_size,
+            self.max_iterations,
+            self.awareness_probability,
+            self.flight_length,
+            self.patience,
+            self.tolerance,
+            self.target_fitness,
+            self.eval_subsample_size,
+            self.seed,
+            cv_folds,
+            sorted(self.parameter_bounds.items())
+        )).encode())
+        
+        return Path(settings.CSA_RESULT_CACHE_PATH) / f"{digest.hexdigest()}.json"
+    
+    def _load_cached_result(self, result_path: Optional[Path]) -> Optional[Dict[str, Any]]:
+        """Restore a stored optimization result, if present."""
+        if result_path is None:
+            return None
+        
+        try:
+            with open(result_path) as f:
+                result = json.load(f)
+            best_params = result['best_parameters']
+            best_fitness = float(result['best_fitness'])
+            best_position = np.array([best_params[name] for name in self._param_names], dtype=float)
+            convergence_history = np.asarray(result['convergence_history'], dtype=np.float64)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable CSA result cache {result_path}: {str(e)}")
+            return None
+        
+        self.best_fitness = best_fitness
+        self.best_position = best_position
+        self.convergence_history = convergence_history
+        
+        logger.info(f"Reusing stored CSA result from {result_path}. Best fitness: {self.best_fitness:.6f}")
+        return best_params
+    
+    def _store_result(self, result_path: Optional[Path], best_params: Dict[str, Any]):
+        """Persist an optimization result so identical reruns can skip the search."""
+        if result_path is None:
+            return
+        
+        try:
+            result_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = result_path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'best_parameters': best_params,
+                    'best_fitness': float(self.best_fitness),
+                    'convergence_history': self.convergence_history.tolist()
+                }, f)
+            os.replace(tmp_path, result_path)
+        except Exception as e:
+            logger.warning(f"Failed to store CSA result cache {result_path}: {str(e)}")
+    
+    def _cache_bounds(self):
+        """
+        Precompute bound vectors for the current parameter_bounds.
+        
+        Must be called again whenever parameter_bounds is replaced.
+        """
+        self._param_names = list(self.parameter_bounds.keys())
+        bounds = np.array(list(self.parameter_bounds.values()), dtype=float).reshape(-1, 2)
+        self._lower_bounds = bounds[:, 0]
+        self._upper_bounds = bounds[:, 1]
+        self._bounds_range = self._upper_bounds - self._lower_bounds
+        self._param_specs = tuple((name, name in self.INTEGER_PARAMETERS) for name in self._param_names)
     
     def _initialize_population(self):
         """Initialize the crow population randomly within bounds."""
-        n_params = len(self.parameter_bounds)
+        n_params = len(self._param_names)
         
         # Initialize positions randomly within bounds
-        self.population = np.random.random((self.population_size, n_params))
-        
-        # Scale to parameter bounds
-        for i, (param_name, (min_val, max_val)) in enumerate(self.parameter_bounds.items()):
-            self.population[:, i] = (
-                self.population[:, i] * (max_val - min_val) + min_val
-            )
+        self.population = (
+            self._lower_bounds +
+            self.rng.random((self.population_size, n_params)) * self._bounds_range
+        )
         
         # Initialize memory and fitness arrays
         self.memory_positions = self.population.copy()
         self.fitness_values = np.full(self.population_size, float('-inf'))
         self.memory_fitness = np.full(self.population_size, float('-inf'))
         
+        # Start the run without a global best; its position buffer is
+        # allocated once and overwritten on every improvement
+        self.best_fitness = float('-inf')
+        self.best_position = None
+        self._best_buffer = np.empty(n_params)
+        
+        # Reset the convergence record
+        self._convergence_buffer = np.empty(self.max_iterations, dtype=np.float64)
+        self._n_recorded = 0
+        
         logger.debug(f"Population initialized with shape: {self.population.shape}")
     
+    def _record_best(self, index: int):
+        """Record the crow at index as the global best without allocating."""
+        self.best_fitness = self.fitness_values[index]
+        self._best_buffer[:] = self.population[index]
+        self.best_position = self._best_buffer
+    
     def _update_population(self):
         """Update crow positions using CSA rules."""
-        new_population = self.population.copy()
+        n_crows = self.population_size
         
-        for i in range(self.population_size):
-            # Select random crow to follow
-            j = np.random.randint(0, self.population_size)
-            while j == i:  # Ensure different crow
-                j = np.random.randint(0, self.population_size)
-            
-            # Generate random number for awareness check
-            r = np.random.random()
-            
-            if r >= self.awareness_probability:
-                # Crow j is not aware, follow it to its memory position
-                r_fl = np.random.random()  # Random flight length
-                new_position = (
-                    self.population[i] + 
-                    r_fl * self.flight_length * 
-                    (self.memory_positions[j] - self.population[i])
-                )
-            else:
-                # Crow j is aware, generate random position
-                new_position = self._generate_random_position()
-            
-            # Apply bounds constraint
-            new_position = self._apply_bounds(new_position)
-            new_population[i] = new_position
+        # Select a random crow to follow, always different from the follower
+        followed = (np.arange(n_crows) + self.rng.integers(1, n_crows, size=n_crows)) % n_crows
         
-        self.population = new_population
+        # Random numbers for the awareness check, flight length and relocation
+        r = self.rng.random(n_crows)
+        r_fl = self.rng.random(n_crows)
+        random_unit = self.rng.random(self.population.shape)
+        
+        self.population = _csa_update(
+            self.population,
+            self.memory_positions,
+            self._lower_bounds,
+            self._upper_bounds,
+            self.awareness_probability,
+            self.flight_length,
+            followed,
+            r,
+            r_fl,
+            random_unit
+        )
     
     def _generate_random_position(self) -> np.ndarray:
         """Generate a random position within parameter bounds."""
-        position = np.random.random(len(self.parameter_bounds))
-        
-        for i, (param_name, (min_val, max_val)) in enumerate(self.parameter_bounds.items()):
-            position[i] = position[i] * (max_val - min_val) + min_val
-        
-        return position
+        return self._lower_bounds + self.rng.random(len(self._param_names)) * self._bounds_range
     
     def _apply_bounds(self, position: np.ndarray) -> np.ndarray:
-        """Apply parameter bounds to a position."""
-        bounded_position = position.copy()
-        
-        for i, (param_name, (min_val, max_val)) in enumerate(self.parameter_bounds.items()):
-            bounded_position[i] = np.clip(bounded_position[i], min_val, max_val)
-        
-        return bounded_position
+        """Apply parameter bounds to a position (or a population of positions)."""
+        return np.clip(position, self._lower_bounds, self._upper_bounds)
     
     def _position_to_params(self, position: np.ndarray) -> Dict[str, Any]:
         """Convert position vector to parameter dictionary."""
-        params = {}
-        param_names = list(self.parameter_bounds.keys())
+        return self._population_to_params(position[np.newaxis])[0]
+    
+    def _population_to_params(self, population: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        Convert every position of a population to parameter dictionaries.
         
-        for i, param_name in enumerate(param_names):
-            value = position[i]
-            
-            # Handle integer parameters
-            if param_name in ['xgb_n_estimators', 'xgb_max_depth']:
-                params[param_name] = int(round(value))
-            else:
-                params[param_name] = float(value)
+        The positions are converted to Python floats in one tolist() call;
+        integer parameters are rounded (half to even, like np.round).
         
-        return params
+        Args:
+            population: Positions (n_crows, n_params)
+            
+        Returns:
+            Parameter dictionary per crow
+        """
+        return [
+            {
+                name: round(value) if is_integer else value
+                for (name, is_integer), value in zip(self._param_specs, row)
+            }
+            for row in population.tolist()
+        ]
     
     def _evaluate_parameters(
         self,
@@ -235,7 +615,8 @@ class CrowSearchOptimizer:
         X: np.ndarray,
         y: np.ndarray,
         classifier,
-        cv_folds: int
+        cv_folds: int,
+        cv_splits: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
     ) -> float:
         """
         Evaluate parameter configuration using cross-validation.
@@ -246,30 +627,111 @@ class CrowSearchOptimizer:
             y: Training labels
             classifier: Classifier instance
             cv_folds: Number of CV folds
+            cv_splits: Optional precomputed (train, test) index splits
             
         Returns:
             F1-score (fitness value)
         """
-        try:
-            # Create temporary classifier with given parameters
-            temp_classifier = classifier.__class__()
-            temp_classifier.set_params(**params)
-            
-            # Fit temporary classifier
-            temp_classifier.fit(X, y, best_params=params)
-            
-            # Use F1-score as fitness (weighted average for multi-class)
-            f1_scorer = make_scorer(f1_score, average='weighted')
-            scores = cross_val_score(temp_classifier, X, y, cv=cv_folds, scoring=f1_scorer)
-            
-            # Return mean F1-score
-            fitness = np.mean(scores)
+        cache_key = self._fitness_cache_key(params, X, cv_folds)
+        cached_fitness = self._fitness_cache.get(cache_key)
+        if cached_fitness is not None:
+            return cached_fitness
+        
+        cv = cv_splits if cv_splits is not None else cv_folds
+        fitness = _cross_validate_fitness(classifier.__class__, params, X, y, cv, n_jobs=-1)
+        if fitness != float('-inf'):
+            self._fitness_cache[cache_key] = fitness
+        
+        return fitness
+    
+    def _evaluate_population(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        classifier,
+        cv_folds: int,
+        cv_splits: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
+    ) -> np.ndarray:
+        """
+        Evaluate every crow's position, in parallel across crows where useful.
+        
+        Cached configurations are resolved in this process and only distinct
+        uncached ones are dispatched. When there are at least as many of them
+        as CV folds the crows are spread over worker processes with serial
+        folds; otherwise the folds of each candidate are parallelized
+        instead, so cores are not oversubscribed.
+        
+        Args:
+            X: Training features
+            y: Training labels
+            classifier: Classifier instance
+            cv_folds: Number of CV folds
+            cv_splits: Optional precomputed (train, test) index splits
             
-            return fitness
+        Returns:
+            Fitness value per crow
+        """
+        params_list = self._population_to_params(self.population)
+        
+        # Collapse crows sharing a configuration: each distinct key is resolved
+        # once and scattered back through the inverse index
+        unique_index = {}
+        representatives = []  # first crow holding each distinct key
+        inverse = np.empty(len(params_list), dtype=np.intp)
+        for i, params in enumerate(params_list):
+            key = self._fitness_cache_key(params, X, cv_folds)
+            if key not in unique_index:
+                unique_index[key] = len(representatives)
+                representatives.append(i)
+            inverse[i] = unique_index[key]
+        unique_keys = list(unique_index)
+        
+        unique_fitness = np.array([self._fitness_cache.get(key, np.nan) for key in unique_keys])
+        pending = np.flatnonzero(np.isnan(unique_fitness))
+        
+        if len(pending):
+            cv = cv_splits if cv_splits is not None else cv_folds
+            parallel_crows = len(pending) >= cv_folds
+            if parallel_crows:
+                runner = self._parallel or Parallel(n_jobs=-1, backend='loky')
+            else:
+                runner = Parallel(n_jobs=1)
+            scores = runner(
+                delayed(_cross_validate_fitness)(
+                    classifier.__class__, params_list[representatives[u]], X, y, cv,
+                    n_jobs=1 if parallel_crows else -1
+                )
+                for u in pending
+            )
+            unique_fitness[pending] = scores
+            self._fitness_cache.update(
+                (unique_keys[u], fitness) for u, fitness in zip(pending, scores)
+                if fitness != float('-inf')
+            )
+        
+        return unique_fitness[inverse]
+    
+    def _fitness_cache_key(self, params: Dict[str, Any], X: np.ndarray, cv_folds: int) -> Tuple:
+        """
+        Build the fitness cache key for a parameter configuration.
+        
+        Continuous parameters are rounded so near-duplicate candidates share
+        an entry; the training data identity and fold count are included so
+        results never leak across datasets.
+        
+        Args:
+            params: Parameter configuration
+            X: Training features
+            cv_folds: Number of CV folds
             
-        except Exception as e:
-            logger.warning(f"Parameter evaluation failed: {str(e)}")
-            return float('-inf')  # Return worst possible fitness
+        Returns:
+            Hashable cache key
+        """
+        rounded = tuple(sorted(
+            (name, round(value, self.FITNESS_CACHE_DECIMALS.get(name, 6)) if isinstance(value, float) else value)
+            for name, value in params.items()
+        ))
+        return (id(X), X.shape, cv_folds) + rounded
     
     def get_optimization_history(self) -> Dict[str, Any]:
         """
@@ -278,14 +740,12 @@ class CrowSearchOptimizer:
         Returns:
             Optimization history and final results
         """
+        history = self.convergence_history
         return {
-            'convergence_history': self.convergence_history,
+            'convergence_history': history.tolist(),
             'best_fitness': self.best_fitness,
             'best_parameters': self._position_to_params(self.best_position) if self.best_position is not None else {},
-            'total_iterations': len(self.convergence_history),
+            'total_iterations': len(history),
             'population_size': self.population_size,
-            'final_improvement': (
-                self.convergence_history[-1] - self.convergence_history[0]
-                if len(self.convergence_history) > 1 else 0
-            )
+            'final_improvement': float(history[-1] - history[0]) if len(history) > 1 else 0
         }
@@ -3,22 +3,97 @@ Enhanced Crow Search Algorithm (CSA) for Multi-Objective Optimization.
 Supports optimization of both ML hyperparameters and SGM parameters.
 """
 
+import copy
 import numpy as np
 from typing import Dict, Any, List, Tuple, Optional, Union, Callable
 import logging
 from dataclasses import dataclass
-from sklearn.model_selection import cross_val_score
-from sklearn.metrics import f1_score, accuracy_score, precision_score, recall_score, make_scorer
-import concurrent.futures
-from concurrent.futures import ThreadPoolExecutor
+from scipy.spatial.distance import pdist
+from sklearn.model_selection import StratifiedKFold, StratifiedShuffleSplit
+from sklearn.metrics import accuracy_score, precision_recall_fscore_support
 import time
+from collections import OrderedDict
+from joblib import Parallel, delayed
+from numba import njit
 
 from app.core.config import settings
 from app.core.logging import get_logger
-from app.ml.crow_search import CrowSearchOptimizer  # Import base class
+from app.ml.crow_search import CrowSearchOptimizer, _fit_fold_predictions  # Import base class
+from app.ml.sgm_analyzer import SGMNetworkAnalyzer
 
 logger = get_logger(__name__)
 
+def _fit_and_score_objectives(
+    estimator_class,
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y: np.ndarray,
+    train: np.ndarray,
+    test: np.ndarray
+) -> Dict[str, float]:
+    """
+    Score every ML objective of a classifier fitted on one training fold.
+    
+    Returns:
+        Accuracy and weighted F1-score, precision and recall on the test fold
+    """
+    y_true, y_pred = _fit_fold_predictions(estimator_class, params, X, y, train, test)
+    
+    precision, recall, f1, _ = precision_recall_fscore_support(y_true, y_pred, average='weighted')
+    return {
+        'accuracy': accuracy_score(y_true, y_pred),
+        'f1_score': f1,
+        'precision': precision,
+        'recall': recall
+    }
+
+
+@njit(cache=True)
+def _weighted_fitness(scores, weights, minimize, target_min, target_max, has_target_range):
+    """
+    Weighted fitness of solutions from their objective scores.
+    
+    Args:
+        scores: Objective scores (n_solutions, n_objectives); NaN marks a
+            missing objective, which is left out of the weighting
+        weights: Objective weights
+        minimize: Whether each objective is minimized
+        target_min: Lower end of each objective's target range
+        target_max: Upper end of each objective's target range
+        has_target_range: Whether each objective is normalized to its range
+        
+    Returns:
+        Fitness per solution
+    """
+    n_solutions, n_objectives = scores.shape
+    fitness = np.zeros(n_solutions)
+    
+    for i in range(n_solutions):
+        total_fitness = 0.0
+        total_weight = 0.0
+        for k in range(n_objectives):
+            score = scores[i, k]
+            if np.isnan(score):
+                continue
+            
+            # Convert to maximization problem if needed
+            if minimize[k]:
+                score = 1.0 - score  # Simple inversion for [0,1] range
+            
+            # Apply target range normalization if specified
+            if has_target_range[k]:
+                score = (score - target_min[k]) / (target_max[k] - target_min[k])
+                score = min(max(score, 0.0), 1.0)
+            
+            total_fitness += weights[k] * score
+            total_weight += weights[k]
+        
+        # Normalize by total weight
+        if total_weight > 0:
+            fitness[i] = total_fitness / total_weight
+    
+    return fitness
+
 
 @dataclass
 class OptimizationObjective:
@@ -47,6 +122,34 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
     for both ML hyperparameters and SGM parameters.
     """
     
+    # Integer-valued parameters, including the SGM ones and the encoded
+    # covariance type
+    INTEGER_PARAMETERS = CrowSearchOptimizer.INTEGER_PARAMETERS + (
+        'sgm_n_components', 'sgm_covariance_type_encoded', 'sgm_window_size'
+    )
+    
+    # Maximum number of solutions kept on the Pareto front
+    PARETO_FRONT_LIMIT = 50
+    
+    # Maximum number of memoized objective evaluations
+    OBJECTIVE_CACHE_SIZE = 4096
+    
+    # Number of crow pairs sampled to estimate the diversity of populations
+    # with more pairs than this
+    DIVERSITY_SAMPLE_PAIRS = 512
+    
+    # Covariance types addressed by the encoded sgm_covariance_type parameter
+    SGM_COVARIANCE_TYPES = ('full', 'tied', 'diag', 'spherical')
+    
+    # Per-iteration convergence record, preallocated for max_iterations
+    CONVERGENCE_DTYPE = np.dtype([
+        ('iteration', np.int32),
+        ('best_fitness', np.float64),
+        ('population_diversity', np.float64),
+        ('iteration_time', np.float64),
+        ('pareto_size', np.int32)
+    ])
+    
     def __init__(
         self,
         population_size: int = None,
@@ -55,7 +158,13 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
         flight_length: float = None,
         objectives: List[OptimizationObjective] = None,
         parallel_evaluation: bool = True,
-        adaptive_parameters: bool = True
+        adaptive_parameters: bool = True,
+        seed: Optional[int] = None,
+        successive_halving: bool = False,
+        screen_fraction: float = 0.2,
+        screen_cv_folds: int = 2,
+        keep_fraction: float = 0.5,
+        cv_train_size: Optional[float] = None
     ):
         """
         Initialize Enhanced CSA Optimizer.
@@ -68,8 +177,28 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
             objectives: List of optimization objectives
             parallel_evaluation: Whether to evaluate solutions in parallel
             adaptive_parameters: Whether to adapt CSA parameters during optimization
+            seed: Seed for the optimizer's random generator
+            successive_halving: Whether to screen new candidates on a data
+                subsample and fully evaluate only the most promising ones
+            screen_fraction: Fraction of the training data used for screening
+            screen_cv_folds: Number of CV folds used for screening
+            keep_fraction: Fraction of screened candidates promoted to a
+                full evaluation
+            cv_train_size: Fraction of the data each candidate is trained on
+                per split (stratified shuffle splits); None uses K-fold CV
         """
-        super().__init__(population_size, max_iterations, awareness_probability, flight_length)
+        super().__init__(population_size, max_iterations, awareness_probability, flight_length, seed=seed)
+        
+        # Separate stream for diversity sampling, so the diagnostic does not
+        # shift the search's own random draws
+        self._diversity_rng = np.random.default_rng(seed)
+        
+        # Successive halving settings
+        self.successive_halving = successive_halving
+        self.screen_fraction = screen_fraction
+        self.screen_cv_folds = screen_cv_folds
+        self.keep_fraction = keep_fraction
+        self.cv_train_size = cv_train_size
         
         # Multi-objective optimization settings
         self.objectives = objectives or [
@@ -79,6 +208,16 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
             OptimizationObjective("recall", 0.15, minimize=False)
         ]
         
+        # Fixed objective order and direction used by the Pareto front arrays
+        self._objective_names = tuple(obj.name for obj in self.objectives)
+        self._objective_signs = np.array([-1.0 if obj.minimize else 1.0 for obj in self.objectives])
+        self._objective_weights = np.array([obj.weight for obj in self.objectives], dtype=float)
+        self._objective_minimize = np.array([obj.minimize for obj in self.objectives], dtype=np.bool_)
+        self._has_target_range = np.array([obj.target_range is not None for obj in self.objectives], dtype=np.bool_)
+        target_ranges = np.array([obj.target_range or (0.0, 1.0) for obj in self.objectives], dtype=float).reshape(-1, 2)
+        self._target_min = target_ranges[:, 0]
+        self._target_max = target_ranges[:, 1]
+        
         # Enhanced parameter bounds for SGM
         self.sgm_parameter_bounds = {
             'sgm_n_components': (2, 20),
@@ -92,11 +231,17 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
         self.all_parameter_bounds = {**self.parameter_bounds, **self.sgm_parameter_bounds}
         
         # Multi-objective optimization state
+        self._convergence_records = np.zeros(self.max_iterations, dtype=self.CONVERGENCE_DTYPE)
+        self._n_iteration_records = 0
         self.pareto_front = []
+        self._front_objectives = np.empty((0, len(self.objectives)))
+        self._front_fitness = np.empty(0)
         self.objective_history = []
+        
+        # LRU memo of objective scores per (rounded) configuration
+        self._objective_cache: OrderedDict = OrderedDict()
         self.parallel_evaluation = parallel_evaluation
         self.adaptive_parameters = adaptive_parameters
-        self.executor = ThreadPoolExecutor(max_workers=4) if parallel_evaluation else None
         
         # Adaptive CSA parameters
         self.initial_awareness_probability = self.awareness_probability
@@ -105,6 +250,26 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
         logger.info(f"Enhanced CSA initialized with {len(self.objectives)} objectives, "
                    f"parallel_evaluation={parallel_evaluation}, adaptive={adaptive_parameters}")
     
+    # Run-time state that evaluation workers never read; it is left out
+    # of the copy of the optimizer sent along with each evaluation task
+    _WORKER_EXCLUDED_STATE = (
+        '_parallel', '_objective_cache', '_fitness_cache', 'pareto_front',
+        '_front_objectives', '_front_fitness', '_convergence_buffer', '_convergence_records',
+        'objective_history'
+    )
+    
+    def _worker_evaluator(self) -> 'EnhancedCSAOptimizer':
+        """
+        Shallow copy of the optimizer for evaluation workers.
+        
+        Returns:
+            Optimizer copy without its per-run caches, front, history and pool
+        """
+        evaluator = copy.copy(self)
+        for name in self._WORKER_EXCLUDED_STATE:
+            evaluator.__dict__.pop(name, None)
+        return evaluator
+    
     def optimize_multi_objective(
         self,
         X: np.ndarray,
@@ -132,18 +297,23 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
         start_time = time.time()
         
         try:
+            # One contiguous (optionally float32) copy of the features serves
+            # every fold split, worker transfer and SGM subset
+            X = np.ascontiguousarray(X, dtype=np.float32 if settings.CSA_FLOAT32_INPUTS else None)
+            
             # Set parameter bounds based on what we're optimizing
-            if include_sgm and sgm_analyzer:
-                self.parameter_bounds = self.all_parameter_bounds
-            else:
-                # Use only ML parameters
-                self.parameter_bounds = {
-                    k: v for k, v in self.all_parameter_bounds.items()
-                    if not k.startswith('sgm_')
-                }
+            self._set_parameter_bounds(include_sgm and sgm_analyzer is not None)
             
-            # Initialize population
+            # Initialize population and the convergence record
             self._initialize_population()
+            self._convergence_records = np.zeros(self.max_iterations, dtype=self.CONVERGENCE_DTYPE)
+            self._n_iteration_records = 0
+            
+            # Memoized scores are only valid for this run's data and settings
+            self._objective_cache.clear()
+            
+            # Stratified subsample on which new ML candidates are screened
+            screen_data = self._screening_subset(X, y) if self.successive_halving and ml_classifier else None
             
             # Multi-objective evaluation function
             def evaluate_solution(params: Dict[str, Any]) -> Dict[str, float]:
@@ -151,97 +321,64 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
                     params, X, y, ml_classifier, sgm_analyzer, cv_folds, include_sgm
                 )
             
-            # Main optimization loop
-            for iteration in range(self.max_iterations):
-                iteration_start = time.time()
+            # One worker pool serves the whole run: loky keeps its workers
+            # alive between batches, and arrays above max_nbytes are dumped
+            # once to a shared memory-mapped file that every worker attaches
+            # to, instead of pickling X and y into each task
+            with Parallel(n_jobs=-1 if self.parallel_evaluation else 1, backend='loky') as parallel:
+                self._parallel = parallel
                 
-                # Evaluate population
-                if self.parallel_evaluation and self.executor:
-                    # Parallel evaluation
-                    futures = []
-                    for i in range(self.population_size):
-                        params = self._position_to_params(self.population[i])
-                        future = self.executor.submit(evaluate_solution, params)
-                        futures.append((i, future))
+                # Main optimization loop
+                for iteration in range(self.max_iterations):
+                    iteration_start = time.time()
                     
-                    # Collect results
-                    for i, future in futures:
-                        try:
-                            objective_scores = future.result(timeout=300)  # 5 minute timeout
-                            fitness = self._calculate_weighted_fitness(objective_scores)
-                            self.fitness_values[i] = fitness
-                            
-                            # Update memory if better
-                            if fitness > self.memory_fitness[i]:
-                                self.memory_positions[i] = self.population[i].copy()
-                                self.memory_fitness[i] = fitness
-                                
-                                # Update Pareto front
-                                self._update_pareto_front(
-                                    self._position_to_params(self.population[i]),
-                                    objective_scores,
-                                    fitness
-                                )
-                        
-                        except concurrent.futures.TimeoutError:
-                            logger.warning(f"Evaluation timeout for solution {i}")
-                            self.fitness_values[i] = float('-inf')
-                        except Exception as e:
-                            logger.warning(f"Evaluation error for solution {i}: {str(e)}")
-                            self.fitness_values[i] = float('-inf')
-                else:
-                    # Sequential evaluation
-                    for i in range(self.population_size):
-                        params = self._position_to_params(self.population[i])
-                        try:
-                            objective_scores = evaluate_solution(params)
-                            fitness = self._calculate_weighted_fitness(objective_scores)
-                            self.fitness_values[i] = fitness
-                            
-                            # Update memory if better
-                            if fitness > self.memory_fitness[i]:
-                                self.memory_positions[i] = self.population[i].copy()
-                                self.memory_fitness[i] = fitness
-                                
-                                # Update Pareto front
-                                self._update_pareto_front(params, objective_scores, fitness)
-                        
-                        except Exception as e:
-                            logger.warning(f"Evaluation error for solution {i}: {str(e)}")
-                            self.fitness_values[i] = float('-inf')
-                
-                # Update global best
-                best_idx = np.argmax(self.fitness_values)
-                if self.fitness_values[best_idx] > self.best_fitness:
-                    self.best_fitness = self.fitness_values[best_idx]
-                    self.best_position = self.population[best_idx].copy()
-                
-                # Update crow positions
-                self._update_population()
-                
-                # Adaptive parameter adjustment
-                if self.adaptive_parameters:
-                    self._adapt_csa_parameters(iteration)
-                
-                # Record convergence
-                iteration_time = time.time() - iteration_start
-                convergence_info = {
-                    'iteration': iteration + 1,
-                    'best_fitness': self.best_fitness,
-                    'population_diversity': self._calculate_population_diversity(),
-                    'iteration_time': iteration_time,
-                    'pareto_size': len(self.pareto_front)
-                }
-                self.convergence_history.append(convergence_info)
-                
-                # Log progress
-                if (iteration + 1) % 10 == 0:
-                    logger.info(
-                        f"Iteration {iteration + 1}/{self.max_iterations}: "
-                        f"Best fitness={self.best_fitness:.6f}, "
-                        f"Pareto size={len(self.pareto_front)}, "
-                        f"Diversity={convergence_info['population_diversity']:.4f}"
+                    # Evaluate population
+                    params_list, all_objective_scores, full_fidelity = self._evaluate_population_objectives(
+                        X, y, ml_classifier, sgm_analyzer, cv_folds, include_sgm, screen_data
                     )
+                    
+                    fitness = self._calculate_weighted_fitness_batch(self._objective_matrix(all_objective_scores))
+                    self.fitness_values[:] = fitness
+                    
+                    # Update memory where the current position is better
+                    improved = fitness > self.memory_fitness
+                    self.memory_positions[improved] = self.population[improved]
+                    self.memory_fitness[improved] = fitness[improved]
+                    
+                    # Update Pareto front with improved, fully evaluated solutions
+                    for i in np.flatnonzero(improved & full_fidelity):
+                        self._update_pareto_front(params_list[i], all_objective_scores[i], float(fitness[i]))
+                    
+                    # Update global best from fully evaluated solutions
+                    best_idx = int(np.argmax(np.where(full_fidelity, fitness, float('-inf'))))
+                    if self.fitness_values[best_idx] > self.best_fitness:
+                        self._record_best(best_idx)
+                    
+                    # Update crow positions
+                    self._update_population()
+                    
+                    # Adaptive parameter adjustment
+                    if self.adaptive_parameters:
+                        self._adapt_csa_parameters(iteration)
+                    
+                    # Record convergence
+                    iteration_time = time.time() - iteration_start
+                    diversity = self._calculate_population_diversity()
+                    self._convergence_records[iteration] = (
+                        iteration + 1, self.best_fitness, diversity, iteration_time, len(self.pareto_front)
+                    )
+                    self._n_iteration_records = iteration + 1
+                    self._convergence_buffer[iteration] = self.best_fitness
+                    self._n_recorded = iteration + 1
+                    
+                    # Log progress
+                    if (iteration + 1) % 10 == 0:
+                        logger.info(
+                            f"Iteration {iteration + 1}/{self.max_iterations}: "
+                            f"Best fitness={self.best_fitness:.6f}, "
+                            f"Pareto size={len(self.pareto_front)}, "
+                            f"Diversity={diversity:.4f}"
+                        )
             
             # Prepare final results
             optimization_time = time.time() - start_time
@@ -249,7 +386,8 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
             
             # Get final objective scores for best solution
             if best_params:
-                best_objective_scores = evaluate_solution(best_params)
+                best_key = self._fitness_cache_key(best_params, X, cv_folds)
+                best_objective_scores = self._objective_cache.get(best_key) or evaluate_solution(best_params)
             else:
                 best_objective_scores = {obj.name: 0.0 for obj in self.objectives}
             
@@ -257,7 +395,7 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
                 best_parameters=best_params,
                 best_fitness=self.best_fitness,
                 objective_scores=best_objective_scores,
-                convergence_history=self.convergence_history,
+                convergence_history=self.iteration_records,
                 pareto_front=self.pareto_front,
                 optimization_time=optimization_time,
                 iterations_completed=self.max_iterations
@@ -272,10 +410,149 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
         except Exception as e:
             logger.error(f"Enhanced CSA optimization failed: {str(e)}")
             raise RuntimeError(f"Multi-objective optimization failed: {str(e)}")
-        
         finally:
-            if self.executor:
-                self.executor.shutdown(wait=True)
+            self._parallel = None
+    
+    @property
+    def iteration_records(self) -> List[Dict[str, Any]]:
+        """Per-iteration convergence records of the last multi-objective run as dicts."""
+        names = self.CONVERGENCE_DTYPE.names
+        return [dict(zip(names, record)) for record in self._convergence_records[:self._n_iteration_records].tolist()]
+    
+    def _set_parameter_bounds(self, include_sgm: bool):
+        """
+        Select the search space and cache its bound arrays for the run.
+        
+        Args:
+            include_sgm: Whether the SGM parameters are searched alongside
+                the ML hyperparameters
+        """
+        if include_sgm:
+            self.parameter_bounds = self.all_parameter_bounds
+        else:
+            # Use only ML parameters
+            self.parameter_bounds = {
+                k: v for k, v in self.all_parameter_bounds.items()
+                if k not in self.sgm_parameter_bounds
+            }
+        self._cache_bounds()
+    
+    def _evaluate_population_objectives(
+        self,
+        X: np.ndarray,
+        y: np.ndarray,
+        ml_classifier,
+        sgm_analyzer,
+        cv_folds: int,
+        include_sgm: bool,
+        screen_data: Optional[Tuple[np.ndarray, np.ndarray]] = None
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, float]], np.ndarray]:
+        """
+        Evaluate the objectives of every crow's position.
+        
+        Configurations already scored in this run are served from the LRU
+        memo; the distinct remaining ones are evaluated in worker processes,
+        since the CV fits are CPU-bound. With screening data, the remaining
+        ones are first scored on it and only the best keep_fraction of them
+        receive a full evaluation (successive halving); the others keep
+        their screening scores, which are not memoized.
+        
+        Returns:
+            Parameters, objective scores and full-evaluation flag per crow
+        """
+        params_list = self._population_to_params(self.population)
+        keys = [self._fitness_cache_key(params, X, cv_folds) for params in params_list]
+        
+        resolved = {}
+        screened = set()
+        pending = {}  # distinct configurations without memoized scores
+        for key, params in zip(keys, params_list):
+            if key in resolved or key in pending:
+                continue
+            if key in self._objective_cache:
+                self._objective_cache.move_to_end(key)
+                resolved[key] = self._objective_cache[key]
+            else:
+                pending[key] = params
+        
+        if pending and screen_data is not None and len(pending) > 1:
+            X_screen, y_screen = screen_data
+            screen_scores = self._run_objective_evaluations(
+                list(pending.values()), X_screen, y_screen, ml_classifier, sgm_analyzer,
+                self.screen_cv_folds, include_sgm
+            )
+            screen_fitness = self._calculate_weighted_fitness_batch(self._objective_matrix(screen_scores))
+            
+            # Promote the most promising candidates; the rest keep their screening scores
+            n_promoted = max(1, int(np.ceil(self.keep_fraction * len(pending))))
+            promoted = set(np.argpartition(-screen_fitness, n_promoted - 1)[:n_promoted].tolist())
+            for j, (key, objective_scores) in enumerate(zip(list(pending), screen_scores)):
+                if j not in promoted:
+                    resolved[key] = objective_scores
+                    screened.add(key)
+                    del pending[key]
+        
+        if pending:
+            new_scores = self._run_objective_evaluations(
+                list(pending.values()), X, y, ml_classifier, sgm_analyzer, cv_folds, include_sgm
+            )
+            for key, objective_scores in zip(pending, new_scores):
+                resolved[key] = objective_scores
+                self._objective_cache[key] = objective_scores
+            
+            while len(self._objective_cache) > self.OBJECTIVE_CACHE_SIZE:
+                self._objective_cache.popitem(last=False)
+        
+        full_fidelity = np.array([key not in screened for key in keys], dtype=bool)
+        return params_list, [resolved[key] for key in keys], full_fidelity
+    
+    def _run_objective_evaluations(
+        self,
+        params_list: List[Dict[str, Any]],
+        X: np.ndarray,
+        y: np.ndarray,
+        ml_classifier,
+        sgm_analyzer,
+        cv_folds: int,
+        include_sgm: bool
+    ) -> List[Dict[str, float]]:
+        """Evaluate the objectives of several configurations in worker processes."""
+        # loky caps the BLAS/OpenMP threads of each worker at
+        # cpu_count // n_jobs, so the XGBoost and SVM fits inside the
+        # workers do not oversubscribe the cores
+        runner = self._parallel or Parallel(n_jobs=-1 if self.parallel_evaluation else 1, backend='loky')
+        evaluator = self._worker_evaluator()
+        return runner(
+            delayed(evaluator._evaluate_multi_objective)(
+                params, X, y, ml_classifier, sgm_analyzer, cv_folds, include_sgm
+            )
+            for params in params_list
+        )
+    
+    def _objective_matrix(self, all_objective_scores: List[Dict[str, float]]) -> np.ndarray:
+        """Stack objective score dicts into an (n, n_objectives) array, NaN where missing."""
+        return np.array([
+            [objective_scores.get(name, np.nan) for name in self._objective_names]
+            for objective_scores in all_objective_scores
+        ], dtype=float).reshape(-1, len(self._objective_names))
+    
+    def _screening_subset(self, X: np.ndarray, y: np.ndarray) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Stratified subsample used to screen candidates.
+        
+        Returns:
+            Screening features and labels, or None if the data is too small
+            to subsample
+        """
+        n_screen = int(len(y) * self.screen_fraction)
+        try:
+            splitter = StratifiedShuffleSplit(n_splits=1, train_size=n_screen, random_state=42)
+            indices, _ = next(splitter.split(X, y))
+        except ValueError as e:
+            logger.info(f"Skipping candidate screening: {str(e)}")
+            return None
+        
+        return X[indices], y[indices]
     
     def _evaluate_multi_objective(
         self,
@@ -335,60 +612,38 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
     ) -> Dict[str, float]:
         """Evaluate ML classifier objectives."""
         try:
-            # Create temporary classifier with parameters
-            temp_classifier = classifier.__class__()
-            
-            # Convert parameter names back to classifier format
-            classifier_params = {}
-            for param_name, value in ml_params.items():
-                if param_name == 'svm_C':
-                    classifier_params['C'] = value
-                elif param_name == 'svm_gamma':
-                    classifier_params['gamma'] = value
-                elif param_name.startswith('xgb_'):
-                    # Handle XGBoost parameters
-                    xgb_param = param_name[4:]  # Remove 'xgb_' prefix
-                    classifier_params[xgb_param] = value
-            
-            # Fit classifier
-            temp_classifier.set_params(**classifier_params)
-            
-            # Calculate cross-validation scores for different metrics
-            scores = {}
-            
-            # Accuracy
-            accuracy_scores = cross_val_score(
-                temp_classifier, X, y, cv=cv_folds, scoring='accuracy'
-            )
-            scores['accuracy'] = np.mean(accuracy_scores)
-            
-            # F1 Score (weighted for multi-class)
-            f1_scorer = make_scorer(f1_score, average='weighted')
-            f1_scores = cross_val_score(
-                temp_classifier, X, y, cv=cv_folds, scoring=f1_scorer
-            )
-            scores['f1_score'] = np.mean(f1_scores)
-            
-            # Precision (weighted)
-            precision_scorer = make_scorer(precision_score, average='weighted')
-            precision_scores = cross_val_score(
-                temp_classifier, X, y, cv=cv_folds, scoring=precision_scorer
-            )
-            scores['precision'] = np.mean(precision_scores)
-            
-            # Recall (weighted)
-            recall_scorer = make_scorer(recall_score, average='weighted')
-            recall_scores = cross_val_score(
-                temp_classifier, X, y, cv=cv_folds, scoring=recall_scorer
-            )
-            scores['recall'] = np.mean(recall_scores)
+            # Fit each fold once and score all metrics on the same predictions
+            fold_scores = [
+                _fit_and_score_objectives(classifier.__class__, ml_params, X, y, train, test)
+                for train, test in self._cv_splitter(cv_folds).split(X, y)
+            ]
             
-            return scores
+            return {
+                name: float(np.mean([scores[name] for scores in fold_scores]))
+                for name in fold_scores[0]
+            }
             
         except Exception as e:
             logger.warning(f"ML evaluation failed: {str(e)}")
             return {'accuracy': 0.0, 'f1_score': 0.0, 'precision': 0.0, 'recall': 0.0}
     
+    def _cv_splitter(self, n_splits: int):
+        """
+        Splitter used to cross-validate ML candidates.
+        
+        Shuffle splits are seeded, so every candidate is scored on the same
+        splits.
+        
+        Args:
+            n_splits: Number of splits
+            
+        Returns:
+            StratifiedKFold, or StratifiedShuffleSplit when cv_train_size is set
+        """
+        if self.cv_train_size is None:
+            return StratifiedKFold(n_splits=n_splits)
+        return StratifiedShuffleSplit(n_splits=n_splits, train_size=self.cv_train_size, random_state=0)
+    
     def _evaluate_sgm_objectives(
         self,
         sgm_params: Dict[str, Any],
@@ -404,9 +659,10 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
                 converted_params['n_components'] = int(sgm_params['sgm_n_components'])
             
             if 'sgm_covariance_type_encoded' in sgm_params:
-                covariance_types = ['full', 'tied', 'diag', 'spherical']
                 type_idx = int(sgm_params['sgm_covariance_type_encoded'])
-                converted_params['covariance_type'] = covariance_types[min(type_idx, len(covariance_types)-1)]
+                converted_params['covariance_type'] = self.SGM_COVARIANCE_TYPES[
+                    min(type_idx, len(self.SGM_COVARIANCE_TYPES) - 1)
+                ]
             
             if 'sgm_anomaly_threshold' in sgm_params:
                 converted_params['anomaly_threshold'] = sgm_params['sgm_anomaly_threshold']
@@ -418,7 +674,6 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
                 converted_params['window_size'] = int(sgm_params['sgm_window_size'])
             
             # Create temporary SGM analyzer with parameters
-            from app.ml.sgm_analyzer import SGMNetworkAnalyzer
             temp_sgm = SGMNetworkAnalyzer(**converted_params)
             
             # Use subset of data for faster evaluation
@@ -454,31 +709,27 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
     
     def _calculate_weighted_fitness(self, objective_scores: Dict[str, float]) -> float:
         """Calculate weighted fitness from multiple objectives."""
-        total_fitness = 0.0
-        total_weight = 0.0
-        
-        for objective in self.objectives:
-            if objective.name in objective_scores:
-                score = objective_scores[objective.name]
-                
-                # Convert to maximization problem if needed
-                if objective.minimize:
-                    score = 1.0 - score  # Simple inversion for [0,1] range
-                
-                # Apply target range normalization if specified
-                if objective.target_range:
-                    min_val, max_val = objective.target_range
-                    score = (score - min_val) / (max_val - min_val)
-                    score = np.clip(score, 0.0, 1.0)
-                
-                total_fitness += objective.weight * score
-                total_weight += objective.weight
+        return float(self._calculate_weighted_fitness_batch(self._objective_matrix([objective_scores]))[0])
+    
+    def _calculate_weighted_fitness_batch(self, scores: np.ndarray) -> np.ndarray:
+        """
+        Calculate the weighted fitness of several solutions at once.
         
-        # Normalize by total weight
-        if total_weight > 0:
-            return total_fitness / total_weight
-        else:
-            return 0.0
+        Args:
+            scores: Objective scores (n_solutions, n_objectives) in objective
+                order, NaN where an objective is missing
+            
+        Returns:
+            Fitness per solution
+        """
+        return _weighted_fitness(
+            scores,
+            self._objective_weights,
+            self._objective_minimize,
+            self._target_min,
+            self._target_max,
+            self._has_target_range
+        )
     
     def _update_pareto_front(
         self,
@@ -487,58 +738,38 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
         fitness: float
     ):
         """Update the Pareto front with new solution."""
-        solution = {
+        scores = np.array([objective_scores.get(name, 0.0) for name in self._objective_names])
+        
+        # Check the solution against every front member at once; positive
+        # entries mark objectives where the member is better
+        diff = (self._front_objectives - scores) * self._objective_signs
+        dominated_by = np.all(diff >= 0, axis=1) & np.any(diff > 0, axis=1)
+        if dominated_by.any():
+            return
+        dominates = np.all(diff <= 0, axis=1) & np.any(diff < 0, axis=1)
+        
+        # Remove dominated solutions
+        keep = ~dominates
+        self.pareto_front = [solution for solution, kept in zip(self.pareto_front, keep) if kept]
+        self._front_objectives = self._front_objectives[keep]
+        self._front_fitness = self._front_fitness[keep]
+        
+        # Add new solution
+        self.pareto_front.append({
             'parameters': params.copy(),
             'objectives': objective_scores.copy(),
             'fitness': fitness
-        }
+        })
+        self._front_objectives = np.vstack([self._front_objectives, scores])
+        self._front_fitness = np.append(self._front_fitness, fitness)
         
-        # Check if solution dominates any existing solutions
-        dominated_indices = []
-        is_dominated = False
-        
-        for i, existing in enumerate(self.pareto_front):
-            if self._dominates(objective_scores, existing['objectives']):
-                dominated_indices.append(i)
-            elif self._dominates(existing['objectives'], objective_scores):
-                is_dominated = True
-                break
-        
-        # Add solution if it's not dominated
-        if not is_dominated:
-            # Remove dominated solutions
-            for i in reversed(dominated_indices):
-                self.pareto_front.pop(i)
-            
-            # Add new solution
-            self.pareto_front.append(solution)
-            
-            # Limit Pareto front size to avoid memory issues
-            if len(self.pareto_front) > 50:
-                # Keep solutions with highest fitness
-                self.pareto_front.sort(key=lambda x: x['fitness'], reverse=True)
-                self.pareto_front = self.pareto_front[:50]
-    
-    def _dominates(self, scores1: Dict[str, float], scores2: Dict[str, float]) -> bool:
-        """Check if scores1 dominates scores2 (Pareto dominance)."""
-        better_in_any = False
-        
-        for objective in self.objectives:
-            if objective.name in scores1 and objective.name in scores2:
-                s1, s2 = scores1[objective.name], scores2[objective.name]
-                
-                if objective.minimize:
-                    if s1 > s2:  # Worse in minimization
-                        return False
-                    elif s1 < s2:  # Better in minimization
-                        better_in_any = True
-                else:
-                    if s1 < s2:  # Worse in maximization
-                        return False
-                    elif s1 > s2:  # Better in maximization
-                        better_in_any = True
-        
-        return better_in_any
+        # Limit Pareto front size to avoid memory issues
+        if len(self.pareto_front) > self.PARETO_FRONT_LIMIT:
+            # Keep solutions with highest fitness
+            order = np.argsort(-self._front_fitness, kind='stable')[:self.PARETO_FRONT_LIMIT]
+            self.pareto_front = [self.pareto_front[i] for i in order]
+            self._front_objectives = self._front_objectives[order]
+            self._front_fitness = self._front_fitness[order]
     
     def _adapt_csa_parameters(self, iteration: int):
         """Adapt CSA parameters during optimization."""
@@ -556,40 +787,20 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
     
     def _calculate_population_diversity(self) -> float:
         """Calculate population diversity metric."""
-        if len(self.population) < 2:
+        n_crows = len(self.population)
+        if n_crows < 2:
             return 0.0
         
-        # Calculate average pairwise distance
-        total_distance = 0.0
-        pairs = 0
-        
-        for i in range(len(self.population)):
-            for j in range(i + 1, len(self.population)):
-                distance = np.linalg.norm(self.population[i] - self.population[j])
-                total_distance += distance
-                pairs += 1
-        
-        return total_distance / pairs if pairs > 0 else 0.0
-    
-    def _position_to_params(self, position: np.ndarray) -> Dict[str, Any]:
-        """Convert position vector to parameter dictionary (enhanced version)."""
-        params = {}
-        param_names = list(self.parameter_bounds.keys())
-        
-        for i, param_name in enumerate(param_names):
-            if i < len(position):
-                value = position[i]
-                
-                # Handle integer parameters
-                if param_name in ['xgb_n_estimators', 'xgb_max_depth', 'sgm_n_components', 'sgm_window_size']:
-                    params[param_name] = int(round(value))
-                # Handle encoded categorical parameters
-                elif param_name == 'sgm_covariance_type_encoded':
-                    params[param_name] = int(round(value))
-                else:
-                    params[param_name] = float(value)
+        # Average pairwise Euclidean distance, exact for small populations
+        if n_crows * (n_crows - 1) // 2 <= self.DIVERSITY_SAMPLE_PAIRS:
+            return float(pdist(self.population).mean())
         
-        return params
+        # Otherwise estimated from a random sample of distinct pairs
+        first = self._diversity_rng.integers(0, n_crows, self.DIVERSITY_SAMPLE_PAIRS)
+        second = self._diversity_rng.integers(0, n_crows, self.DIVERSITY_SAMPLE_PAIRS)
+        distinct = first != second
+        differences = self.population[first[distinct]] - self.population[second[distinct]]
+        return float(np.linalg.norm(differences, axis=1).mean())
     
     def get_optimization_summary(self) -> Dict[str, Any]:
         """Get comprehensive optimization summary."""
@@ -597,6 +808,7 @@ class EnhancedCSAOptimizer(CrowSearchOptimizer):
         
         # Add multi-objective specific information
         summary.update({
+            'convergence_history': self.iteration_records,
             'objectives': [
                 {
                     'name': obj.name,
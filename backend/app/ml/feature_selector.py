@@ -3,20 +3,35 @@ XGBoost-based Feature Selection for Network Intrusion Detection.
 """
 
 import numpy as np
-import pandas as pd
 from typing import Dict, Any, List, Optional, Tuple
 import xgboost as xgb
+import joblib
 from sklearn.base import BaseEstimator, TransformerMixin
-from sklearn.model_selection import cross_val_score
-from sklearn.metrics import accuracy_score
+from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
 import logging
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.ml.xgboost_params import tree_method_params
 
 logger = get_logger(__name__)
 
 
+def _ensure_f32(X: np.ndarray) -> np.ndarray:
+    """
+    Get X as a C-contiguous float32 array, copying only when needed.
+    
+    XGBoost stores features in single precision, so nothing is lost.
+    
+    Args:
+        X: Input features
+        
+    Returns:
+        Float32 features
+    """
+    return np.ascontiguousarray(X, dtype=np.float32)
+
+
 class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
     """
     XGBoost-based feature selection using intrinsic feature importance.
@@ -30,7 +45,10 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
         self,
         n_features: int = None,
         importance_type: str = 'gain',
-        xgb_params: Optional[Dict[str, Any]] = None
+        xgb_params: Optional[Dict[str, Any]] = None,
+        screening_fraction: Optional[float] = None,
+        early_stopping_rounds: Optional[int] = None,
+        keep_model: bool = False
     ):
         """
         Initialize XGBoost Feature Selector.
@@ -39,24 +57,42 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
             n_features: Number of top features to select
             importance_type: Type of importance ('gain', 'weight', 'cover')
             xgb_params: XGBoost parameters for feature importance calculation
+            screening_fraction: Fraction of the samples (stratified) the
+                importance booster is trained on; None uses all samples
+            early_stopping_rounds: Stop adding trees once the validation
+                loss has not improved for this many rounds; None trains
+                all n_estimators trees
+            keep_model: Whether to keep the trained booster as xgb_model_
+                after fitting; only the importances are needed to select
+                and transform
         """
         self.n_features = n_features or settings.MAX_FEATURES
         self.importance_type = importance_type
+        self.screening_fraction = screening_fraction
+        self.early_stopping_rounds = early_stopping_rounds
+        self.keep_model = keep_model
         self.xgb_params = xgb_params or {
             'n_estimators': 100,
             'max_depth': 6,
             'learning_rate': 0.1,
             'random_state': 42,
-            'eval_metric': 'logloss'
+            'n_jobs': -1,
+            **tree_method_params()
         }
         
         # Internal state
         self.feature_importances_ = None
         self.selected_features_ = None
-        self.feature_names_ = None
+        self._selected_mask_ = None
+        self.n_features_in_ = None
+        self._feature_names = None
         self.xgb_model_ = None
         self.is_fitted_ = False
         
+        # Rankings and importance dicts derived from the fitted importances
+        self._ranking_cache = None
+        self._importance_cache = {}
+        
         logger.info(f"XGBoost Feature Selector initialized: n_features={self.n_features}, "
                    f"importance_type={self.importance_type}")
     
@@ -75,37 +111,39 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
         logger.info(f"Fitting feature selector on {X.shape[0]} samples with {X.shape[1]} features")
         
         try:
-            # Store feature names
-            if feature_names is not None:
-                self.feature_names_ = feature_names
-            else:
-                self.feature_names_ = [f'feature_{i}' for i in range(X.shape[1])]
+            # Derived rankings belong to the previous fit
+            self._ranking_cache = None
+            self._importance_cache = {}
+            
+            # Store feature names; default names are generated on demand
+            self.n_features_in_ = X.shape[1]
+            self._feature_names = list(feature_names) if feature_names is not None else None
+            
+            if self.importance_type not in ('gain', 'weight', 'cover'):
+                raise ValueError(f"Invalid importance_type: {self.importance_type}")
             
             # Train XGBoost model for feature importance
-            self.xgb_model_ = xgb.XGBClassifier(**self.xgb_params)
-            self.xgb_model_.fit(X, y)
-            
-            # Get feature importance
-            if self.importance_type == 'gain':
-                importance_dict = self.xgb_model_.get_booster().get_score(importance_type='gain')
-            elif self.importance_type == 'weight':
-                importance_dict = self.xgb_model_.get_booster().get_score(importance_type='weight')
-            elif self.importance_type == 'cover':
-                importance_dict = self.xgb_model_.get_booster().get_score(importance_type='cover')
+            X_fit, y_fit = self._screening_sample(_ensure_f32(X), y)
+            X_fit, y_fit, eval_set = self._early_stopping_split(X_fit, y_fit)
+            if eval_set:
+                self.xgb_model_ = xgb.XGBClassifier(
+                    importance_type=self.importance_type,
+                    early_stopping_rounds=self.early_stopping_rounds,
+                    **self.xgb_params
+                )
+                self.xgb_model_.fit(X_fit, y_fit, eval_set=eval_set, verbose=False)
+                logger.info(f"Importance booster stopped after {self.xgb_model_.best_iteration + 1} rounds")
             else:
-                raise ValueError(f"Invalid importance_type: {self.importance_type}")
+                self.xgb_model_ = xgb.XGBClassifier(importance_type=self.importance_type, **self.xgb_params)
+                self.xgb_model_.fit(X_fit, y_fit)
+            
+            # Importances come back as one array aligned with the input
+            # columns (normalized to sum to 1, zero for unused features)
+            self.feature_importances_ = np.asarray(self.xgb_model_.feature_importances_, dtype=np.float32)
             
-            # Convert to array format
-            self.feature_importances_ = np.zeros(len(self.feature_names_))
-            for feature_name, importance in importance_dict.items():
-                # XGBoost uses f0, f1, f2, ... naming
-                if feature_name.startswith('f'):
-                    try:
-                        idx = int(feature_name[1:])
-                        if idx < len(self.feature_importances_):
-                            self.feature_importances_[idx] = importance
-                    except (ValueError, IndexError):
-                        continue
+            # The booster is only needed for its importances
+            if not self.keep_model:
+                self.xgb_model_ = None
             
             # Select top features
             self._select_top_features()
@@ -113,7 +151,7 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
             self.is_fitted_ = True
             
             logger.info(f"Feature selection completed. Selected {len(self.selected_features_)} features")
-            logger.info(f"Top 5 features: {[self.feature_names_[i] for i in self.selected_features_[:5]]}")
+            logger.info(f"Top 5 features: {[self._feature_name(i) for i in self.selected_features_[:5]]}")
             
             return self
             
@@ -121,12 +159,103 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
             logger.error(f"Feature selection fitting failed: {str(e)}")
             raise RuntimeError(f"Failed to fit feature selector: {str(e)}")
     
-    def transform(self, X: np.ndarray) -> np.ndarray:
+    def _screening_sample(self, X: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Draw the stratified sample the importance booster is trained on.
+        
+        Feature rankings from a fraction of the samples closely match those
+        from all of them, at a fraction of the boosting cost.
+        
+        Args:
+            X: Training features
+            y: Training labels
+            
+        Returns:
+            Sampled features and labels (all samples without screening)
+        """
+        if not self.screening_fraction or self.screening_fraction >= 1.0:
+            return X, y
+        
+        try:
+            X_sample, _, y_sample, _ = train_test_split(
+                X, y, train_size=self.screening_fraction, stratify=y, random_state=42
+            )
+        except ValueError as e:
+            # Too few samples per class for a stratified sample
+            logger.warning(f"Screening sample unavailable, using all samples: {str(e)}")
+            return X, y
+        
+        logger.info(f"Training importance booster on {len(y_sample)} of {len(y)} samples")
+        return X_sample, y_sample
+    
+    def _early_stopping_split(
+        self,
+        X: np.ndarray,
+        y: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[List[Tuple[np.ndarray, np.ndarray]]]]:
+        """
+        Hold out a stratified validation set for early stopping.
+        
+        Args:
+            X: Training features
+            y: Training labels
+            
+        Returns:
+            Training features and labels, and the eval_set (None without
+            early stopping)
+        """
+        if not self.early_stopping_rounds:
+            return X, y, None
+        
+        try:
+            X_train, X_val, y_train, y_val = train_test_split(
+                X, y, test_size=0.2, stratify=y, random_state=42
+            )
+        except ValueError as e:
+            logger.warning(f"Early stopping unavailable, training all trees: {str(e)}")
+            return X, y, None
+        
+        return X_train, y_train, [(X_val, y_val)]
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        """Restore a pickled selector, upgrading state saved by older versions."""
+        if 'feature_names_' in state:
+            feature_names = state.pop('feature_names_')
+            state.setdefault('n_features_in_', len(feature_names) if feature_names is not None else None)
+            state.setdefault('_feature_names', feature_names)
+        state.setdefault('_ranking_cache', None)
+        state.setdefault('_importance_cache', {})
+        if state.get('_selected_mask_') is None and state.get('selected_features_') is not None:
+            mask = np.zeros(state['n_features_in_'], dtype=bool)
+            mask[state['selected_features_']] = True
+            state['_selected_mask_'] = mask
+        super().__setstate__(state)
+    
+    @property
+    def feature_names_(self) -> Optional[List[str]]:
+        """Names of the input features seen in fit (None before fitting)."""
+        if self.n_features_in_ is None:
+            return None
+        return [self._feature_name(i) for i in range(self.n_features_in_)]
+    
+    def _feature_name(self, index: int) -> str:
+        """Get the name of the input feature at index."""
+        if self._feature_names is not None:
+            return self._feature_names[index]
+        return f'feature_{index}'
+    
+    def transform(self, X: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Transform data by selecting only the important features.
         
+        The selected columns are returned as float32. Callers transforming
+        batches of a fixed size can pass the same out buffer every time to
+        avoid allocating a result per call.
+        
         Args:
             X: Input features
+            out: Optional float32 buffer of shape (n_samples, n_selected)
+                receiving the result
             
         Returns:
             Transformed data with selected features only
@@ -135,8 +264,19 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
             raise ValueError("Feature selector is not fitted. Call 'fit' first.")
         
         try:
-            # Select features
-            X_selected = X[:, self.selected_features_]
+            X = np.asarray(X)
+            if X.shape[1] != self.n_features_in_:
+                raise ValueError(f"X has {X.shape[1]} features, but the selector was fitted with {self.n_features_in_}")
+            
+            # Select features; same-dtype input is gathered straight into
+            # the caller's buffer, other input is converted on the way
+            if out is None:
+                X_selected = X[:, self.selected_features_].astype(np.float32, copy=False)
+            elif X.dtype == out.dtype:
+                X_selected = np.take(X, self.selected_features_, axis=1, out=out)
+            else:
+                X_selected = out
+                X_selected[...] = X[:, self.selected_features_]
             
             logger.debug(f"Transformed data from {X.shape[1]} to {X_selected.shape[1]} features")
             
@@ -150,6 +290,9 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
         """
         Fit the selector and transform the data in one step.
         
+        The selected columns are gathered right after fitting, in ranking
+        order, without going through transform's fitted-state checks.
+        
         Args:
             X: Training features
             y: Training labels
@@ -158,23 +301,45 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
         Returns:
             Transformed data with selected features
         """
-        return self.fit(X, y, feature_names).transform(X)
+        X = _ensure_f32(X)
+        self.fit(X, y, feature_names)
+        return X[:, self.selected_features_]
     
     def _select_top_features(self):
         """Select the top N features based on importance scores."""
-        # Get indices of features sorted by importance (descending)
-        feature_indices = np.argsort(self.feature_importances_)[::-1]
+        self.selected_features_ = self._top_feature_indices(self.n_features)
         
-        # Select top N features
-        n_select = min(self.n_features, len(feature_indices))
-        self.selected_features_ = feature_indices[:n_select]
+        # Boolean membership mask over all input features
+        self._selected_mask_ = np.zeros(len(self.feature_importances_), dtype=bool)
+        self._selected_mask_[self.selected_features_] = True
         
         # Log feature selection results
         logger.debug(f"Selected features: {self.selected_features_}")
-        if self.feature_names_:
-            selected_names = [self.feature_names_[i] for i in self.selected_features_]
+        if logger.isEnabledFor(logging.DEBUG):
+            selected_names = [self._feature_name(i) for i in self.selected_features_]
             logger.debug(f"Selected feature names: {selected_names}")
     
+    def _top_feature_indices(self, n: int) -> np.ndarray:
+        """
+        Get the indices of the n most important features.
+        
+        Only the top n are partitioned out and sorted, rather than sorting
+        every feature.
+        
+        Args:
+            n: Number of features to return
+            
+        Returns:
+            Feature indices sorted by importance (descending)
+        """
+        importances = self.feature_importances_
+        k = max(0, min(n, len(importances)))
+        if k == 0:
+            return np.empty(0, dtype=np.intp)
+        
+        top = np.argpartition(-importances, k - 1)[:k] if k < len(importances) else np.arange(k)
+        return top[np.argsort(-importances[top], kind='stable')]
+    
     def get_feature_importance(self, normalize: bool = True) -> Dict[str, float]:
         """
         Get feature importance scores.
@@ -188,24 +353,27 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
         if not self.is_fitted_:
             raise ValueError("Feature selector is not fitted. Call 'fit' first.")
         
-        importance_dict = {}
-        
-        # Get importance for selected features only
-        for i, feature_idx in enumerate(self.selected_features_):
-            feature_name = self.feature_names_[feature_idx]
-            importance = self.feature_importances_[feature_idx]
-            importance_dict[feature_name] = importance
-        
-        # Normalize if requested
-        if normalize and importance_dict:
-            total_importance = sum(importance_dict.values())
-            if total_importance > 0:
-                importance_dict = {
-                    name: importance / total_importance
-                    for name, importance in importance_dict.items()
-                }
+        if normalize not in self._importance_cache:
+            importance_dict = {}
+            
+            # Get importance for selected features only
+            for i, feature_idx in enumerate(self.selected_features_):
+                feature_name = self._feature_name(feature_idx)
+                importance = self.feature_importances_[feature_idx]
+                importance_dict[feature_name] = importance
+            
+            # Normalize if requested
+            if normalize and importance_dict:
+                total_importance = sum(importance_dict.values())
+                if total_importance > 0:
+                    importance_dict = {
+                        name: importance / total_importance
+                        for name, importance in importance_dict.items()
+                    }
+            
+            self._importance_cache[normalize] = importance_dict
         
-        return importance_dict
+        return dict(self._importance_cache[normalize])
     
     def get_selected_features(self) -> List[str]:
         """
@@ -217,28 +385,46 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
         if not self.is_fitted_:
             return []
         
-        return [self.feature_names_[i] for i in self.selected_features_]
+        return [self._feature_name(i) for i in self.selected_features_]
+    
+    def get_support(self, indices: bool = False) -> np.ndarray:
+        """
+        Get which input features are selected.
+        
+        Args:
+            indices: Return selected feature indices instead of a mask
+            
+        Returns:
+            Boolean mask over the input features, or their sorted indices
+        """
+        if not self.is_fitted_:
+            raise ValueError("Feature selector is not fitted. Call 'fit' first.")
+        
+        return np.flatnonzero(self._selected_mask_) if indices else self._selected_mask_.copy()
     
-    def get_feature_ranking(self) -> List[Tuple[str, float]]:
+    def get_feature_ranking(self, top_n: Optional[int] = None) -> List[Tuple[str, float]]:
         """
-        Get all features ranked by importance.
+        Get features ranked by importance.
         
+        Args:
+            top_n: Optional number of top features to return (all by default)
+            
         Returns:
             List of (feature_name, importance) tuples sorted by importance
         """
         if not self.is_fitted_:
             return []
         
-        # Create list of (name, importance) tuples
-        feature_ranking = [
-            (self.feature_names_[i], self.feature_importances_[i])
-            for i in range(len(self.feature_names_))
-        ]
+        # The cache holds the longest ranking prefix requested so far, so a
+        # top-N request never ranks more features than it needs
+        n = self.n_features_in_ if top_n is None else min(top_n, self.n_features_in_)
+        if self._ranking_cache is None or len(self._ranking_cache) < n:
+            self._ranking_cache = [
+                (self._feature_name(i), self.feature_importances_[i])
+                for i in self._top_feature_indices(n)
+            ]
         
-        # Sort by importance (descending)
-        feature_ranking.sort(key=lambda x: x[1], reverse=True)
-        
-        return feature_ranking
+        return self._ranking_cache[:n]
     
     def evaluate_feature_selection(
         self,
@@ -263,12 +449,16 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
             raise ValueError("Feature selector is not fitted. Call 'fit' first.")
         
         try:
+            # Both evaluations use the same shuffled folds, so their scores
+            # are paired per fold; folds are scored in parallel
+            cv = StratifiedKFold(n_splits=cv_folds, shuffle=True, random_state=42)
+            
             # Evaluate with original features
-            scores_original = cross_val_score(classifier, X, y, cv=cv_folds)
+            scores_original = cross_val_score(classifier, X, y, cv=cv, n_jobs=-1)
             
             # Evaluate with selected features
             X_selected = self.transform(X)
-            scores_selected = cross_val_score(classifier, X_selected, y, cv=cv_folds)
+            scores_selected = cross_val_score(classifier, X_selected, y, cv=cv, n_jobs=-1)
             
             results = {
                 'original_features': X.shape[1],
@@ -314,7 +504,7 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
             raise ValueError("Feature selector is not fitted. Call 'fit' first.")
         
         # Get top N features by importance
-        feature_ranking = self.get_feature_ranking()[:top_n]
+        feature_ranking = self.get_feature_ranking(top_n)
         
         features = [name for name, _ in feature_ranking]
         importances = [importance for _, importance in feature_ranking]
@@ -341,7 +531,7 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
             return {'status': 'not_fitted'}
         
         # Calculate statistics
-        total_features = len(self.feature_names_)
+        total_features = self.n_features_in_
         selected_count = len(self.selected_features_)
         reduction_ratio = (total_features - selected_count) / total_features
         
@@ -364,3 +554,34 @@ class XGBoostFeatureSelector(BaseEstimator, TransformerMixin):
         }
         
         return summary
+    
+    def save(self, path: str):
+        """
+        Save the fitted selector for memory-mapped loading.
+        
+        Args:
+            path: Destination file path
+        """
+        joblib.dump(self, path, compress=0)
+        logger.info(f"Feature selector saved to {path}")
+    
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = 'r') -> 'XGBoostFeatureSelector':
+        """
+        Load a selector written by save().
+        
+        Importances and selected indices are mapped from the file rather
+        than copied when mmap_mode is set.
+        
+        Args:
+            path: Saved selector file path
+            mmap_mode: Memory-map mode for the stored arrays (None copies them)
+            
+        Returns:
+            Loaded selector
+        """
+        selector = joblib.load(path, mmap_mode=mmap_mode)
+        if not isinstance(selector, cls):
+            raise ValueError(f"{path} does not contain a {cls.__name__}")
+        return selector
+
@@ -2,20 +2,56 @@
 Hybrid SVM + XGBoost Classifier for Network Intrusion Detection.
 """
 
+import os
 import numpy as np
 from typing import Dict, Any, Optional, Tuple
-from sklearn.svm import SVC
+from sklearn.svm import SVC, LinearSVC
+from sklearn.calibration import CalibratedClassifierCV
 from sklearn.ensemble import VotingClassifier
+from sklearn.kernel_approximation import Nystroem
+from sklearn.model_selection import StratifiedShuffleSplit
+from sklearn.pipeline import Pipeline
 from sklearn.metrics import accuracy_score, classification_report
 import xgboost as xgb
+import joblib
+from joblib import parallel_backend
 import logging
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.ml.xgboost_params import tree_method_params
 
 logger = get_logger(__name__)
 
 
+def _thread_budget() -> int:
+    """
+    Get the number of threads this process may use.
+    
+    Inside joblib/loky workers OMP_NUM_THREADS holds the worker's share of
+    the cores; elsewhere every core is available.
+    
+    Returns:
+        Thread budget
+    """
+    return int(os.environ.get('OMP_NUM_THREADS') or os.cpu_count() or 1)
+
+
+def _soft_vote(svm_proba: np.ndarray, xgb_proba: np.ndarray) -> np.ndarray:
+    """
+    Soft-vote class indices from the two members' probabilities.
+    
+    Args:
+        svm_proba: SVM class probabilities (n_samples, n_classes)
+        xgb_proba: XGBoost class probabilities (n_samples, n_classes)
+        
+    Returns:
+        Index of the class with the highest summed probability per sample
+        (the first one on ties)
+    """
+    return np.argmax(svm_proba + xgb_proba, axis=1)
+
+
 class HybridNIDSClassifier:
     """
     Hybrid classifier combining SVM and XGBoost for improved intrusion detection.
@@ -34,7 +70,17 @@ class HybridNIDSClassifier:
         self.is_fitted = False
         self.classes_ = None
         
-        logger.info("Hybrid NIDS Classifier initialized")
+        # Debug level: CSA builds a fresh instance for every CV fold of every candidate
+        logger.debug("Hybrid NIDS Classifier initialized")
+    
+    def __setstate__(self, state: Dict[str, Any]):
+        """Restore a pickled classifier, pointing members at the fitted ensemble clones."""
+        # Classifiers saved by older versions kept the unfitted member templates
+        ensemble = state.get('ensemble_classifier')
+        if state.get('is_fitted') and ensemble is not None:
+            state['svm_classifier'] = ensemble.named_estimators_['svm']
+            state['xgboost_classifier'] = ensemble.named_estimators_['xgboost']
+        self.__dict__.update(state)
     
     def fit(
         self, 
@@ -61,8 +107,7 @@ class HybridNIDSClassifier:
                 'kernel': settings.SVM_KERNEL,
                 'C': 1.0,
                 'gamma': 'scale',
-                'random_state': 42,
-                'probability': True  # Enable probability estimates
+                'random_state': 42
             }
             
             xgb_params = {
@@ -70,7 +115,8 @@ class HybridNIDSClassifier:
                 'max_depth': settings.XGBOOST_MAX_DEPTH,
                 'learning_rate': settings.XGBOOST_LEARNING_RATE,
                 'random_state': 42,
-                'eval_metric': 'logloss'
+                'eval_metric': 'logloss',
+                **tree_method_params()
             }
             
             # Update with optimized parameters if available
@@ -88,8 +134,15 @@ class HybridNIDSClassifier:
                 
                 logger.info(f"Using optimized parameters: {best_params}")
             
+            # SVM and XGBoost are trained side by side in threads (both
+            # release the GIL while fitting); XGBoost gets half the thread
+            # budget so the SVM keeps a core of its own
+            threads = _thread_budget()
+            n_parallel = 2 if threads > 1 else 1
+            xgb_params['n_jobs'] = max(1, threads // n_parallel)
+            
             # Initialize individual classifiers
-            self.svm_classifier = SVC(**svm_params)
+            self.svm_classifier = self._build_svm(svm_params, X, y)
             self.xgboost_classifier = xgb.XGBClassifier(**xgb_params)
             
             # Create ensemble classifier with soft voting
@@ -98,13 +151,18 @@ class HybridNIDSClassifier:
                     ('svm', self.svm_classifier),
                     ('xgboost', self.xgboost_classifier)
                 ],
-                voting='soft'  # Use predicted probabilities
+                voting='soft',  # Use predicted probabilities
+                n_jobs=n_parallel
             )
             
             # Train the ensemble
-            self.ensemble_classifier.fit(X, y)
+            with parallel_backend('threading', n_jobs=n_parallel):
+                self.ensemble_classifier.fit(X, y)
             
-            # Store classes for later use
+            # Keep the fitted members (the ensemble trains clones of them)
+            # and the classes for later use
+            self.svm_classifier = self.ensemble_classifier.named_estimators_['svm']
+            self.xgboost_classifier = self.ensemble_classifier.named_estimators_['xgboost']
             self.classes_ = self.ensemble_classifier.classes_
             self.is_fitted = True
             
@@ -118,10 +176,88 @@ class HybridNIDSClassifier:
             logger.error(f"Training failed: {str(e)}")
             raise RuntimeError(f"Failed to train hybrid classifier: {str(e)}")
     
+    def _build_svm(self, svm_params: Dict[str, Any], X: np.ndarray, y: np.ndarray):
+        """
+        Build the SVM member of the ensemble for the given training set.
+        
+        Kernel SVC training grows quadratically or worse with the number of
+        samples, so from SVM_APPROXIMATION_MIN_SAMPLES on, the RBF kernel is
+        approximated with a Nystroem feature map and a LinearSVC is trained
+        on it. Linear kernels use LinearSVC directly.
+        
+        Soft voting needs probabilities, which come from a sigmoid fitted on
+        a stratified SVM_CALIBRATION_FRACTION holdout. The SVM is trained
+        once on the rest, instead of the five extra internal CV fits of
+        SVC(probability=True). A class with a single training sample cannot
+        be split into a stratified holdout, so such training sets (e.g. rare
+        attacks in CSA's subsample) fall back to SVC(probability=True).
+        With SVM_NYSTROEM_CACHE_PATH
+        set, fitted feature maps are reused by refits on the same data and
+        gamma that only change C.
+        
+        Args:
+            svm_params: SVC parameters
+            X: Training features
+            y: Training labels
+            
+        Returns:
+            Unfitted SVM estimator supporting predict_proba
+        """
+        _, class_counts = np.unique(y, return_counts=True)
+        if class_counts.min() < 2:
+            logger.info("Calibrating SVM with internal CV: a class has a single training sample")
+            return SVC(probability=True, **svm_params)
+        
+        calibration_split = StratifiedShuffleSplit(
+            n_splits=1,
+            test_size=settings.SVM_CALIBRATION_FRACTION,
+            random_state=svm_params['random_state']
+        )
+        
+        kernel = svm_params['kernel']
+        if X.shape[0] < settings.SVM_APPROXIMATION_MIN_SAMPLES or kernel not in ('rbf', 'linear'):
+            return CalibratedClassifierCV(SVC(**svm_params), cv=calibration_split)
+        
+        linear_svm = LinearSVC(C=svm_params['C'], dual='auto', random_state=svm_params['random_state'])
+        if kernel == 'rbf':
+            gamma = svm_params['gamma']
+            if gamma == 'scale':
+                # Same value SVC derives for gamma='scale'
+                X_var = np.asarray(X).var()
+                gamma = 1.0 / (X.shape[1] * X_var) if X_var > 0 else 1.0
+            linear_svm = Pipeline([
+                ('rbf', Nystroem(
+                    gamma=gamma,
+                    n_components=min(settings.SVM_NYSTROEM_COMPONENTS, X.shape[0]),
+                    random_state=svm_params['random_state']
+                )),
+                ('svm', linear_svm)
+            ], memory=settings.SVM_NYSTROEM_CACHE_PATH)
+        
+        logger.info(f"Training approximate {kernel} SVM on {X.shape[0]} samples")
+        return CalibratedClassifierCV(linear_svm, cv=calibration_split)
+    
     def predict(self, X: np.ndarray) -> np.ndarray:
         """
         Make predictions using the hybrid classifier.
         
+        Args:
+            X: Input features
+            
+        Returns:
+            Predicted class labels
+        """
+        predictions = self.predict_fast(X)
+        logger.debug(f"Made predictions for {X.shape[0]} samples")
+        return predictions
+    
+    def predict_fast(self, X: np.ndarray) -> np.ndarray:
+        """
+        Make predictions with a fused soft vote over the member probabilities.
+        
+        Gives the same labels as the ensemble's own soft vote, but sums and
+        takes the argmax of both members' probabilities in one compiled pass.
+        
         Args:
             X: Input features
             
@@ -132,9 +268,7 @@ class HybridNIDSClassifier:
             raise ValueError("Classifier is not fitted. Call 'fit' first.")
         
         try:
-            predictions = self.ensemble_classifier.predict(X)
-            logger.debug(f"Made predictions for {X.shape[0]} samples")
-            return predictions
+            return self.classes_[_soft_vote(*self._member_probabilities(X))]
             
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
@@ -154,7 +288,8 @@ class HybridNIDSClassifier:
             raise ValueError("Classifier is not fitted. Call 'fit' first.")
         
         try:
-            probabilities = self.ensemble_classifier.predict_proba(X)
+            svm_proba, xgb_proba = self._member_probabilities(X)
+            probabilities = (svm_proba + xgb_proba) * 0.5
             logger.debug(f"Generated probabilities for {X.shape[0]} samples")
             return probabilities
             
@@ -162,6 +297,25 @@ class HybridNIDSClassifier:
             logger.error(f"Probability prediction failed: {str(e)}")
             raise RuntimeError(f"Failed to predict probabilities: {str(e)}")
     
+    def _member_probabilities(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the class probabilities of both ensemble members.
+        
+        The fitted members are called directly rather than through the
+        VotingClassifier, which re-validates X and stacks and re-averages
+        the probabilities on every call.
+        
+        Args:
+            X: Input features
+            
+        Returns:
+            SVM and XGBoost probabilities, each (n_samples, n_classes)
+        """
+        return (
+            np.ascontiguousarray(self.svm_classifier.predict_proba(X)),
+            np.ascontiguousarray(self.xgboost_classifier.predict_proba(X))
+        )
+    
     def evaluate(self, X: np.ndarray, y: np.ndarray) -> Dict[str, Any]:
         """
         Evaluate the hybrid classifier performance.
@@ -177,17 +331,18 @@ class HybridNIDSClassifier:
             raise ValueError("Classifier is not fitted. Call 'fit' first.")
         
         try:
-            # Make predictions
-            y_pred = self.predict(X)
-            y_proba = self.predict_proba(X)
+            # Score both members once; ensemble and individual predictions
+            # all derive from these probabilities
+            svm_proba, xgb_proba = self._member_probabilities(X)
+            y_pred = self.classes_[_soft_vote(svm_proba, xgb_proba)]
             
             # Calculate metrics
             accuracy = accuracy_score(y, y_pred)
             report = classification_report(y, y_pred, output_dict=True)
             
             # Individual classifier performance
-            svm_pred = self.svm_classifier.predict(X)
-            xgb_pred = self.xgboost_classifier.predict(X)
+            svm_pred = self.classes_[np.argmax(svm_proba, axis=1)]
+            xgb_pred = self.classes_[np.argmax(xgb_proba, axis=1)]
             
             svm_accuracy = accuracy_score(y, svm_pred)
             xgb_accuracy = accuracy_score(y, xgb_pred)
@@ -293,3 +448,34 @@ class HybridNIDSClassifier:
             info['xgboost_params'] = self.xgboost_classifier.get_params()
         
         return info
+    
+    def save(self, path: str):
+        """
+        Save the fitted classifier for memory-mapped loading.
+        
+        Arrays are written uncompressed, so load() can map the SVM support
+        vectors and coefficients from the file instead of copying them;
+        server workers loading the same file then share those pages.
+        
+        Args:
+            path: Destination file path
+        """
+        joblib.dump(self, path, compress=0)
+        logger.info(f"Hybrid classifier saved to {path}")
+    
+    @classmethod
+    def load(cls, path: str, mmap_mode: Optional[str] = 'r') -> 'HybridNIDSClassifier':
+        """
+        Load a classifier written by save().
+        
+        Args:
+            path: Saved classifier file path
+            mmap_mode: Memory-map mode for the stored arrays (None copies them)
+            
+        Returns:
+            Loaded classifier
+        """
+        classifier = joblib.load(path, mmap_mode=mmap_mode)
+        if not isinstance(classifier, cls):
+            raise ValueError(f"{path} does not contain a {cls.__name__}")
+        return classifier
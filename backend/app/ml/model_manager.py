@@ -2,8 +2,8 @@
 Model Manager for handling ML model lifecycle and predictions.
 """
 
+import asyncio
 import logging
-import pickle
 import os
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
@@ -22,6 +22,67 @@ from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Last loaded model file, keyed by (absolute path, mtime, size) so that
+# repeated loads of an unchanged file within the process skip the unpickle
+_model_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+# NSL-KDD attack labels per category, as arrays for vectorized membership tests
+_DOS_ATTACKS = np.array(['back', 'land', 'neptune', 'pod', 'smurf', 'teardrop'], dtype=object)
+_PROBE_ATTACKS = np.array(['ipsweep', 'nmap', 'portsweep', 'satan'], dtype=object)
+_U2R_ATTACKS = np.array(['buffer_overflow', 'loadmodule', 'perl', 'rootkit'], dtype=object)
+_R2L_ATTACKS = np.array(['ftp_write', 'guess_passwd', 'imap', 'multihop', 'phf', 'spy', 'warezclient', 'warezmaster'], dtype=object)
+
+# Attack categories in category id order; labels outside them get the
+# next id, which is counted but not reported
+_ATTACK_CATEGORIES = ('Normal', 'DoS', 'Probe', 'U2R', 'R2L')
+
+
+def _load_model_file(model_path: str) -> Dict[str, Any]:
+    """
+    Load a saved model file, reusing the cached result while the file is unchanged.
+    
+    NumPy arrays in the file (scaler statistics, SVM support vectors) are
+    memory-mapped read-only instead of copied, so worker processes loading
+    the same file share their pages. Files written with plain pickle load
+    the same way.
+    
+    Args:
+        model_path: Path to the saved model file
+        
+    Returns:
+        Dictionary of saved model components
+    """
+    stat = os.stat(model_path)
+    key = (os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+    
+    model_data = _model_cache.get(key)
+    if model_data is not None:
+        logger.debug(f"Reusing cached model data for {model_path}")
+        return model_data
+    
+    model_data = joblib.load(model_path, mmap_mode='r')
+    
+    # Keep only the most recent model to bound memory
+    _model_cache.clear()
+    _model_cache[key] = model_data
+    return model_data
+
+
+def _has_numeric_columns(data: pd.DataFrame, columns: List[str]) -> bool:
+    """
+    Check that a frame holds all given columns with numeric dtypes.
+    
+    Args:
+        data: Input frame
+        columns: Required column names
+        
+    Returns:
+        True if every column is present and numeric
+    """
+    dtypes = data.dtypes
+    return all(column in dtypes.index and pd.api.types.is_numeric_dtype(dtypes[column]) for column in columns)
+
 
 class ModelManager:
     """
@@ -42,6 +103,19 @@ class ModelManager:
         self.current_model_name = None  # Track which model file is currently loaded
         self.current_model_path = None  # Track the full path of the loaded model
         
+        # Prediction micro-batching queue and its consumer task, bound to
+        # the event loop of the first prediction
+        self._predict_queue: Optional[asyncio.Queue] = None
+        self._batcher_task: Optional[asyncio.Task] = None
+        
+        # Precomputed single-row preprocessing, rebuilt after training and loading
+        self._single_row_path: Optional[Tuple[List[str], np.ndarray, np.ndarray]] = None
+        
+        # Encoded class -> original label and -> attack category id,
+        # rebuilt after training and loading
+        self._class_to_label: Optional[np.ndarray] = None
+        self._class_to_category: Optional[np.ndarray] = None
+        
         # Create model directory
         os.makedirs(settings.MODEL_PATH, exist_ok=True)
         
@@ -50,7 +124,6 @@ class ModelManager:
         if os.path.exists(default_model_path):
             try:
                 # Use synchronous loading since this is in __init__
-                import asyncio
                 # Check if there's already an event loop running
                 try:
                     loop = asyncio.get_event_loop()
@@ -96,27 +169,37 @@ class ModelManager:
         """
         logger.info("Starting model training")
         
+        # The saved model file is about to be replaced, so drop the cached
+        # copy of the previous one
+        _model_cache.clear()
+        
         try:
-            # Prepare data
-            X, y = self._prepare_data(data, target_column)
+            # The CPU-heavy steps run in worker threads so the event loop keeps
+            # serving other requests. New components are built locally and
+            # swapped in together, so concurrent predictions keep using the
+            # previous model until training completes
+            X, y, feature_names, label_encoder = await asyncio.to_thread(
+                self._prepare_data, data, target_column
+            )
             X_train, X_test, y_train, y_test = train_test_split(
                 X, y, test_size=0.3, random_state=42, stratify=y
             )
             
             # Feature selection
             logger.info("Performing feature selection")
-            self.feature_selector = XGBoostFeatureSelector(
+            feature_selector = XGBoostFeatureSelector(
                 n_features=settings.MAX_FEATURES
             )
-            X_train_selected = self.feature_selector.fit_transform(X_train, y_train)
-            X_test_selected = self.feature_selector.transform(X_test)
+            X_train_selected = await asyncio.to_thread(feature_selector.fit_transform, X_train, y_train)
+            X_test_selected = feature_selector.transform(X_test)
             
             # Scale features
-            X_train_scaled = self.scaler.fit_transform(X_train_selected)
-            X_test_scaled = self.scaler.transform(X_test_selected)
+            scaler = StandardScaler()
+            X_train_scaled = scaler.fit_transform(X_train_selected)
+            X_test_scaled = scaler.transform(X_test_selected)
             
             # Initialize hybrid classifier
-            self.hybrid_classifier = HybridNIDSClassifier()
+            hybrid_classifier = HybridNIDSClassifier()
             
             # Hyperparameter optimization
             best_params = None
@@ -127,8 +210,8 @@ class ModelManager:
                         population_size=min(10, settings.CSA_POPULATION_SIZE),  # Reduce for faster testing
                         max_iterations=min(10, settings.CSA_MAX_ITERATIONS)      # Reduce for faster testing
                     )
-                    best_params = self.csa_optimizer.optimize(
-                        X_train_scaled, y_train, self.hybrid_classifier
+                    best_params = await asyncio.to_thread(
+                        self.csa_optimizer.optimize, X_train_scaled, y_train, hybrid_classifier
                     )
                     logger.info(f"Best parameters found: {best_params}")
                 except Exception as e:
@@ -137,12 +220,12 @@ class ModelManager:
                     best_params = None
             
             # Train model
-            self.hybrid_classifier.fit(
-                X_train_scaled, y_train, best_params=best_params
+            await asyncio.to_thread(
+                hybrid_classifier.fit, X_train_scaled, y_train, best_params=best_params
             )
             
             # Evaluate model
-            y_pred = self.hybrid_classifier.predict(X_test_scaled)
+            y_pred = await asyncio.to_thread(hybrid_classifier.predict, X_test_scaled)
             
             # Calculate metrics
             metrics = {
@@ -150,14 +233,21 @@ class ModelManager:
                 'precision': precision_score(y_test, y_pred, average='weighted'),
                 'recall': recall_score(y_test, y_pred, average='weighted'),
                 'f1_score': f1_score(y_test, y_pred, average='weighted'),
-                'selected_features': self.feature_selector.get_selected_features(),
-                'feature_importance': self.feature_selector.get_feature_importance(),
+                'selected_features': feature_selector.get_selected_features(),
+                'feature_importance': feature_selector.get_feature_importance(),
                 'best_hyperparameters': best_params or {}
             }
             
+            self.hybrid_classifier = hybrid_classifier
+            self.feature_selector = feature_selector
+            self.scaler = scaler
+            self.label_encoder = label_encoder
+            self.feature_names = feature_names
             self.is_trained = True
             self.dataset_name = dataset_name  # Store dataset name
             self.last_training = datetime.now()  # Store training timestamp
+            self._single_row_path = self._compile_single_row_path()
+            self._class_to_label, self._class_to_category = self._compile_class_lookup()
             logger.info(f"Model training completed. Accuracy: {metrics['accuracy']:.4f}")
             
             # Save model
@@ -196,31 +286,131 @@ class ModelManager:
         if not self.is_trained:
             raise ValueError("Model is not trained. Please train the model first.")
         
+        # Retraining may swap in a new model while this request waits for
+        # its batch, so it is served entirely by the model current now
+        feature_selector, scaler, hybrid_classifier = self.feature_selector, self.scaler, self.hybrid_classifier
+        class_to_label, class_to_category = self._class_to_label, self._class_to_category
+        
         try:
-            # Prepare data
-            X = self._prepare_prediction_data(data)
+            X_scaled = self._prepare_single_row(data) if len(data) == 1 else None
+            if X_scaled is None:
+                # Prepare data
+                X = self._prepare_prediction_data(data)
+                
+                # Apply feature selection and scaling
+                X_selected = feature_selector.transform(X)
+                X_scaled = scaler.transform(X_selected)
             
-            # Apply feature selection and scaling
-            X_selected = self.feature_selector.transform(X)
-            X_scaled = self.scaler.transform(X_selected)
-            
-            # Make predictions
-            predictions = self.hybrid_classifier.predict(X_scaled)
-            probabilities = self.hybrid_classifier.predict_proba(X_scaled)
-            
-            # Convert predictions back to original labels
-            predicted_labels = self.label_encoder.inverse_transform(predictions)
+            # Make predictions together with concurrent requests
+            future = asyncio.get_running_loop().create_future()
+            await self._prediction_queue().put((X_scaled, hybrid_classifier, future))
+            predictions, probabilities = await future
             
             return {
-                'predictions': predicted_labels.tolist(),
+                'predictions': class_to_label[predictions].tolist(),
                 'probabilities': probabilities.tolist(),
-                'attack_types': self._categorize_attacks(predicted_labels)
+                'attack_types': self._categorize_attacks(predictions, class_to_category)
             }
             
         except Exception as e:
             logger.error(f"Prediction failed: {str(e)}")
             raise ValueError(f"Prediction failed: {str(e)}")
     
+    def _prediction_queue(self) -> asyncio.Queue:
+        """
+        Get the micro-batching queue, starting its consumer on first use.
+        
+        Returns:
+            Queue of (scaled features, classifier, result future) items
+        """
+        loop = asyncio.get_running_loop()
+        if self._batcher_task is None or self._batcher_task.done() or self._batcher_task.get_loop() is not loop:
+            self._predict_queue = asyncio.Queue()
+            self._batcher_task = loop.create_task(self._run_prediction_batches(self._predict_queue))
+        return self._predict_queue
+    
+    async def _run_prediction_batches(self, queue: asyncio.Queue):
+        """
+        Serve queued predictions in batches.
+        
+        Requests arriving within PREDICT_MAX_LATENCY_MS of the first one
+        (up to PREDICT_MAX_BATCH_ROWS rows) are stacked and classified in a
+        single call per classifier, amortizing the classifier's fixed
+        per-call cost. The classification runs in a worker thread, so the
+        next batch can fill meanwhile.
+        
+        Args:
+            queue: Queue of (scaled features, classifier, result future) items
+        """
+        loop = asyncio.get_running_loop()
+        max_latency = settings.PREDICT_MAX_LATENCY_MS / 1000.0
+        
+        while True:
+            batch = [await queue.get()]
+            n_rows = len(batch[0][0])
+            deadline = loop.time() + max_latency
+            
+            # Gather more requests until the batch is full or the wait is over
+            while n_rows < settings.PREDICT_MAX_BATCH_ROWS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                n_rows += len(item[0])
+            
+            # Requests queued around a retraining may belong to different models
+            groups: Dict[int, List[Tuple[np.ndarray, Any, asyncio.Future]]] = {}
+            for item in batch:
+                groups.setdefault(id(item[1]), []).append(item)
+            for group in groups.values():
+                await self._serve_batch(group)
+    
+    async def _serve_batch(self, batch: List[Tuple[np.ndarray, Any, asyncio.Future]]):
+        """
+        Classify requests of the same classifier together and hand out their rows.
+        
+        Args:
+            batch: Queued (scaled features, classifier, result future) items
+        """
+        try:
+            predictions, probabilities = await asyncio.to_thread(
+                self._classify_batch, batch[0][1], np.vstack([X for X, _, _ in batch])
+            )
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        # Hand each request its own rows
+        offsets = np.cumsum([len(X) for X, _, _ in batch])[:-1]
+        for (_, _, future), batch_predictions, batch_probabilities in zip(
+            batch, np.split(predictions, offsets), np.split(probabilities, offsets)
+        ):
+            if not future.done():
+                future.set_result((batch_predictions, batch_probabilities))
+    
+    def _classify_batch(self, hybrid_classifier: HybridNIDSClassifier, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Classify a stacked batch of scaled features.
+        
+        Args:
+            hybrid_classifier: Classifier the requests were prepared for
+            X: Scaled, selected features
+            
+        Returns:
+            Encoded class predictions and class probabilities
+        """
+        # Soft-vote labels are the argmax of the averaged probabilities,
+        # so one probability pass serves both
+        probabilities = hybrid_classifier.predict_proba(X)
+        predictions = hybrid_classifier.classes_[np.argmax(probabilities, axis=1)]
+        return predictions, probabilities
+    
     async def get_model_info(self) -> Dict[str, Any]:
         """
         Get information about the current model.
@@ -243,25 +433,33 @@ class ModelManager:
             'current_model_path': self.current_model_path  # Currently loaded model path
         }
     
-    def _prepare_data(self, data: pd.DataFrame, target_column: str) -> Tuple[np.ndarray, np.ndarray]:
-        """Prepare data for training."""
+    def _prepare_data(
+        self, data: pd.DataFrame, target_column: str
+    ) -> Tuple[np.ndarray, np.ndarray, List[str], LabelEncoder]:
+        """Prepare data for training, returning the feature names and fitted label encoder."""
         # Separate features and target
         X = data.drop(columns=[target_column])
         y = data[target_column]
         
         # Store feature names
-        self.feature_names = X.columns.tolist()
+        feature_names = X.columns.tolist()
         
         # Handle categorical features
         X = pd.get_dummies(X, drop_first=True)
         
         # Encode target labels
-        y_encoded = self.label_encoder.fit_transform(y)
+        label_encoder = LabelEncoder()
+        y_encoded = label_encoder.fit_transform(y)
         
-        return X.values, y_encoded
+        return X.values, y_encoded, feature_names, label_encoder
     
     def _prepare_prediction_data(self, data: pd.DataFrame) -> np.ndarray:
         """Prepare data for prediction."""
+        # Frames that already carry every training column as numbers come
+        # out of get_dummies and the reindex unchanged, so select directly
+        if self.feature_names and _has_numeric_columns(data, self.feature_names):
+            return data[self.feature_names].to_numpy()
+        
         # Handle categorical features (same as training)
         X = pd.get_dummies(data, drop_first=True)
         
@@ -276,29 +474,83 @@ class ModelManager:
         
         return X.values
     
-    def _categorize_attacks(self, predictions: np.ndarray) -> Dict[str, int]:
-        """Categorize predictions into attack types."""
-        categories = {
-            'Normal': 0,
-            'DoS': 0,
-            'Probe': 0,
-            'U2R': 0,
-            'R2L': 0
-        }
+    def _compile_single_row_path(self) -> Optional[Tuple[List[str], np.ndarray, np.ndarray]]:
+        """
+        Precompute the preprocessing of a single flow record.
         
-        for pred in predictions:
-            if pred == 'normal':
-                categories['Normal'] += 1
-            elif pred in ['back', 'land', 'neptune', 'pod', 'smurf', 'teardrop']:
-                categories['DoS'] += 1
-            elif pred in ['ipsweep', 'nmap', 'portsweep', 'satan']:
-                categories['Probe'] += 1
-            elif pred in ['buffer_overflow', 'loadmodule', 'perl', 'rootkit']:
-                categories['U2R'] += 1
-            elif pred in ['ftp_write', 'guess_passwd', 'imap', 'multihop', 'phf', 'spy', 'warezclient', 'warezmaster']:
-                categories['R2L'] += 1
-        
-        return categories
+        Resolves which input columns feed the selected features and keeps
+        the matching scaler statistics, so one row can be selected and
+        scaled directly instead of going through get_dummies, reindexing,
+        the selector and the scaler.
+        
+        Returns:
+            Selected column names with their means and scales, or None if
+            the fitted components do not map onto the input columns
+        """
+        selector = self.feature_selector
+        if (selector is None or selector.selected_features_ is None
+                or selector.n_features_in_ != len(self.feature_names)
+                or getattr(self.scaler, 'mean_', None) is None
+                or getattr(self.scaler, 'scale_', None) is None):
+            return None
+        
+        # Statistics are applied in float32, as the scaler does for the
+        # selector's float32 output
+        columns = [self.feature_names[i] for i in selector.selected_features_]
+        return columns, np.asarray(self.scaler.mean_, dtype=np.float32), np.asarray(self.scaler.scale_, dtype=np.float32)
+    
+    def _prepare_single_row(self, data: pd.DataFrame) -> Optional[np.ndarray]:
+        """
+        Select and scale a one-row frame through the precomputed path.
+        
+        Args:
+            data: Input data with a single row
+            
+        Returns:
+            Scaled selected features matching the general path, or None if
+            the row needs the general path (missing or non-numeric columns)
+        """
+        if self._single_row_path is None:
+            return None
+        
+        columns, mean, scale = self._single_row_path
+        if not _has_numeric_columns(data, columns):
+            return None
+        
+        X = data[columns].to_numpy(dtype=np.float32, copy=True)
+        X -= mean
+        X /= scale
+        return X
+    
+    def _compile_class_lookup(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Precompute the label and attack category of each encoded class.
+        
+        Predictions can then be mapped to labels and counted per category
+        by indexing, instead of decoding them with the label encoder and
+        comparing label strings.
+        
+        Returns:
+            Original labels and attack category ids, indexed by encoded class
+        """
+        labels = np.asarray(self.label_encoder.classes_, dtype=object)
+        categories = np.full(len(labels), len(_ATTACK_CATEGORIES), dtype=np.int8)
+        for category_id, attacks in enumerate(
+            (['normal'], _DOS_ATTACKS, _PROBE_ATTACKS, _U2R_ATTACKS, _R2L_ATTACKS)
+        ):
+            categories[np.isin(labels, attacks)] = category_id
+        return labels, categories
+    
+    def _categorize_attacks(
+        self, predictions: np.ndarray, class_to_category: Optional[np.ndarray] = None
+    ) -> Dict[str, int]:
+        """Categorize encoded class predictions into attack types, by default with the current model's lookup."""
+        if class_to_category is None:
+            class_to_category = self._class_to_category
+        counts = np.bincount(
+            class_to_category[predictions], minlength=len(_ATTACK_CATEGORIES) + 1
+        )
+        return {category: int(count) for category, count in zip(_ATTACK_CATEGORIES, counts)}
     
     async def _save_model(self):
         """Save trained model components."""
@@ -313,9 +565,13 @@ class ModelManager:
                 'last_training': self.last_training.isoformat() if self.last_training else None  # Save training timestamp
             }
             
+            # Arrays are stored uncompressed so loads can memory-map them.
+            # The file is written beside the target and swapped in, so
+            # processes still mapping the previous model keep a valid file
             model_path = os.path.join(settings.MODEL_PATH, 'nids_model.pkl')
-            with open(model_path, 'wb') as f:
-                pickle.dump(model_data, f)
+            tmp_path = f"{model_path}.tmp"
+            await asyncio.to_thread(joblib.dump, model_data, tmp_path, protocol=5)
+            os.replace(tmp_path, model_path)
             
             logger.info(f"Model saved to {model_path}")
             
@@ -332,14 +588,15 @@ class ModelManager:
                 logger.warning(f"Model file not found: {model_path}")
                 return False
             
-            with open(model_path, 'rb') as f:
-                model_data = pickle.load(f)
+            model_data = await asyncio.to_thread(_load_model_file, model_path)
             
             self.hybrid_classifier = model_data['hybrid_classifier']
             self.feature_selector = model_data['feature_selector']
             self.scaler = model_data['scaler']
             self.label_encoder = model_data['label_encoder']
             self.feature_names = model_data['feature_names']
+            self._single_row_path = self._compile_single_row_path()
+            self._class_to_label, self._class_to_category = self._compile_class_lookup()
             self.is_trained = True
             # Load dataset info if available (for backward compatibility)
             self.dataset_name = model_data.get('dataset_name')
@@ -0,0 +1,61 @@
+"""
+Shared XGBoost tree-construction parameters.
+"""
+
+from functools import lru_cache
+from typing import Dict, Any
+
+import xgboost as xgb
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """
+    Check whether XGBoost can build trees on a GPU.
+    
+    Returns:
+        True if XGBoost was built with CUDA and a GPU is visible
+    """
+    if not xgb.build_info().get('USE_CUDA'):
+        return False
+    
+    try:
+        import cupy
+        return cupy.cuda.runtime.getDeviceCount() > 0
+    except Exception:
+        # cupy is optional; without it no GPU is assumed
+        return False
+
+
+def xgboost_device() -> str:
+    """
+    Resolve the XGBoost device from settings.
+    
+    Returns:
+        'cuda' or 'cpu' for the 'auto' setting, otherwise the configured device
+    """
+    if settings.XGBOOST_DEVICE != 'auto':
+        return settings.XGBOOST_DEVICE
+    
+    device = 'cuda' if _cuda_available() else 'cpu'
+    logger.debug(f"XGBoost device resolved to {device}")
+    return device
+
+
+def tree_method_params() -> Dict[str, Any]:
+    """
+    Get the histogram split-finding parameters shared by all XGBoost models.
+    
+    Returns:
+        XGBoost tree_method, max_bin and device parameters
+    """
+    return {
+        'tree_method': settings.XGBOOST_TREE_METHOD,
+        'max_bin': settings.XGBOOST_MAX_BIN,
+        'device': xgboost_device()
+    }
@@ -0,0 +1,186 @@
+"""
+Tests for the Crow Search Algorithm optimizer.
+"""
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from app.core.config import settings
+from app.ml.crow_search import CrowSearchOptimizer, _cross_validate_fitness
+
+
+class SimpleClassifier:
+    """Minimal classifier taking its hyperparameters through fit(best_params=...)."""
+    
+    fit_sizes = []
+    
+    def fit(self, X, y, best_params=None):
+        SimpleClassifier.fit_sizes.append(len(X))
+        C = best_params.get('svm_C', 1.0) if best_params else 1.0
+        self.model = LogisticRegression(C=C).fit(X, y)
+        self.classes_ = self.model.classes_
+        return self
+    
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+class TestCrowSearchOptimizer:
+    """Test cases for CrowSearchOptimizer."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.optimizer = CrowSearchOptimizer(population_size=6, max_iterations=3, seed=42)
+        
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(120, 4))
+        self.y = (self.X[:, 0] + self.X[:, 1] > 0).astype(int)
+    
+    def test_position_to_params_rounds_integer_parameters(self):
+        """Integer parameters are rounded, continuous ones kept as floats."""
+        params = self.optimizer._position_to_params(np.array([1.5, 0.25, 120.6, 4.4, 0.05]))
+        
+        assert params == {
+            'svm_C': 1.5,
+            'svm_gamma': 0.25,
+            'xgb_n_estimators': 121,
+            'xgb_max_depth': 4,
+            'xgb_learning_rate': 0.05
+        }
+        assert isinstance(params['xgb_n_estimators'], int)
+    
+    def test_update_population_stays_within_bounds(self):
+        """Positions never leave the parameter bounds."""
+        self.optimizer._initialize_population()
+        self.optimizer.memory_positions = self.optimizer.population[::-1].copy()
+        
+        for _ in range(20):
+            self.optimizer._update_population()
+        
+        lower = np.array([bounds[0] for bounds in self.optimizer.parameter_bounds.values()])
+        upper = np.array([bounds[1] for bounds in self.optimizer.parameter_bounds.values()])
+        assert self.optimizer.population.shape == (6, 5)
+        assert np.all(self.optimizer.population >= lower)
+        assert np.all(self.optimizer.population <= upper)
+    
+    def test_seed_makes_search_reproducible(self):
+        """Optimizers built with the same seed draw the same populations."""
+        other = CrowSearchOptimizer(population_size=6, max_iterations=3, seed=42)
+        for optimizer in (self.optimizer, other):
+            optimizer._initialize_population()
+            optimizer._update_population()
+        
+        np.testing.assert_array_equal(self.optimizer.population, other.population)
+    
+    def test_evaluate_population_deduplicates_and_caches(self):
+        """Identical crows are evaluated once and later iterations hit the cache."""
+        self.optimizer._initialize_population()
+        self.optimizer.population[3:] = self.optimizer.population[:3]
+        
+        with patch('app.ml.crow_search._cross_validate_fitness', return_value=0.5) as evaluate:
+            fitness = self.optimizer._evaluate_population(self.X, self.y, SimpleClassifier(), cv_folds=5)
+            assert evaluate.call_count == 3
+            np.testing.assert_array_equal(fitness, np.full(6, 0.5))
+            
+            # Nearly identical positions round to the same cache key
+            self.optimizer.population[:, 0] += 1e-7
+            self.optimizer._evaluate_population(self.X, self.y, SimpleClassifier(), cv_folds=5)
+            assert evaluate.call_count == 3
+    
+    def test_failed_evaluations_are_not_cached(self):
+        """A failed evaluation scores -inf and is retried on the next call."""
+        self.optimizer._initialize_population()
+        params = self.optimizer._position_to_params(self.optimizer.population[0])
+        
+        with patch('app.ml.crow_search._cross_validate_fitness', return_value=float('-inf')) as evaluate:
+            assert self.optimizer._evaluate_parameters(params, self.X, self.y, SimpleClassifier(), 3) == float('-inf')
+            self.optimizer._evaluate_parameters(params, self.X, self.y, SimpleClassifier(), 3)
+            assert evaluate.call_count == 2
+    
+    def test_cross_validation_fits_once_per_fold(self):
+        """Fitness comes from the CV folds alone, with no extra full-data fit."""
+        SimpleClassifier.fit_sizes = []
+        
+        fitness = _cross_validate_fitness(SimpleClassifier, {'svm_C': 0.5}, self.X, self.y, 3, n_jobs=1)
+        
+        assert SimpleClassifier.fit_sizes == [80, 80, 80]
+        
+        expected = np.mean([
+            f1_score(
+                self.y[test],
+                LogisticRegression(C=0.5).fit(self.X[train], self.y[train]).predict(self.X[test]),
+                average='weighted'
+            )
+            for train, test in StratifiedKFold(n_splits=3).split(self.X, self.y)
+        ])
+        assert fitness == pytest.approx(expected)
+    
+    def test_optimize_returns_parameters_within_bounds(self):
+        """A short optimization run returns valid parameters and history."""
+        uncached_settings = settings.model_copy(update={'CSA_RESULT_CACHE_PATH': None})
+        with patch('app.ml.crow_search.settings', uncached_settings):
+            best_params = self.optimizer.optimize(self.X, self.y, SimpleClassifier(), cv_folds=3)
+        
+        for name, (min_val, max_val) in self.optimizer.parameter_bounds.items():
+            assert min_val <= best_params[name] <= max_val
+        assert self.optimizer.best_fitness > 0.5
+        
+        history = self.optimizer.get_optimization_history()
+        assert 1 <= history['total_iterations'] <= 3
+        assert history['convergence_history'] == self.optimizer.convergence_history.tolist()
+        assert type(history['convergence_history']) is list
+        assert history['best_parameters'] == best_params
+    
+    def test_optimize_keeps_best_position_in_population(self):
+        """The global best is carried into the next population unchanged."""
+        uncached_settings = settings.model_copy(update={'CSA_RESULT_CACHE_PATH': None})
+        
+        def fitness(estimator_class, params, X, y, cv, n_jobs):
+            return -abs(params['svm_C'] - 50.0)
+        
+        with patch('app.ml.crow_search.settings', uncached_settings), \
+                patch('app.ml.crow_search._cross_validate_fitness', side_effect=fitness):
+            self.optimizer.optimize(self.X, self.y, SimpleClassifier(), cv_folds=10)
+        
+        assert any(np.array_equal(crow, self.optimizer.best_position) for crow in self.optimizer.population)
+    
+    def test_result_cache_is_keyed_by_seed_and_ignores_bad_files(self, tmp_path):
+        """Only seeded runs are cached, per seed; unreadable results are skipped."""
+        cached_settings = settings.model_copy(update={'CSA_RESULT_CACHE_PATH': str(tmp_path)})
+        with patch('app.ml.crow_search.settings', cached_settings):
+            path = self.optimizer._result_cache_path(self.X, self.y, SimpleClassifier(), 3)
+            other_seed = CrowSearchOptimizer(population_size=6, max_iterations=3, seed=7)
+            unseeded = CrowSearchOptimizer(population_size=6, max_iterations=3)
+            
+            assert path.parent == tmp_path
+            assert other_seed._result_cache_path(self.X, self.y, SimpleClassifier(), 3) != path
+            assert unseeded._result_cache_path(self.X, self.y, SimpleClassifier(), 3) is None
+            assert self.optimizer._result_cache_path(self.X, self.y.astype(str).astype(object), SimpleClassifier(), 3) is None
+            
+            path.write_text('{"best_parameters": {}}')
+            assert self.optimizer._load_cached_result(path) is None
+            
+            best_params = self.optimizer.optimize(self.X, self.y, SimpleClassifier(), cv_folds=3)
+            assert path.exists()
+            
+            rerun = CrowSearchOptimizer(population_size=6, max_iterations=3, seed=42)
+            with patch('app.ml.crow_search._cross_validate_fitness') as fitness:
+                assert rerun.optimize(self.X, self.y, SimpleClassifier(), cv_folds=3) == best_params
+            fitness.assert_not_called()
+    
+    def test_converges_early_on_plateau(self):
+        """The loop stops once the best fitness has plateaued."""
+        self.optimizer.patience = 3
+        self.optimizer.convergence_history = [0.8, 0.8, 0.8]
+        self.optimizer.best_fitness = 0.8
+        assert self.optimizer._has_converged()
+        
+        self.optimizer.convergence_history = [0.7, 0.75, 0.8]
+        assert not self.optimizer._has_converged()
+        
+        self.optimizer.best_fitness = 0.9995
+        assert self.optimizer._has_converged()
@@ -0,0 +1,140 @@
+"""
+Tests for the NSL-KDD / UNR-IDD dataset loader.
+"""
+
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+
+from app.data.dataset_loader import DatasetLoader, NSLKDDSplits
+
+
+class TestDatasetLoader:
+    """Test cases for DatasetLoader."""
+    
+    def setup_method(self):
+        """Set up a loader rooted in a temporary dataset directory."""
+        self.dataset_dir = Path(tempfile.mkdtemp())
+        with patch('app.data.dataset_loader.settings', Mock(DATASET_PATH=str(self.dataset_dir))):
+            self.loader = DatasetLoader()
+    
+    def teardown_method(self):
+        """Remove the temporary dataset directory."""
+        shutil.rmtree(self.dataset_dir, ignore_errors=True)
+    
+    def _write_nsl_kdd_csv(self, df: pd.DataFrame, name: str) -> Path:
+        """Write a header-less NSL-KDD CSV with integer-valued count columns."""
+        df = df.copy()
+        for column, dtype in DatasetLoader.NSL_KDD_DTYPES.items():
+            if dtype.startswith('int'):
+                df[column] = df[column].round().astype(dtype)
+        path = self.dataset_dir / name
+        df.to_csv(path, header=False, index=False)
+        return path
+    
+    def test_load_nsl_kdd_falls_back_to_samples(self):
+        """Missing files are replaced by seeded sample data."""
+        splits = self.loader.load_nsl_kdd()
+        
+        assert isinstance(splits, NSLKDDSplits)
+        assert splits.train.shape == (1000, 42)
+        assert splits.test.shape == (300, 42)
+        assert (self.dataset_dir / 'sample_nsl_kdd_train.parquet').exists()
+        
+        # A second load reuses the stored sample copy
+        again = self.loader.load_nsl_kdd()
+        pd.testing.assert_frame_equal(splits.train, again.train)
+    
+    def test_load_nsl_kdd_csv_uses_typed_schema_and_parquet_cache(self):
+        """CSV files are parsed with the typed schema and cached as Parquet."""
+        sample = self.loader.load_nsl_kdd().train
+        train_path = self._write_nsl_kdd_csv(sample, 'nsl_kdd_train.csv')
+        
+        train = self.loader.load_nsl_kdd(train_file=train_path).train
+        
+        assert list(train.columns) == list(DatasetLoader.NSL_KDD_FEATURES)
+        assert train['duration'].dtype == np.int32
+        assert train['serror_rate'].dtype == np.float32
+        assert train_path.with_suffix('.parquet').exists()
+        
+        cached = self.loader.load_nsl_kdd(train_file=train_path).train
+        pd.testing.assert_frame_equal(train, cached)
+    
+    def test_stream_nsl_kdd_covers_all_rows(self):
+        """Streaming yields preprocessed chunks covering the whole file."""
+        sample = self.loader.load_nsl_kdd().train
+        train_path = self._write_nsl_kdd_csv(sample, 'nsl_kdd_train.csv')
+        
+        chunks = list(self.loader.stream_nsl_kdd(train_path))
+        
+        assert sum(len(chunk) for chunk in chunks) == len(sample)
+        assert all('protocol_type' not in chunk.columns for chunk in chunks)
+    
+    def test_preprocess_nsl_kdd_matches_get_dummies(self):
+        """One-hot encoding matches pd.get_dummies(drop_first=True)."""
+        raw = self.loader.load_nsl_kdd().train
+        processed = self.loader.preprocess_dataset(raw, 'nsl_kdd')
+        
+        expected = pd.get_dummies(
+            raw.drop(columns=['class']),
+            columns=['protocol_type', 'service', 'flag'],
+            drop_first=True,
+            dtype=np.int8
+        )
+        pd.testing.assert_frame_equal(processed.drop(columns=['class']), expected)
+        
+        # The caller's frame is left untouched
+        assert 'protocol_type' in raw.columns
+    
+    def test_preprocess_normalizes_attack_labels(self):
+        """Raw attack names map to their categories; unknown labels are kept."""
+        df = pd.DataFrame({
+            'duration': [1, 2, 3, 4, 5],
+            'protocol_type': ['tcp', 'udp', 'tcp', 'icmp', 'tcp'],
+            'class': [' Neptune', 'normal', 'satan', 'mystery', 'GUESS_PASSWD']
+        })
+        
+        processed = self.loader.preprocess_dataset(df, 'nsl_kdd')
+        
+        assert processed['class'].tolist() == ['dos', 'normal', 'probe', 'mystery', 'r2l']
+        assert processed.columns.tolist() == ['duration', 'class', 'protocol_type_tcp', 'protocol_type_udp']
+    
+    def test_preprocess_drops_incomplete_rows(self):
+        """Rows with missing values are removed without chained-assignment warnings."""
+        df = pd.DataFrame({
+            'duration': [1.0, np.nan, 3.0],
+            'class': ['normal', 'normal', 'smurf']
+        })
+        
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', pd.errors.SettingWithCopyWarning)
+            processed = self.loader.preprocess_dataset(df, 'nsl_kdd')
+        
+        assert processed['class'].tolist() == ['normal', 'dos']
+    
+    def test_sample_unr_idd(self):
+        """Sample UNR-IDD data keeps its columns and compact dtypes."""
+        df = self.loader.load_unr_idd()
+        
+        assert df.shape == (800, 30)
+        assert df.columns[0] == 'flow_duration'
+        assert df['total_fwd_packets'].dtype == np.int32
+        assert df['flow_iat_mean'].dtype == np.float32
+        assert set(df['class']) <= {'normal', 'dos', 'probe', 'u2r', 'r2l'}
+    
+    def test_get_dataset_statistics(self):
+        """Statistics report class balance and optional numeric summaries."""
+        df = self.loader.load_nsl_kdd().train
+        
+        stats = self.loader.get_dataset_statistics(df)
+        assert stats['shape'] == df.shape
+        assert abs(sum(stats['class_balance'].values()) - 1.0) < 1e-9
+        assert 'numeric_stats' in stats
+        
+        light = self.loader.get_dataset_statistics(df, include_numeric_stats=False)
+        assert 'numeric_stats' not in light
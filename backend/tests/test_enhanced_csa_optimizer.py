@@ -0,0 +1,231 @@
+"""
+Tests for the multi-objective Enhanced CSA optimizer.
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+from unittest.mock import patch
+from sklearn.linear_model import LogisticRegression
+
+from app.ml.enhanced_csa_optimizer import EnhancedCSAOptimizer, OptimizationObjective
+
+
+class SimpleClassifier:
+    """Minimal classifier taking its hyperparameters through fit(best_params=...)."""
+    
+    n_fits = 0
+    
+    def fit(self, X, y, best_params=None):
+        SimpleClassifier.n_fits += 1
+        C = best_params.get('svm_C', 1.0) if best_params else 1.0
+        self.model = LogisticRegression(C=C).fit(X, y)
+        return self
+    
+    def predict(self, X):
+        return self.model.predict(X)
+
+
+class TestEnhancedCSAOptimizer:
+    """Test cases for EnhancedCSAOptimizer."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.objectives = [
+            OptimizationObjective("accuracy", 0.6, minimize=False),
+            OptimizationObjective("latency", 0.4, minimize=True)
+        ]
+        self.optimizer = EnhancedCSAOptimizer(
+            population_size=6,
+            max_iterations=3,
+            objectives=self.objectives,
+            parallel_evaluation=False
+        )
+    
+    def test_pareto_front_keeps_only_non_dominated_solutions(self):
+        """Dominated solutions are rejected or removed from the front."""
+        self.optimizer._update_pareto_front({'id': 0}, {'accuracy': 0.8, 'latency': 0.5}, 0.6)
+        self.optimizer._update_pareto_front({'id': 1}, {'accuracy': 0.9, 'latency': 0.6}, 0.7)
+        
+        # Dominated by solution 0: lower accuracy, higher latency
+        self.optimizer._update_pareto_front({'id': 2}, {'accuracy': 0.7, 'latency': 0.7}, 0.5)
+        
+        # Dominates both existing solutions
+        self.optimizer._update_pareto_front({'id': 3}, {'accuracy': 0.95, 'latency': 0.4}, 0.8)
+        
+        assert [solution['parameters']['id'] for solution in self.optimizer.pareto_front] == [3]
+    
+    def test_pareto_front_is_limited_by_fitness(self):
+        """An oversized front keeps the solutions with the highest fitness."""
+        self.optimizer.PARETO_FRONT_LIMIT = 3
+        
+        # Trade-off solutions that do not dominate each other
+        for i in range(5):
+            scores = {'accuracy': 0.5 + 0.1 * i, 'latency': 0.1 + 0.1 * i}
+            self.optimizer._update_pareto_front({'id': i}, scores, fitness=float(i % 3))
+        
+        assert [solution['parameters']['id'] for solution in self.optimizer.pareto_front] == [2, 1, 4]
+    
+    def test_weighted_fitness(self):
+        """Minimized objectives are inverted and missing ones are left out."""
+        fitness = self.optimizer._calculate_weighted_fitness({'accuracy': 0.9, 'latency': 0.2})
+        assert np.isclose(fitness, 0.6 * 0.9 + 0.4 * 0.8)
+        
+        assert np.isclose(self.optimizer._calculate_weighted_fitness({'accuracy': 0.9}), 0.9)
+        assert self.optimizer._calculate_weighted_fitness({}) == 0.0
+    
+    def test_position_update_is_seeded_and_bounded(self):
+        """Seeded optimizers take identical steps that respect the bounds."""
+        optimizers = [
+            EnhancedCSAOptimizer(population_size=6, max_iterations=3, parallel_evaluation=False, seed=7)
+            for _ in range(2)
+        ]
+        for optimizer in optimizers:
+            optimizer._set_parameter_bounds(include_sgm=True)
+            optimizer._initialize_population()
+            optimizer._adapt_csa_parameters(iteration=1)
+            optimizer._update_population()
+        
+        np.testing.assert_array_equal(optimizers[0].population, optimizers[1].population)
+        assert optimizers[0].population.shape == (6, 10)
+        assert np.all(optimizers[0].population >= optimizers[0]._lower_bounds)
+        assert np.all(optimizers[0].population <= optimizers[0]._upper_bounds)
+    
+    def test_population_diversity_is_mean_pairwise_distance(self):
+        """Diversity equals the average Euclidean distance between crows."""
+        self.optimizer.population = np.array([[0.0, 0.0], [3.0, 4.0], [0.0, 8.0]])
+        
+        assert np.isclose(self.optimizer._calculate_population_diversity(), (5.0 + 8.0 + 5.0) / 3)
+    
+    def test_population_diversity_is_sampled_for_large_populations(self):
+        """Large populations get a sampled estimate close to the exact mean."""
+        rng = np.random.default_rng(0)
+        self.optimizer.population = rng.random((200, 5))
+        exact = np.mean([
+            np.linalg.norm(a - b)
+            for i, a in enumerate(self.optimizer.population)
+            for b in self.optimizer.population[i + 1:]
+        ])
+        
+        assert abs(self.optimizer._calculate_population_diversity() - exact) < 0.05 * exact
+    
+    def test_ml_objectives_fit_each_fold_once(self):
+        """All ML metrics are scored from a single fit per CV fold."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(120, 4))
+        y = (X[:, 0] > 0).astype(int)
+        SimpleClassifier.n_fits = 0
+        
+        scores = self.optimizer._evaluate_ml_objectives({'svm_C': 1.0}, X, y, SimpleClassifier(), cv_folds=3)
+        
+        assert SimpleClassifier.n_fits == 3
+        assert set(scores) == {'accuracy', 'f1_score', 'precision', 'recall'}
+        assert all(0.5 < value <= 1.0 for value in scores.values())
+    
+    def test_population_objectives_are_memoized(self):
+        """Duplicate and previously seen configurations are evaluated once."""
+        X = np.zeros((10, 2))
+        y = np.zeros(10)
+        self.optimizer._set_parameter_bounds(include_sgm=False)
+        self.optimizer._initialize_population()
+        self.optimizer.population[3:] = self.optimizer.population[:3]
+        
+        scores = {'accuracy': 0.9, 'latency': 0.1}
+        with patch.object(self.optimizer, '_evaluate_multi_objective', return_value=scores) as evaluate:
+            _, all_scores, full_fidelity = self.optimizer._evaluate_population_objectives(X, y, None, None, 3, False)
+            assert evaluate.call_count == 3
+            assert all_scores == [scores] * 6
+            assert full_fidelity.all()
+            
+            self.optimizer._evaluate_population_objectives(X, y, None, None, 3, False)
+            assert evaluate.call_count == 3
+    
+    def test_ml_objectives_train_on_subsample_splits(self):
+        """With cv_train_size, each split trains on that fraction of the data."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(100, 4))
+        y = (X[:, 0] > 0).astype(int)
+        self.optimizer.cv_train_size = 0.3
+        
+        with patch.object(SimpleClassifier, 'fit', autospec=True, side_effect=SimpleClassifier.fit) as fit:
+            scores = self.optimizer._evaluate_ml_objectives({'svm_C': 1.0}, X, y, SimpleClassifier(), cv_folds=3)
+        
+        assert [len(call.args[1]) for call in fit.call_args_list] == [30, 30, 30]
+        assert scores['accuracy'] > 0.5
+    
+    def test_successive_halving_fully_evaluates_top_candidates(self):
+        """Screened candidates are promoted by fitness; the rest keep screening scores."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(100, 2))
+        y = np.repeat([0, 1], 50)
+        self.optimizer.successive_halving = True
+        self.optimizer._set_parameter_bounds(include_sgm=False)
+        self.optimizer._initialize_population()
+        screen_data = self.optimizer._screening_subset(X, y)
+        assert len(screen_data[1]) == 20
+        
+        evaluated_sizes = []
+        
+        def evaluate(params, X, y, ml_classifier, sgm_analyzer, cv_folds, include_sgm):
+            evaluated_sizes.append(len(X))
+            return {'accuracy': params['svm_C'] / 100.0, 'latency': 0.0}
+        
+        with patch.object(self.optimizer, '_evaluate_multi_objective', side_effect=evaluate):
+            params_list, _, full_fidelity = self.optimizer._evaluate_population_objectives(
+                X, y, object(), None, 3, False, screen_data
+            )
+        
+        assert sorted(evaluated_sizes) == [20] * 6 + [100] * 3
+        C_values = np.array([params['svm_C'] for params in params_list])
+        assert set(np.flatnonzero(full_fidelity)) == set(np.argsort(-C_values)[:3])
+    
+    def test_optimizer_can_be_run_repeatedly(self):
+        """A second run on the same instance evaluates with fresh state."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(60, 3))
+        y = (X[:, 0] > 0).astype(int)
+        optimizer = EnhancedCSAOptimizer(population_size=4, max_iterations=2, parallel_evaluation=True, seed=0)
+        
+        first = optimizer.optimize_multi_objective(X, y, SimpleClassifier(), include_sgm=False, cv_folds=3)
+        second = optimizer.optimize_multi_objective(-X, 1 - y, SimpleClassifier(), include_sgm=False, cv_folds=3)
+        
+        for result in (first, second):
+            assert result.best_fitness > 0.5
+            assert set(result.best_parameters) == set(optimizer.parameter_bounds)
+            assert [record['iteration'] for record in result.convergence_history] == [1, 2]
+        
+        summary = optimizer.get_optimization_summary()
+        assert summary['total_iterations'] == 2
+        assert summary['final_improvement'] >= 0.0
+    
+    def test_single_objective_optimize_runs_on_subclass(self):
+        """The inherited optimize() records a plain best-fitness history."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(60, 3))
+        y = (X[:, 0] > 0).astype(int)
+        optimizer = EnhancedCSAOptimizer(population_size=4, max_iterations=2, seed=0)
+        optimizer.parameter_bounds = {'svm_C': (0.1, 10.0)}
+        optimizer._cache_bounds()
+        
+        best_params = optimizer.optimize(X, y, SimpleClassifier(), cv_folds=3)
+        
+        assert 0.1 <= best_params['svm_C'] <= 10.0
+        assert len(optimizer.convergence_history) == optimizer.get_optimization_history()['total_iterations'] >= 1
+        assert optimizer.iteration_records == []
+    
+    def test_worker_evaluator_leaves_out_run_caches(self):
+        """Evaluation tasks ship a copy without caches and front; pickling keeps everything."""
+        self.optimizer._objective_cache[('key',)] = {'accuracy': 0.9, 'latency': 0.1}
+        self.optimizer._update_pareto_front({'id': 0}, {'accuracy': 0.8, 'latency': 0.5}, 0.6)
+        
+        evaluator = pickle.loads(pickle.dumps(self.optimizer._worker_evaluator()))
+        
+        assert not hasattr(evaluator, '_objective_cache')
+        assert not hasattr(evaluator, 'pareto_front')
+        assert evaluator.objectives == self.optimizer.objectives
+        assert self.optimizer._objective_cache
+        
+        restored = pickle.loads(pickle.dumps(self.optimizer))
+        assert restored.pareto_front == self.optimizer.pareto_front
+        assert restored.iteration_records == self.optimizer.iteration_records
@@ -0,0 +1,251 @@
+"""
+Tests for the XGBoost-based feature selector.
+"""
+
+import numpy as np
+import pytest
+import xgboost as xgb
+from unittest.mock import patch
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import cross_val_score
+
+from app.ml.feature_selector import XGBoostFeatureSelector
+
+
+class TestXGBoostFeatureSelector:
+    """Test cases for XGBoostFeatureSelector."""
+    
+    def setup_method(self):
+        """Set up a dataset whose label depends on two of eight features."""
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(300, 8))
+        self.y = (self.X[:, 2] + 0.5 * self.X[:, 5] > 0).astype(int)
+        self.selector = XGBoostFeatureSelector(
+            n_features=3,
+            xgb_params={'n_estimators': 20, 'max_depth': 3, 'random_state': 42},
+            keep_model=True
+        )
+    
+    def test_importances_match_booster_scores(self):
+        """Importances are the booster's normalized scores per input column."""
+        self.selector.fit(self.X, self.y)
+        
+        scores = self.selector.xgb_model_.get_booster().get_score(importance_type='gain')
+        expected = np.zeros(self.X.shape[1])
+        for name, value in scores.items():
+            expected[int(name[1:])] = value
+        
+        assert self.selector.feature_importances_.shape == (8,)
+        np.testing.assert_allclose(self.selector.feature_importances_, expected / expected.sum(), rtol=1e-5)
+    
+    def test_selects_informative_features(self):
+        """The informative features are ranked first."""
+        self.selector.fit(self.X, self.y)
+        
+        assert list(self.selector.selected_features_[:2]) == [2, 5]
+        assert self.selector.get_selected_features()[:2] == ['feature_2', 'feature_5']
+    
+    def test_invalid_importance_type_is_rejected(self):
+        """Unknown importance types fail before any model is trained."""
+        selector = XGBoostFeatureSelector(n_features=3, importance_type='entropy')
+        
+        with pytest.raises(RuntimeError, match='Invalid importance_type'):
+            selector.fit(self.X, self.y)
+        assert selector.xgb_model_ is None
+    
+    def test_ranking_is_sorted_and_truncated(self):
+        """Rankings list features by descending importance, optionally top-N only."""
+        self.selector.fit(self.X, self.y)
+        
+        ranking = self.selector.get_feature_ranking()
+        importances = [importance for _, importance in ranking]
+        assert len(ranking) == 8
+        assert importances == sorted(importances, reverse=True)
+        assert self.selector.get_feature_ranking(top_n=3) == ranking[:3]
+        assert [name for name, _ in ranking[:3]] == self.selector.get_selected_features()
+    
+    def test_fit_transform_matches_transform(self):
+        """fit_transform returns the selected float32 columns in ranking order."""
+        X_selected = self.selector.fit_transform(self.X, self.y)
+        
+        assert X_selected.shape == (300, 3)
+        assert X_selected.dtype == np.float32
+        np.testing.assert_array_equal(X_selected, self.selector.transform(self.X))
+        np.testing.assert_array_equal(X_selected[:, 0], self.X[:, 2].astype(np.float32))
+    
+    def test_rankings_are_cached_until_refit(self):
+        """Rankings and importance dicts are built once per fit."""
+        self.selector.fit(self.X, self.y)
+        
+        with patch.object(self.selector, '_top_feature_indices', wraps=self.selector._top_feature_indices) as top:
+            ranking = self.selector.get_feature_ranking()
+            assert self.selector.get_feature_ranking(top_n=2) == ranking[:2]
+            assert top.call_count == 1
+        
+        importance = self.selector.get_feature_importance()
+        importance.clear()
+        assert len(self.selector.get_feature_importance()) == 3
+        
+        self.selector.fit(self.X[:, ::-1], self.y)
+        assert self.selector.get_feature_ranking()[0][0] == 'feature_5'
+    
+    def test_evaluation_scores_both_feature_sets_on_shared_folds(self):
+        """Original and selected features are scored on identical folds."""
+        self.selector.fit(self.X, self.y)
+        
+        with patch('app.ml.feature_selector.cross_val_score', wraps=cross_val_score) as cv_score:
+            results = self.selector.evaluate_feature_selection(self.X, self.y, LogisticRegression(), cv_folds=3)
+        
+        (_, X_original, _), original_kwargs = cv_score.call_args_list[0]
+        (_, X_selected, _), selected_kwargs = cv_score.call_args_list[1]
+        assert X_original.shape[1] == 8 and X_selected.shape[1] == 3
+        assert original_kwargs['cv'] is selected_kwargs['cv']
+        assert original_kwargs['cv'].shuffle and original_kwargs['n_jobs'] == -1
+        assert len(results['selected_accuracy']['scores']) == 3
+        assert results['selected_accuracy']['mean'] > 0.8
+    
+    def test_top_n_ranking_extends_cached_prefix(self):
+        """Top-N rankings only rank as many features as requested."""
+        self.selector.fit(self.X, self.y)
+        
+        top_two = self.selector.get_feature_ranking(top_n=2)
+        assert len(self.selector._ranking_cache) == 2
+        
+        full = self.selector.get_feature_ranking()
+        assert full[:2] == top_two
+        assert len(self.selector._ranking_cache) == 8
+    
+    def test_feature_names_are_generated_or_kept(self):
+        """Default names are derived from column indices; given names are kept."""
+        self.selector.fit(self.X, self.y)
+        assert self.selector.feature_names_ == [f'feature_{i}' for i in range(8)]
+        
+        names = [f'col_{i}' for i in range(8)]
+        self.selector.fit(self.X, self.y, feature_names=names)
+        assert self.selector.get_selected_features()[:2] == ['col_2', 'col_5']
+        assert self.selector.get_selection_summary()['total_features'] == 8
+    
+    def test_transform_fills_caller_buffer(self):
+        """A provided out buffer receives the selected columns and is returned."""
+        self.selector.fit(self.X, self.y)
+        buffer = np.empty((50, 3), dtype=np.float32)
+        
+        X_selected = self.selector.transform(self.X[:50], out=buffer)
+        
+        assert X_selected is buffer
+        np.testing.assert_array_equal(buffer, self.X[:50, self.selector.selected_features_].astype(np.float32))
+        
+        # float32 input is gathered without an intermediate copy
+        X_f32 = self.X[:50].astype(np.float32)
+        with patch('app.ml.feature_selector.np.take', wraps=np.take) as take:
+            assert self.selector.transform(X_f32, out=buffer) is buffer
+        take.assert_called_once()
+        np.testing.assert_array_equal(buffer, X_f32[:, self.selector.selected_features_])
+    
+    def test_transform_accepts_integer_input(self):
+        """Integer features are selected and converted to float32."""
+        self.selector.fit(self.X, self.y)
+        X_int = np.arange(80, dtype=np.int64).reshape(10, 8)
+        
+        X_selected = self.selector.transform(X_int)
+        
+        assert X_selected.dtype == np.float32
+        np.testing.assert_array_equal(X_selected, X_int[:, self.selector.selected_features_])
+        np.testing.assert_array_equal(
+            self.selector.transform(X_int, out=np.empty((10, 3), dtype=np.float32)), X_selected
+        )
+    
+    def test_screening_trains_booster_on_stratified_sample(self):
+        """With a screening fraction the booster sees only that share of the rows."""
+        selector = XGBoostFeatureSelector(
+            n_features=3,
+            xgb_params={'n_estimators': 20, 'max_depth': 3, 'random_state': 42},
+            screening_fraction=1 / 3
+        )
+        
+        with patch('xgboost.XGBClassifier.fit', autospec=True, side_effect=xgb.XGBClassifier.fit) as fit:
+            selector.fit(self.X, self.y)
+        
+        X_fit, y_fit = fit.call_args.args[1:3]
+        assert len(y_fit) == 100
+        assert abs(y_fit.mean() - self.y.mean()) < 0.01
+        assert list(selector.selected_features_[:2]) == [2, 5]
+    
+    def test_early_stopping_limits_boosting_rounds(self):
+        """With early stopping the booster stops once validation loss plateaus."""
+        selector = XGBoostFeatureSelector(
+            n_features=3,
+            xgb_params={'n_estimators': 500, 'max_depth': 3, 'learning_rate': 0.3, 'random_state': 42},
+            early_stopping_rounds=5,
+            keep_model=True
+        )
+        
+        selector.fit(self.X, self.y)
+        
+        assert selector.xgb_model_.get_booster().num_boosted_rounds() < 100
+        assert list(selector.selected_features_[:2]) == [2, 5]
+        
+        # Multiclass targets are validated with the multiclass log loss
+        y_multiclass = self.y + (self.X[:, 2] > 1)
+        selector = XGBoostFeatureSelector(
+            n_features=3,
+            xgb_params={'n_estimators': 500, 'max_depth': 3, 'learning_rate': 0.3, 'random_state': 42},
+            early_stopping_rounds=5,
+            keep_model=True
+        )
+        selector.fit(self.X, y_multiclass)
+        
+        assert selector.xgb_model_.get_booster().num_boosted_rounds() < 100
+        assert selector.selected_features_[0] == 2
+    
+    def test_get_support_marks_selected_features(self):
+        """The support mask flags exactly the selected input features."""
+        self.selector.fit(self.X, self.y)
+        
+        mask = self.selector.get_support()
+        assert mask.dtype == bool and mask.sum() == 3
+        assert set(np.flatnonzero(mask)) == set(self.selector.selected_features_)
+        np.testing.assert_array_equal(self.selector.get_support(indices=True), np.sort(self.selector.selected_features_))
+    
+    def test_save_and_memory_mapped_load(self, tmp_path):
+        """A saved selector loads with memory-mapped arrays and transforms the same."""
+        self.selector.fit(self.X, self.y)
+        path = tmp_path / 'selector.joblib'
+        
+        self.selector.save(str(path))
+        loaded = XGBoostFeatureSelector.load(str(path))
+        
+        assert isinstance(loaded.feature_importances_, np.memmap)
+        np.testing.assert_array_equal(loaded.transform(self.X), self.selector.transform(self.X))
+    
+    def test_booster_is_released_unless_kept(self):
+        """By default only the importances outlive fit; the booster is dropped."""
+        selector = XGBoostFeatureSelector(n_features=3, xgb_params={'n_estimators': 20, 'max_depth': 3})
+        
+        X_selected = selector.fit_transform(self.X, self.y)
+        
+        assert selector.xgb_model_ is None
+        assert X_selected.shape == (300, 3)
+        assert selector.get_feature_ranking()[0][0] == 'feature_2'
+    
+    def test_transform_rejects_mismatched_feature_count(self):
+        """Inputs with a different number of columns than in fit are rejected."""
+        self.selector.fit(self.X, self.y)
+        
+        with pytest.raises(RuntimeError, match='fitted with 8'):
+            self.selector.transform(self.X[:, :6])
+    
+    def test_unpickles_state_from_older_versions(self):
+        """Selectors pickled with a feature_names_ list keep working."""
+        self.selector.fit(self.X, self.y)
+        state = self.selector.__getstate__()
+        for name in ('n_features_in_', '_feature_names', '_ranking_cache', '_importance_cache', '_selected_mask_'):
+            state.pop(name)
+        state['feature_names_'] = [f'col_{i}' for i in range(8)]
+        
+        restored = XGBoostFeatureSelector.__new__(XGBoostFeatureSelector)
+        restored.__setstate__(state)
+        
+        assert restored.get_selected_features()[:2] == ['col_2', 'col_5']
+        assert restored.get_support().sum() == 3
+        np.testing.assert_array_equal(restored.transform(self.X), self.selector.transform(self.X))
@@ -0,0 +1,136 @@
+"""
+Tests for the hybrid SVM + XGBoost classifier.
+"""
+
+import numpy as np
+from unittest.mock import patch
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.svm import SVC
+
+from app.core.config import settings
+from app.ml.hybrid_classifier import HybridNIDSClassifier
+
+
+class TestHybridNIDSClassifier:
+    """Test cases for HybridNIDSClassifier."""
+    
+    def setup_method(self):
+        """Set up a small two-class dataset and fast hyperparameters."""
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(size=(200, 5))
+        self.y = (self.X[:, 0] - self.X[:, 3] > 0).astype(int)
+        self.params = {'svm_C': 1.0, 'xgb_n_estimators': 20, 'xgb_max_depth': 3}
+    
+    def test_small_training_sets_use_kernel_svc(self):
+        """Below the approximation threshold a kernel SVC is calibrated on a holdout."""
+        classifier = HybridNIDSClassifier().fit(self.X, self.y, best_params=self.params)
+        
+        calibrated = classifier.svm_classifier.calibrated_classifiers_
+        assert len(calibrated) == 1
+        assert isinstance(calibrated[0].estimator, SVC)
+        assert calibrated[0].estimator.support_vectors_.shape[0] <= 160
+        assert (classifier.predict(self.X) == self.y).mean() > 0.9
+    
+    def test_single_sample_classes_fall_back_to_internal_calibration(self):
+        """A class with one training row cannot be held out, so SVC calibrates itself."""
+        y = self.y.copy()
+        y[0] = 2
+        classifier = HybridNIDSClassifier().fit(self.X, y, best_params=self.params)
+        
+        assert isinstance(classifier.svm_classifier, SVC)
+        assert classifier.svm_classifier.probability
+        assert classifier.predict_proba(self.X).shape == (200, 3)
+        
+        # Two rows are enough for the stratified holdout
+        y[1] = 2
+        classifier = HybridNIDSClassifier().fit(self.X, y, best_params=self.params)
+        assert isinstance(classifier.svm_classifier, CalibratedClassifierCV)
+    
+    def test_large_training_sets_use_calibrated_approximation(self):
+        """From the threshold on, a calibrated Nystroem + LinearSVC replaces SVC."""
+        approx_settings = settings.model_copy(update={
+            'SVM_APPROXIMATION_MIN_SAMPLES': 100,
+            'SVM_NYSTROEM_COMPONENTS': 50
+        })
+        with patch('app.ml.hybrid_classifier.settings', approx_settings):
+            classifier = HybridNIDSClassifier().fit(self.X, self.y, best_params=self.params)
+        
+        assert isinstance(classifier.svm_classifier, CalibratedClassifierCV)
+        probabilities = classifier.predict_proba(self.X)
+        assert probabilities.shape == (200, 2)
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1.0)
+        assert (classifier.predict(self.X) == self.y).mean() > 0.9
+    
+    def test_members_are_trained_in_parallel_within_thread_budget(self):
+        """SVM and XGBoost train side by side, splitting the thread budget."""
+        with patch('app.ml.hybrid_classifier._thread_budget', return_value=4):
+            classifier = HybridNIDSClassifier().fit(self.X, self.y, best_params=self.params)
+        
+        assert classifier.ensemble_classifier.n_jobs == 2
+        assert classifier.xgboost_classifier.get_params()['n_jobs'] == 2
+        
+        with patch('app.ml.hybrid_classifier._thread_budget', return_value=1):
+            classifier = HybridNIDSClassifier().fit(self.X, self.y, best_params=self.params)
+        
+        assert classifier.ensemble_classifier.n_jobs == 1
+    
+    def test_nystroem_maps_are_cached_across_refits(self, tmp_path):
+        """Refits that only change C reuse the cached Nystroem feature maps."""
+        approx_settings = settings.model_copy(update={
+            'SVM_APPROXIMATION_MIN_SAMPLES': 100,
+            'SVM_NYSTROEM_COMPONENTS': 50,
+            'SVM_NYSTROEM_CACHE_PATH': str(tmp_path)
+        })
+        with patch('app.ml.hybrid_classifier.settings', approx_settings):
+            HybridNIDSClassifier().fit(self.X, self.y, best_params={**self.params, 'svm_gamma': 0.1})
+            with patch('sklearn.kernel_approximation.Nystroem.fit', autospec=True) as nystroem_fit:
+                HybridNIDSClassifier().fit(self.X, self.y, best_params={**self.params, 'svm_gamma': 0.1, 'svm_C': 5.0})
+        
+        nystroem_fit.assert_not_called()
+    
+    def test_predict_fast_matches_predict(self):
+        """Direct member scoring matches the ensemble, also for string classes."""
+        labels = np.array(['dos', 'normal', 'probe'])[(self.X[:, 0] > 0).astype(int) + (self.X[:, 1] > 0.5)]
+        classifier = HybridNIDSClassifier().fit(self.X, labels, best_params=self.params)
+        
+        np.testing.assert_array_equal(classifier.predict(self.X), classifier.ensemble_classifier.predict(self.X))
+        np.testing.assert_allclose(classifier.predict_proba(self.X), classifier.ensemble_classifier.predict_proba(self.X))
+        
+        results = classifier.evaluate(self.X, labels)
+        assert results['svm_accuracy'] > 0.8
+        assert results['xgboost_accuracy'] > 0.8
+    
+    def test_evaluate_scores_each_member_once(self):
+        """Evaluation derives all predictions from one probability pass per member."""
+        classifier = HybridNIDSClassifier().fit(self.X, self.y, best_params=self.params)
+        
+        with patch.object(classifier.svm_classifier, 'predict_proba', wraps=classifier.svm_classifier.predict_proba) as svm_proba, \
+                patch.object(classifier.xgboost_classifier, 'predict_proba', wraps=classifier.xgboost_classifier.predict_proba) as xgb_proba:
+            results = classifier.evaluate(self.X, self.y)
+        
+        assert svm_proba.call_count == 1
+        assert xgb_proba.call_count == 1
+        assert results['ensemble_accuracy'] == (classifier.predict(self.X) == self.y).mean()
+    
+    def test_save_and_memory_mapped_load(self, tmp_path):
+        """A saved classifier loads with memory-mapped arrays and predicts the same."""
+        classifier = HybridNIDSClassifier().fit(self.X, self.y, best_params=self.params)
+        path = tmp_path / 'hybrid.joblib'
+        
+        classifier.save(str(path))
+        loaded = HybridNIDSClassifier.load(str(path))
+        
+        svm = loaded.svm_classifier.calibrated_classifiers_[0].estimator
+        assert isinstance(svm.support_vectors_, np.memmap)
+        np.testing.assert_array_equal(loaded.predict(self.X), classifier.predict(self.X))
+        np.testing.assert_allclose(loaded.predict_proba(self.X), classifier.predict_proba(self.X))
+    
+    def test_unpickles_state_with_unfitted_member_templates(self):
+        """Classifiers saved with unfitted member templates predict after loading."""
+        classifier = HybridNIDSClassifier().fit(self.X, self.y, best_params=self.params)
+        state = dict(classifier.__dict__, svm_classifier=SVC(), xgboost_classifier=None)
+        
+        restored = HybridNIDSClassifier.__new__(HybridNIDSClassifier)
+        restored.__setstate__(state)
+        
+        np.testing.assert_array_equal(restored.predict(self.X), classifier.predict(self.X))
@@ -0,0 +1,175 @@
+"""
+Tests for the model lifecycle manager.
+"""
+
+import asyncio
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.ml import model_manager
+from app.ml.hybrid_classifier import HybridNIDSClassifier
+from app.ml.model_manager import ModelManager
+
+
+class TestModelManager:
+    """Test cases for ModelManager."""
+    
+    def setup_method(self):
+        """Point the model directory at a temporary folder and build a dataset."""
+        self.model_dir = Path(tempfile.mkdtemp())
+        self.settings_patch = patch(
+            'app.ml.model_manager.settings',
+            settings.model_copy(update={'MODEL_PATH': str(self.model_dir)})
+        )
+        self.settings_patch.start()
+        model_manager._model_cache.clear()
+        
+        rng = np.random.default_rng(0)
+        features = pd.DataFrame(rng.normal(size=(300, 5)), columns=['a', 'b', 'c', 'd', 'e'])
+        labels = np.where(features['a'] > 0.5, 'neptune', np.where(features['b'] > 0.3, 'satan', 'normal'))
+        self.data = features.assign(**{'class': labels})
+    
+    def teardown_method(self):
+        """Restore settings and remove the temporary model directory."""
+        self.settings_patch.stop()
+        model_manager._model_cache.clear()
+        shutil.rmtree(self.model_dir, ignore_errors=True)
+    
+    def _train(self) -> ModelManager:
+        """Train a manager on the test dataset without CSA."""
+        manager = ModelManager()
+        result = asyncio.run(manager.train_model(self.data, optimize_hyperparameters=False))
+        assert result['status'] == 'success'
+        return manager
+    
+    def test_saved_model_loads_memory_mapped(self):
+        """A trained model is reloaded with memory-mapped arrays and predicts the same."""
+        manager = self._train()
+        features = self.data.drop(columns=['class']).head(20)
+        expected = asyncio.run(manager.predict(features))
+        
+        model_manager._model_cache.clear()
+        reloaded = ModelManager()
+        
+        assert reloaded.is_trained
+        assert isinstance(reloaded.scaler.mean_, np.memmap)
+        assert asyncio.run(reloaded.predict(features)) == expected
+    
+    def test_concurrent_predictions_are_batched(self):
+        """Concurrent requests share one classifier call and get their own rows back."""
+        manager = self._train()
+        features = self.data.drop(columns=['class'])
+        chunks = [features.iloc[i:i + 7] for i in range(0, 28, 7)]
+        expected = [asyncio.run(manager.predict(chunk)) for chunk in chunks]
+        
+        async def predict_concurrently():
+            return await asyncio.gather(*(manager.predict(chunk) for chunk in chunks))
+        
+        with patch.object(manager, '_classify_batch', wraps=manager._classify_batch) as classify:
+            results = asyncio.run(predict_concurrently())
+        
+        assert classify.call_count == 1
+        assert len(classify.call_args.args[1]) == 28
+        assert results == expected
+    
+    def test_queued_requests_keep_their_model(self):
+        """Requests queued before a model swap are classified and decoded with their own model."""
+        manager = self._train()
+        features = self.data.drop(columns=['class']).head(10)
+        expected = asyncio.run(manager.predict(features))
+        
+        other = ModelManager()
+        other.label_encoder.fit(['other_a', 'other_b', 'other_c'])
+        other._class_to_label, other._class_to_category = other._compile_class_lookup()
+        
+        async def predict_across_swap():
+            request = asyncio.ensure_future(manager.predict(features))
+            # Let the request reach the queue, then swap in another model
+            await asyncio.sleep(0)
+            manager.hybrid_classifier = None
+            manager._class_to_label, manager._class_to_category = other._class_to_label, other._class_to_category
+            return await request
+        
+        assert asyncio.run(predict_across_swap()) == expected
+    
+    def test_single_rows_use_precomputed_path(self):
+        """One-row requests skip the frame preprocessing and match the batch path."""
+        manager = self._train()
+        features = self.data.drop(columns=['class']).head(5)
+        expected = asyncio.run(manager.predict(features))
+        
+        with patch.object(manager, '_prepare_prediction_data', wraps=manager._prepare_prediction_data) as prepare:
+            rows = [asyncio.run(manager.predict(features.iloc[[i]])) for i in range(5)]
+        
+        prepare.assert_not_called()
+        assert [row['predictions'][0] for row in rows] == expected['predictions']
+        np.testing.assert_allclose([row['probabilities'][0] for row in rows], expected['probabilities'], rtol=1e-6)
+        
+        # Rows missing a training column fall back to the general path
+        with patch.object(manager, '_prepare_prediction_data', wraps=manager._prepare_prediction_data) as prepare:
+            asyncio.run(manager.predict(features.iloc[[0]].drop(columns=['a'])))
+        prepare.assert_called_once()
+    
+    def test_numeric_frames_skip_dummy_encoding(self):
+        """Numeric frames with every training column bypass get_dummies with the same result."""
+        manager = self._train()
+        features = self.data.drop(columns=['class']).head(10)[['e', 'd', 'c', 'b', 'a']]
+        
+        with patch('app.ml.model_manager.pd.get_dummies', wraps=pd.get_dummies) as get_dummies:
+            X = manager._prepare_prediction_data(features)
+            get_dummies.assert_not_called()
+            
+            mixed = features.assign(protocol_type='tcp')
+            np.testing.assert_array_equal(manager._prepare_prediction_data(mixed), X)
+            assert get_dummies.call_count == 0
+            
+            np.testing.assert_array_equal(manager._prepare_prediction_data(features.drop(columns=['a']))[:, 0], 0)
+            get_dummies.assert_called_once()
+        
+        np.testing.assert_array_equal(X, features[['a', 'b', 'c', 'd', 'e']].to_numpy())
+    
+    def test_categorize_attacks_counts_each_category(self):
+        """Encoded predictions are counted per attack category and unknown labels are ignored."""
+        manager = ModelManager()
+        manager.label_encoder.fit(['normal', 'neptune', 'smurf', 'satan', 'rootkit', 'imap', 'unknown'])
+        manager._class_to_label, manager._class_to_category = manager._compile_class_lookup()
+        labels = ['normal', 'neptune', 'smurf', 'satan', 'rootkit', 'imap', 'normal', 'unknown']
+        predictions = manager.label_encoder.transform(labels)
+        
+        assert manager._class_to_label[predictions].tolist() == labels
+        assert manager._categorize_attacks(predictions) == {'Normal': 2, 'DoS': 2, 'Probe': 1, 'U2R': 1, 'R2L': 1}
+    
+    def test_training_keeps_event_loop_responsive(self):
+        """Predictions are served from the previous model while retraining runs."""
+        manager = self._train()
+        features = self.data.drop(columns=['class']).head(10)
+        expected = asyncio.run(manager.predict(features))
+        predicted = threading.Event()
+        fit = HybridNIDSClassifier.fit
+        
+        def blocking_fit(classifier, *args, **kwargs):
+            # Only finishes once a prediction was served during training
+            assert predicted.wait(timeout=30)
+            return fit(classifier, *args, **kwargs)
+        
+        async def retrain_and_predict():
+            training = asyncio.create_task(manager.train_model(self.data, optimize_hyperparameters=False))
+            while not training.done():
+                await asyncio.sleep(0.01)
+                if not predicted.is_set():
+                    result = await manager.predict(features)
+                    predicted.set()
+            return result, await training
+        
+        with patch.object(HybridNIDSClassifier, 'fit', blocking_fit):
+            result, training = asyncio.run(retrain_and_predict())
+        
+        assert result == expected
+        assert training['status'] == 'success'
@@ -0,0 +1,30 @@
+"""
+Tests for the shared XGBoost tree-construction parameters.
+"""
+
+from unittest.mock import patch
+
+from app.core.config import settings
+from app.ml import xgboost_params
+from app.ml.xgboost_params import tree_method_params, xgboost_device
+
+
+class TestXGBoostParams:
+    """Test cases for the XGBoost parameter helpers."""
+    
+    def test_tree_method_params_use_histograms(self):
+        """Trees are built with histogram split finding on the configured device."""
+        cpu_settings = settings.model_copy(update={'XGBOOST_DEVICE': 'cpu'})
+        with patch('app.ml.xgboost_params.settings', cpu_settings):
+            params = tree_method_params()
+        
+        assert params == {'tree_method': 'hist', 'max_bin': 256, 'device': 'cpu'}
+    
+    def test_auto_device_follows_gpu_availability(self):
+        """The 'auto' device resolves to CUDA only when a GPU is usable."""
+        auto_settings = settings.model_copy(update={'XGBOOST_DEVICE': 'auto'})
+        with patch('app.ml.xgboost_params.settings', auto_settings):
+            with patch.object(xgboost_params, '_cuda_available', return_value=True):
+                assert xgboost_device() == 'cuda'
+            with patch.object(xgboost_params, '_cuda_available', return_value=False):
+                assert xgboost_device() == 'cpu'